@@ -0,0 +1,358 @@
+"""
+Benchmark pipeline koordinat dengan data lisensi sintetis
+
+Data sintetis dibuat dengan kolom yang sama seperti 'Bahan Prima Aksi 2025 - Kendari.csv',
+lalu setiap tahap diukur terpisah: load CSV, cleaning, jarak SID-Center, filter,
+create_map (+ ukuran HTML), chart dan ekspor CSV. Hasil ditulis sebagai JSON
+agar bisa dibandingkan antar versi:
+
+    python benchmark.py --rows 10000 100000 1000000 -o benchmark_hasil.json
+    python benchmark.py --rows 10000 --compare benchmark_hasil.json
+
+Tahap create_map dan map_html (peta mode Keduanya) hanya dijalankan sampai
+--map-max-rows baris (default 100000); ukuran yang lebih besar melewati tahap
+peta karena HTML-nya bisa mencapai ratusan MB. Pakai --map-max-rows 0 untuk
+mengukur peta di semua ukuran.
+"""
+import pandas as pd
+import numpy as np
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tempfile
+from koordinat_core import (
+    detect_encoding, read_csv_with_schema, apply_schema, add_tolerance_columns,
+    add_plus_code_columns, encode_plus_codes, decode_plus_codes, apply_categories,
+    FilterIndex, find_duplicate_sites, tolerance_summary, build_exceeded_table
+)
+from koordinat_render import (
+    create_map, build_overview_figures, build_distance_histogram, build_tolerance_charts
+)
+
+# Bagian analisis toleransi yang dibuat aplikasi (masing-masing di-cache terpisah)
+TOLERANCE_BUILDERS = {
+    'exceeded_table': build_exceeded_table,
+    'distance_histogram': build_distance_histogram,
+    'tolerance_charts': build_tolerance_charts
+}
+
+# Urutan kolom sama dengan ekspor SIMF (file Kendari)
+SYNTHETIC_COLUMNS = [
+    'CLNT_ID', 'REQUEST_REFERENCE', 'APPL_ID', 'CLNT_NAME', 'STATUS_SIMF', 'SERVICE', 'SUBSERVICE',
+    'FREQ', 'FREQ_PAIR', 'ERP_PWR_DBM', 'BWIDTH', 'ZONA', 'HGT_ANT', 'MASTER_PLZN_CODE',
+    'SITE_ID_CODE', 'SITE_DESC', 'STATUS_MYSPECTRA', 'STN_NAME', 'STN_ADDR', 'SID_LONG', 'SID_LAT',
+    'PLUS_CODE_MYSPECTRA', 'PLUS_CODE_KALKULASI', 'LONGITUDE_CENTER_KALKULASI',
+    'LATITUDE_CENTER_KALKULASI', 'VILLAGE', 'DISTRICT', 'CITY', 'PROVINSI', 'APPL_DATE',
+    'LICENCE_DATE', 'VALIDITY_DATE', 'UPT', 'Status Verifikasi UPT 2024'
+]
+
+SYNTHETIC_CLIENTS = [
+    ('00105553', 'TELEKOMUNIKASI INDONESIA TBK'), ('8071', 'TELEKOMUNIKASI SELULAR, PT.'),
+    ('4425', 'TELEKOMUNIKASI INDONESIA, PT.'), ('00012001', 'INDOSAT TBK'),
+    ('00023110', 'XL AXIATA TBK'), ('00031877', 'SMARTFREN TELECOM TBK'),
+    ('00044512', 'HUTCHISON 3 INDONESIA, PT.'), ('00052003', 'PROTELINDO, PT.')
+]
+SYNTHETIC_CITIES = [
+    ('KDI', 'KOTA KENDARI'), ('RHA', 'MUNA'), ('ADL', 'KONAWE SELATAN'), ('UNH', 'KONAWE'),
+    ('BAU', 'KOTA BAU-BAU'), ('KKA', 'KOLAKA'), ('WGW', 'WAKATOBI'), ('BTN', 'BUTON'),
+    ('BMB', 'BOMBANA'), ('KLU', 'KOLAKA UTARA')
+]
+SYNTHETIC_DISTRICTS = [
+    'POASIA', 'DURUKA', 'TINANGGEA', 'KATOBU', 'MANDONGA', 'KAMBU', 'WUA-WUA', 'BARUGA',
+    'LAEYA', 'RANOMEETO', 'WOLIO', 'BATUPOARO', 'POMALAA', 'WANGI-WANGI', 'RUMBIA', 'LASUSUA'
+]
+SYNTHETIC_BANDS_MHZ = [7135, 7296, 8000, 13000, 14473, 14963, 15000, 18000, 22050, 23058]
+SYNTHETIC_BWIDTHS_KHZ = [7000, 14000, 28000, 29650, 40000, 56000]
+
+def format_dates(dates):
+    """Tanggal dengan format ekspor SIMF (m/d/yyyy tanpa nol di depan)"""
+    return (dates.dt.month.astype(str) + '/' + dates.dt.day.astype(str) + '/'
+            + dates.dt.year.astype(str)).to_numpy(dtype=object)
+
+def blank_out(rng, values, fraction):
+    """Kosongkan sebagian nilai (NaN) seperti kolom opsional pada data asli"""
+    values = np.asarray(values, dtype=object).copy()
+    values[rng.random(len(values)) < fraction] = np.nan
+    return values
+
+# Fungsi untuk membuat data lisensi sintetis dengan skema file Kendari
+def generate_synthetic_data(n_rows, seed=0):
+    """
+    DataFrame n_rows baris dengan kolom SYNTHETIC_COLUMNS (semua nilai dalam bentuk teks CSV)
+    Stasiun dibuat dari kumpulan site (sekitar 2,5 baris per site) di wilayah Sulawesi Tenggara;
+    sekitar 5% baris punya Center dari site lain sehingga melebihi toleransi 20 m
+    """
+    rng = np.random.default_rng(seed)
+    n_sites = max(n_rows * 2 // 5, 1)
+    
+    # Site: koordinat, kota, kecamatan, nama stasiun
+    site_lats = rng.uniform(-5.8, -3.0, n_sites)
+    site_lons = rng.uniform(121.2, 124.2, n_sites)
+    site_city = rng.integers(0, len(SYNTHETIC_CITIES), n_sites)
+    site_district = rng.integers(0, len(SYNTHETIC_DISTRICTS), n_sites)
+    site = rng.integers(0, n_sites, n_rows)
+    
+    city_codes = np.array([code for code, _ in SYNTHETIC_CITIES], dtype=object)[site_city[site]]
+    cities = np.array([name for _, name in SYNTHETIC_CITIES], dtype=object)[site_city[site]]
+    districts = np.array(SYNTHETIC_DISTRICTS, dtype=object)[site_district[site]]
+    site_numbers = pd.Series(site % 1000).astype(str).str.zfill(3).to_numpy(dtype=object)
+    
+    # SID sedikit bergeser dari titik site, plus code dihitung dari SID dan Center = titik tengah selnya
+    # (5% baris memakai plus code site lain sehingga melebihi toleransi dan SID di luar sel kode)
+    sid_lats = site_lats[site] + rng.normal(0, 0.00002, n_rows)
+    sid_lons = site_lons[site] + rng.normal(0, 0.00002, n_rows)
+    other_site = rng.random(n_rows) < 0.05
+    other_sites = rng.integers(0, n_sites, n_rows)
+    plus_codes = encode_plus_codes(np.where(other_site, site_lats[other_sites], sid_lats.round(7)),
+                                   np.where(other_site, site_lons[other_sites], sid_lons.round(7)))
+    center_lats, center_lons, _, _ = decode_plus_codes(plus_codes)
+    
+    client = rng.integers(0, len(SYNTHETIC_CLIENTS), n_rows)
+    freq = np.array(SYNTHETIC_BANDS_MHZ)[rng.integers(0, len(SYNTHETIC_BANDS_MHZ), n_rows)]
+    freq = freq + rng.integers(0, 300, n_rows)
+    freq_pair = freq + rng.choice([-490, -161, 161, 490], n_rows)
+    
+    appl_dates = pd.Series(pd.to_datetime('2010-01-01')
+                           + pd.to_timedelta(rng.integers(0, 15 * 365, n_rows), unit='D'))
+    licence_dates = appl_dates + pd.to_timedelta(rng.integers(3, 30, n_rows), unit='D')
+    validity_dates = licence_dates + pd.DateOffset(years=10) - pd.Timedelta(days=1)
+    
+    myspectra = rng.random(n_rows) < 0.4
+    
+    data = pd.DataFrame({
+        'CLNT_ID': np.array([cid for cid, _ in SYNTHETIC_CLIENTS], dtype=object)[client],
+        'REQUEST_REFERENCE': pd.Series(rng.integers(0, 10**7, n_rows)).astype(str).str.zfill(7),
+        'APPL_ID': pd.Series(rng.integers(0, 10**12, n_rows)).astype(str).str.zfill(12),
+        'CLNT_NAME': np.array([name for _, name in SYNTHETIC_CLIENTS], dtype=object)[client],
+        'STATUS_SIMF': 'Granted',
+        'SERVICE': 'Fixed Service',
+        'SUBSERVICE': 'PP',
+        'FREQ': freq,
+        'FREQ_PAIR': blank_out(rng, freq_pair, 0.08),
+        'ERP_PWR_DBM': rng.uniform(40, 65, n_rows).round(4),
+        'BWIDTH': np.array(SYNTHETIC_BWIDTHS_KHZ)[rng.integers(0, len(SYNTHETIC_BWIDTHS_KHZ), n_rows)],
+        'ZONA': rng.choice([4, 5], n_rows),
+        'HGT_ANT': rng.integers(10, 120, n_rows),
+        'MASTER_PLZN_CODE': rng.choice(['V', 'H'], n_rows),
+        'SITE_ID_CODE': blank_out(rng, pd.Series(site).astype(str).str.zfill(4), 0.44),
+        'SITE_DESC': np.where(myspectra, plus_codes + '_SULAWESI TENGGARA_' + districts, np.nan),
+        'STATUS_MYSPECTRA': np.where(myspectra, 'Sudah ada MDRS di MySpectra', 'Belum ada MDRS di MySpectra'),
+        'STN_NAME': city_codes + site_numbers + '_' + districts,
+        'STN_ADDR': blank_out(rng, 'JL. POROS ' + districts + ', KEC. ' + districts + ', ' + cities
+                              + ', PROVINSI SULAWESI TENGGARA', 0.001),
+        'SID_LONG': sid_lons.round(7),
+        'SID_LAT': sid_lats.round(7),
+        'PLUS_CODE_MYSPECTRA': np.where(myspectra, plus_codes, np.nan),
+        'PLUS_CODE_KALKULASI': plus_codes,
+        'LONGITUDE_CENTER_KALKULASI': center_lons.round(7),
+        'LATITUDE_CENTER_KALKULASI': center_lats.round(7),
+        'VILLAGE': np.where(myspectra, districts, np.nan),
+        'DISTRICT': districts,
+        'CITY': cities,
+        'PROVINSI': 'SULAWESI TENGGARA',
+        'APPL_DATE': format_dates(appl_dates),
+        'LICENCE_DATE': format_dates(licence_dates),
+        'VALIDITY_DATE': blank_out(rng, format_dates(validity_dates), 0.002),
+        'UPT': 'LOKA KENDARI',
+        'Status Verifikasi UPT 2024': rng.choice(
+            ['Data hasil rekap UPT 2024', 'Bukan termasuk data hasil  rekap UPT 2024'], n_rows
+        )
+    })
+    return data[SYNTHETIC_COLUMNS]
+
+# Naikkan jika isi data sintetis berubah, agar file CSV lama di work_dir tidak terpakai
+SYNTHETIC_VERSION = 2
+
+def synthetic_csv_path(work_dir, n_rows, seed):
+    return os.path.join(work_dir, f"synthetic_{n_rows}_seed{seed}_v{SYNTHETIC_VERSION}.csv")
+
+def ensure_synthetic_csv(work_dir, n_rows, seed=0):
+    """Tulis file CSV sintetis sekali, dipakai ulang pada run berikutnya"""
+    path = synthetic_csv_path(work_dir, n_rows, seed)
+    if not os.path.exists(path):
+        os.makedirs(work_dir, exist_ok=True)
+        generate_synthetic_data(n_rows, seed).to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+    return path
+
+# Tahap yang diukur, dalam urutan pipeline
+STAGES = ['csv_load', 'cleaning', 'distance', 'plus_code', 'categories', 'filtering', 'dedup',
+          'create_map', 'map_html', 'charts', 'csv_export']
+
+# Batas jumlah baris untuk tahap create_map / map_html (0 = tanpa batas)
+MAP_MAX_ROWS = 100_000
+
+def timed(func):
+    """Return (hasil, detik)"""
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+# Fungsi untuk mengukur setiap tahap pipeline pada satu file
+def run_pipeline(file_path, stages=STAGES, map_max_rows=MAP_MAX_ROWS):
+    """
+    Jalankan tahap-tahap pipeline seperti load_csv_file lalu tampilan aplikasi
+    Return list dict {stage, seconds, ...info tambahan}; tahap di luar stages tetap
+    dijalankan bila dibutuhkan tahap berikutnya, tetapi tidak dilaporkan
+    Tahap peta dilewati jika jumlah baris melebihi map_max_rows (0 = tanpa batas)
+    """
+    results = []
+    
+    def record(stage, seconds, **info):
+        if stage in stages:
+            results.append({'stage': stage, 'seconds': round(seconds, 6), **info})
+    
+    df, seconds = timed(lambda: read_csv_with_schema(file_path, detect_encoding(file_path)))
+    record('csv_load', seconds, rows=len(df), file_bytes=os.path.getsize(file_path))
+    
+    df, seconds = timed(lambda: apply_schema(df).dropna(subset=['SID_LONG', 'SID_LAT']))
+    record('cleaning', seconds, rows=len(df))
+    
+    df, seconds = timed(lambda: add_tolerance_columns(df))
+    record('distance', seconds, rows=len(df),
+           exceeded=int((df['TOLERANCE_STATUS'] == 'MELEBIHI TOLERANSI').sum()))
+    
+    df, seconds = timed(lambda: add_plus_code_columns(df))
+    record('plus_code', seconds, rows=len(df),
+           issues=int((~df['PLUS_CODE_STATUS'].isin(['SESUAI', 'DIHITUNG DARI SID'])).sum()))
+    
+    df, seconds = timed(lambda: apply_categories(df))
+    record('categories', seconds, rows=len(df), memory_bytes=frame_bytes(df))
+    
+    if 'filtering' in stages:
+        # Filter tipikal: satu client dan hanya yang melebihi toleransi
+        selections = {'CLNT_NAME': [df['CLNT_NAME'].cat.categories[0]],
+                      'TOLERANCE_STATUS': ['MELEBIHI TOLERANSI']}
+        filter_index, index_seconds = timed(lambda: FilterIndex(df))
+        rows, query_seconds = timed(lambda: filter_index.query(selections))
+        record('filtering', index_seconds + query_seconds, rows=len(rows),
+               index_seconds=round(index_seconds, 6), query_seconds=round(query_seconds, 6))
+    
+    if 'dedup' in stages:
+        site_ids, seconds = timed(lambda: find_duplicate_sites(df))
+        record('dedup', seconds, rows=len(df), sites=int(site_ids.max()) + 1 if len(site_ids) else 0)
+    
+    map_allowed = not map_max_rows or len(df) <= map_max_rows
+    if ('create_map' in stages or 'map_html' in stages) and map_allowed:
+        map_obj, seconds = timed(lambda: create_map(df, "Keduanya", "OpenStreetMap"))
+        record('create_map', seconds, rows=len(df))
+        html, seconds = timed(lambda: map_obj.get_root().render())
+        record('map_html', seconds, html_bytes=len(html.encode('utf-8')))
+        del map_obj, html
+    
+    if 'charts' in stages:
+        _, overview_seconds = timed(lambda: build_overview_figures(df))
+        summary, summary_seconds = timed(lambda: tolerance_summary(df))
+        # Sama seperti aplikasi: tabel dan chart toleransi hanya dibuat jika ada koordinat center
+        builder_seconds = {}
+        if summary is not None:
+            for name, builder in TOLERANCE_BUILDERS.items():
+                _, builder_seconds[name] = timed(lambda: builder(df))
+        tolerance_seconds = summary_seconds + sum(builder_seconds.values())
+        record('charts', overview_seconds + tolerance_seconds,
+               overview_seconds=round(overview_seconds, 6),
+               tolerance_seconds=round(tolerance_seconds, 6),
+               summary_seconds=round(summary_seconds, 6),
+               **{f"{name}_seconds": round(seconds, 6) for name, seconds in builder_seconds.items()})
+    
+    if 'csv_export' in stages:
+        csv, seconds = timed(lambda: df.to_csv(index=False))
+        record('csv_export', seconds, output_bytes=len(csv.encode('utf-8')))
+    
+    return results
+
+def git_revision():
+    """Commit git saat ini (untuk membandingkan hasil antar versi), None jika tidak tersedia"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+# Fungsi untuk menjalankan benchmark di beberapa ukuran data
+def run_benchmark(row_counts, work_dir, repeat=1, seed=0, stages=STAGES,
+                  map_max_rows=MAP_MAX_ROWS):
+    """
+    Setiap ukuran dijalankan repeat kali, yang dilaporkan adalah run tercepat per tahap
+    Return dict hasil siap JSON
+    """
+    results = []
+    for n_rows in row_counts:
+        file_path = ensure_synthetic_csv(work_dir, n_rows, seed)
+        runs = [run_pipeline(file_path, stages, map_max_rows) for _ in range(repeat)]
+        for stage_runs in zip(*runs):
+            best = min(stage_runs, key=lambda item: item['seconds'])
+            results.append({'synthetic_rows': n_rows, **best})
+    
+    return {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed,
+        'map_max_rows': map_max_rows,
+        'results': results
+    }
+
+def compare_results(current, baseline):
+    """Baris perbandingan waktu per (jumlah baris, tahap) terhadap hasil benchmark sebelumnya"""
+    previous = {(item['synthetic_rows'], item['stage']): item['seconds'] for item in baseline['results']}
+    lines = []
+    for item in current['results']:
+        key = (item['synthetic_rows'], item['stage'])
+        if key in previous and previous[key] > 0:
+            ratio = item['seconds'] / previous[key]
+            lines.append(f"{key[0]:>9,} {key[1]:<17} {previous[key]:>10.4f} s -> "
+                         f"{item['seconds']:>10.4f} s  ({ratio:.2f}x)")
+    return lines
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahap pipeline dengan data lisensi sintetis")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Jumlah baris data sintetis (default: 10000 100000 1000000)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES,
+                        help="Tahap yang dilaporkan (default: semua)")
+    parser.add_argument("--map-max-rows", type=int, default=MAP_MAX_ROWS,
+                        help=f"Tahap create_map/map_html dilewati di atas jumlah baris ini, "
+                             f"0 = tanpa batas (default: {MAP_MAX_ROWS})")
+    parser.add_argument("-r", "--repeat", type=int, default=1,
+                        help="Jumlah pengulangan per ukuran, diambil yang tercepat (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed generator data sintetis")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "koordinat_benchmark"),
+                        help="Folder file CSV sintetis (dipakai ulang antar run)")
+    parser.add_argument("-o", "--output", default="benchmark_hasil.json", help="File hasil JSON")
+    parser.add_argument("--compare", help="File hasil JSON sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmark(args.rows, args.work_dir, args.repeat, args.seed, args.stages,
+                           args.map_max_rows)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    
+    for item in report['results']:
+        print(f"{item['synthetic_rows']:>9,} {item['stage']:<17} {item['seconds']:>10.4f} s")
+    print(f"Hasil ditulis ke {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nPerbandingan dengan {args.compare} (revisi {baseline.get('revision')}):")
+        for line in compare_results(report, baseline):
+            print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,33 @@
 import streamlit as st
 import pandas as pd
-import folium
 from streamlit_folium import st_folium
-import plotly.express as px
 import numpy as np
-import math
 import os
 import glob
-
-# Fungsi untuk menghitung jarak antara dua koordinat (tanpa geopy)
-def calculate_distance(lat1, lon1, lat2, lon2):
-    """
-    Menghitung jarak antara dua titik koordinat menggunakan rumus Haversine
-    Hasil dalam meter
-    """
-    # Konversi derajat ke radian
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    
-    # Rumus Haversine
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
-    
-    # Radius bumi dalam meter
-    r = 6371000
-    
-    return c * r
+import uuid
+import threading
+import functools
+import copy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from koordinat_core import (
+    STREAMING_THRESHOLD_BYTES,
+    INTERFERENCE_MAX_DISTANCE_KM, INTERFERENCE_GUARD_MHZ,
+    file_fingerprint, load_csv_file, align_frames, concat_categorical_chunks, category_options,
+    table_row_order,
+    FilterIndex, ExpiryIndex, VALIDITY_COLUMN, EXPIRY_SOON_MONTHS, expiry_window,
+    SpatialGridIndex, DensityGrid, find_nearby_stations, find_interference_candidates,
+    DUPLICATE_MAX_DISTANCE_M, DUPLICATE_TOKEN_SIMILARITY, find_duplicate_sites, site_summary,
+    build_duplicate_table,
+    tolerance_summary, build_exceeded_table, EXPORT_FORMATS, export_formats, export_bytes,
+    PROFILE_LOG_ENV_VAR, PROFILE_LOG_PATH, StageProfiler, profiling_enabled_from_env
+)
+from koordinat_tiles import TILE_SOURCES, TILE_DIR_ENV_VAR, DEFAULT_TILE_DIR, TileServer
+from koordinat_render import (
+    BULK_MARKER_THRESHOLD, create_base_map, render_map_html, coord_columns, viewport_bounds,
+    build_viewport_layer, density_legend_html, build_overview_figures, build_distance_histogram,
+    build_tolerance_charts, build_expiry_timeline, create_interference_map, create_site_map
+)
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -67,6 +68,26 @@ st.markdown("""
         border-left: 4px solid #1f77b4;
         margin-bottom: 1rem;
     }
+    .zebra-table-wrap {
+        overflow: auto;
+        margin-bottom: 0.5rem;
+    }
+    .zebra-table {
+        border-collapse: collapse;
+        width: 100%;
+        font-size: 0.85rem;
+    }
+    .zebra-table th, .zebra-table td {
+        padding: 0.3rem 0.5rem;
+        text-align: left;
+        white-space: nowrap;
+    }
+    .zebra-table tbody tr:nth-child(odd) {
+        background-color: #ffebee;
+    }
+    .zebra-table tbody tr:nth-child(even) {
+        background-color: #fce4ec;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -91,60 +112,241 @@ def get_csv_files():
     
     return csv_files
 
-# Fungsi untuk load data dengan error handling yang lebih baik
-@st.cache_data
-def load_data(selected_file):
-    """Load dan preprocess data CSV dari folder Data"""
-    if not selected_file:
-        return pd.DataFrame(), "Tidak ada file yang dipilih"
+# Batas memori cache hasil turunan filter (DataFrame terfilter, HTML peta, figure)
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+def estimate_size(value):
+    """Perkiraan ukuran memori (byte) sebuah hasil yang disimpan di ResultCache"""
+    if isinstance(value, pd.DataFrame):
+        # deep=True: kolom teks/object dihitung beserta isi string-nya, bukan hanya pointer
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, 'nbytes'):
+        # Array NumPy dan index (SpatialGridIndex)
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    if hasattr(value, 'data') and hasattr(value, 'layout'):
+        # Figure Plotly: hitung array data pada setiap trace
+        size = 1024
+        for trace in value.data:
+            for attr in ('x', 'y', 'values', 'labels', 'customdata'):
+                array = getattr(trace, attr, None)
+                if array is not None:
+                    size += np.asarray(array).nbytes
+        return size
+    return 64
+
+class ResultCache:
+    """
+    Cache LRU untuk hasil yang bergantung pada state filter, dibatasi total ukuran memori
+    Entri yang paling lama tidak dipakai dibuang lebih dulu saat batas terlampaui
+    """
     
-    try:
-        file_path = os.path.join("Data", selected_file)
-        
-        # Baca file CSV dengan berbagai encoding
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        df = None
-        
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(file_path, encoding=encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        
-        if df is None:
-            return pd.DataFrame(), "Error: Tidak dapat membaca file dengan encoding yang tersedia"
-        
-        # Cek kolom yang diperlukan
-        required_coords = ['SID_LONG', 'SID_LAT']
-        missing_coords = [col for col in required_coords if col not in df.columns]
-        
-        if missing_coords:
-            return pd.DataFrame(), f"Error: Kolom koordinat tidak ditemukan: {missing_coords}"
-        
-        # Clean data - hapus baris dengan koordinat kosong
-        original_rows = len(df)
-        df = df.dropna(subset=['SID_LONG', 'SID_LAT'])
-        
-        # Pastikan koordinat adalah numerik
-        df['SID_LONG'] = pd.to_numeric(df['SID_LONG'], errors='coerce')
-        df['SID_LAT'] = pd.to_numeric(df['SID_LAT'], errors='coerce')
-        
-        # Pastikan kolom opsional juga numerik (jika ada)
-        optional_coords = ['LONGITUDE_CENTER_KALKULASI', 'LATITUDE_CENTER_KALKULASI']
-        for col in optional_coords:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def get_or_create(self, key, factory):
+        """Ambil hasil untuk key, atau buat dengan factory() lalu simpan"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
         
-        # Hapus baris dengan koordinat invalid
-        df = df.dropna(subset=['SID_LONG', 'SID_LAT'])
-        cleaned_rows = len(df)
+        value = factory()
+        size = estimate_size(value)
         
-        success_message = f"Berhasil load {cleaned_rows} dari {original_rows} baris data"
-        return df, success_message
+        with self.lock:
+            # Hasil yang lebih besar dari seluruh budget tidak disimpan
+            if size <= self.max_bytes:
+                if key in self.entries:
+                    self.total_bytes -= self.entries.pop(key)[1]
+                self.entries[key] = (value, size)
+                self.total_bytes += size
+                
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.total_bytes -= evicted_size
         
-    except Exception as e:
-        return pd.DataFrame(), f"Error loading data: {str(e)}"
+        return value
+
+@st.cache_data
+def load_data(selected_file, streaming=False, fingerprint=()):
+    """
+    Load dan preprocess data CSV dari folder Data
+    fingerprint hanya dipakai sebagai bagian key cache (berubah jika file berubah)
+    """
+    if not selected_file:
+        return pd.DataFrame(), "Tidak ada file yang dipilih"
+    
+    file_path = os.path.join("Data", selected_file)
+    if not streaming:
+        return load_csv_file(file_path)
+    
+    # Mode streaming: progress ditampilkan di UI
+    progress_bar = st.progress(0.0, text="Memuat data...")
+    
+    def update_progress(fraction, text):
+        progress_bar.progress(fraction, text=text)
+    
+    result = load_csv_file(file_path, streaming, progress=update_progress)
+    progress_bar.empty()
+    return result
+
+# Load beberapa file sekaligus menjadi satu dataset
+@st.cache_data
+def load_multiple_data(selected_files, streaming=False, fingerprints=()):
+    """
+    Load file-file CSV secara paralel (thread pool) lalu gabungkan menjadi satu DataFrame
+    dengan kolom SOURCE_FILE. Setiap file memakai cache Parquet-nya sendiri, sehingga
+    menambah satu file tidak membuat file lain di-parse ulang.
+    fingerprints hanya dipakai sebagai bagian key cache (berubah jika salah satu file berubah)
+    """
+    file_paths = [os.path.join("Data", name) for name in selected_files]
+    max_workers = max(1, min(len(file_paths), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda path: load_csv_file(path, streaming), file_paths))
+    
+    frames = []
+    errors = []
+    for name, (file_df, message) in zip(selected_files, results):
+        if file_df.empty:
+            errors.append(f"{name}: {message}")
+            continue
+        file_df = file_df.copy()
+        file_df['SOURCE_FILE'] = pd.Categorical.from_codes(np.zeros(len(file_df), dtype=int), [name])
+        frames.append(file_df)
+    
+    if not frames:
+        return pd.DataFrame(), "Error loading data: " + "; ".join(errors)
+    
+    df = concat_categorical_chunks(align_frames(frames)).reset_index(drop=True)
+    message = f"Berhasil load {len(df)} baris data dari {len(frames)} file"
+    if errors:
+        message += f" (gagal: {'; '.join(errors)})"
+    return df, message
+
+# Index filter dibangun sekali per dataset yang di-load
+@st.cache_resource
+def get_filter_index(dataset_key, streaming, _df):
+    """FilterIndex untuk DataFrame hasil load_data (DataFrame tidak ikut di-hash)"""
+    return FilterIndex(_df)
+
+# Index tanggal berlaku izin dibangun sekali per dataset yang di-load
+@st.cache_resource
+def get_expiry_index(dataset_key, streaming, _df):
+    """ExpiryIndex kolom VALIDITY_DATE (DataFrame tidak ikut di-hash)"""
+    return ExpiryIndex(_df[VALIDITY_COLUMN])
+
+# Index spasial koordinat stasiun dibangun sekali per dataset yang di-load
+@st.cache_resource
+def get_spatial_index(dataset_key, streaming, lat_col, lon_col, _df):
+    """SpatialGridIndex untuk DataFrame hasil load_data (DataFrame tidak ikut di-hash)"""
+    return SpatialGridIndex(_df[lat_col], _df[lon_col])
+
+# Cache hasil turunan filter, dibagi antar sesi
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+# Server tile lokal (offline) berjalan sekali per (folder tile, fetch_missing) selama proses Streamlit hidup;
+# fetch_missing bagian dari key cache agar pilihan satu sesi tidak mengubah server sesi lain
+@st.cache_resource
+def get_tile_server(tile_dir, fetch_missing=False):
+    return TileServer(tile_dir, fetch_missing=fetch_missing)
+
+# Label pilihan multiselect untuk nama file download
+def selection_label(values):
+    if not values:
+        return "Semua"
+    if len(values) == 1:
+        return values[0]
+    return f"{len(values)}_pilihan"
+
+# Pilihan jumlah baris per halaman tabel
+TABLE_PAGE_SIZES = [25, 50, 100, 250, 500]
+
+# Fungsi untuk menampilkan tabel per halaman (pencarian, sort dan slicing di server)
+def paginated_table(data, key, state, height=400, striped=False, format_page=None):
+    """
+    Hanya satu halaman data yang dikirim ke browser. Urutan baris hasil pencarian/sort
+    disimpan di ResultCache per state, sehingga pindah halaman cukup slicing array posisi.
+    striped=True menampilkan tabel HTML dengan zebra striping lewat CSS (tanpa Styler per sel),
+    format_page dipanggil untuk DataFrame halaman (misal pembulatan koordinat)
+    """
+    search_col, sort_col, order_col, size_col, page_col = st.columns([3, 2, 1, 1, 1])
+    with search_col:
+        search = st.text_input("Cari:", key=f"{key}_search", placeholder="Teks di kolom mana pun")
+    with sort_col:
+        sort_by = st.selectbox("Urutkan:", ["(urutan asli)"] + list(data.columns), key=f"{key}_sort")
+    with order_col:
+        descending = st.toggle("Menurun", key=f"{key}_desc")
+    with size_col:
+        page_size = st.selectbox("Baris:", TABLE_PAGE_SIZES, index=1, key=f"{key}_page_size")
+    
+    sort_by = None if sort_by == "(urutan asli)" else sort_by
+    order = result_cache.get_or_create(
+        ('table_order', key) + state + (search.strip(), sort_by, descending),
+        lambda: table_row_order(data, search.strip(), sort_by, not descending)
+    )
+    
+    # Halaman yang tersimpan dipotong ke jumlah halaman saat ini (misal setelah pencarian)
+    n_pages = max(1, -(-len(order) // page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    with page_col:
+        page = st.number_input("Halaman:", min_value=1, max_value=n_pages, step=1, key=page_key)
+    
+    start = (page - 1) * page_size
+    page_df = data.iloc[order[start:start + page_size]]
+    if format_page is not None:
+        page_df = format_page(page_df.copy())
+    
+    if striped:
+        table_html = page_df.to_html(index=False, classes='zebra-table', border=0, na_rep='')
+        st.markdown(f'<div class="zebra-table-wrap" style="max-height: {height}px;">{table_html}</div>',
+                    unsafe_allow_html=True)
+    else:
+        st.dataframe(page_df, height=height, use_container_width=True)
+    
+    if len(order) == 0:
+        st.caption("Tidak ada baris yang cocok")
+    else:
+        st.caption(f"Baris {start + 1:,}–{start + len(page_df):,} dari {len(order):,} "
+                   f"(halaman {page} dari {n_pages})")
+
+# Fungsi untuk tombol download dengan pilihan format (isi file dibuat saat tombol diklik)
+def export_download(data, key, state, file_stem, label):
+    """
+    Isi file tidak dibuat pada setiap rerun: data tombol berupa callable yang baru dipanggil
+    saat user mengklik download, hasilnya disimpan di ResultCache per state filter dan format
+    """
+    format_col, button_col = st.columns([2, 3])
+    with format_col:
+        fmt = st.selectbox("Format:", export_formats(data), key=f"{key}_format",
+                           format_func=lambda f: EXPORT_FORMATS[f][0])
+    _, mime, extension = EXPORT_FORMATS[fmt]
+    with button_col:
+        st.download_button(
+            label=f"{label} ({EXPORT_FORMATS[fmt][0]})",
+            data=lambda: result_cache.get_or_create(
+                ('export', key, fmt) + state, lambda: export_bytes(data, fmt)
+            ),
+            file_name=f"{file_stem}{extension}",
+            mime=mime,
+            on_click="ignore"
+        )
 
 # Sidebar untuk pemilihan file dan kontrol
 st.sidebar.markdown("## 📁 Pilih File CSV")
@@ -182,17 +384,71 @@ selected_file = st.sidebar.selectbox(
     help="Pilih file CSV dari folder Data yang ingin divisualisasikan"
 )
 
-if not selected_file:
-    st.info("👆 Silakan pilih file CSV dari sidebar untuk memulai")
-    st.stop()
+# Mode gabungan: beberapa file (mis. satu file per UPT) dimuat menjadi satu dataset
+multi_file_mode = st.sidebar.checkbox(
+    "Gabungkan beberapa file",
+    value=False,
+    help="Muat beberapa file CSV sekaligus secara paralel. Setiap baris diberi kolom SOURCE_FILE."
+)
+if multi_file_mode:
+    selected_files = st.sidebar.multiselect(
+        "Pilih file yang digabungkan:",
+        options=csv_files,
+        default=csv_files
+    )
+    if not selected_files:
+        st.info("👆 Silakan pilih minimal satu file CSV dari sidebar")
+        st.stop()
+    # Nama dataset gabungan untuk label dan nama file download
+    selected_file = f"gabungan_{len(selected_files)}_file.csv"
+else:
+    if not selected_file:
+        st.info("👆 Silakan pilih file CSV dari sidebar untuk memulai")
+        st.stop()
+    selected_files = [selected_file]
+
+# Mode streaming otomatis aktif untuk file besar
+selected_file_size = sum(os.path.getsize(os.path.join("Data", name)) for name in selected_files)
+streaming_mode = st.sidebar.checkbox(
+    "Mode streaming (hemat memori)",
+    value=selected_file_size > STREAMING_THRESHOLD_BYTES,
+    help="Baca file per chunk dan hanya simpan kolom yang dipakai aplikasi. "
+         "Otomatis aktif untuk file di atas 200 MB."
+)
 
-# Load data
-df, load_message = load_data(selected_file)
+# Instrumentasi per tahap (juga bisa diaktifkan dengan env var KOORDINAT_PROFILE=1)
+st.sidebar.markdown("### 🐞 Debug")
+profiling_mode = st.sidebar.checkbox(
+    "Instrumentasi waktu & memori per tahap",
+    value=profiling_enabled_from_env(),
+    help="Mencatat waktu, jumlah baris dan perubahan memori (RSS) setiap tahap rerun, "
+         "ditampilkan di bagian bawah halaman"
+)
+profile_log_path = None
+if profiling_mode:
+    default_log_path = os.environ.get(PROFILE_LOG_ENV_VAR, "")
+    if st.sidebar.checkbox("Simpan ke file log (JSON Lines)", value=bool(default_log_path)):
+        profile_log_path = st.sidebar.text_input("File log:", value=default_log_path or PROFILE_LOG_PATH)
+profiler = StageProfiler(enabled=profiling_mode)
+
+# Load data; dataset_key membedakan dataset pada cache index dan hasil filter
+with profiler.stage("load_data") as stage_info:
+    if multi_file_mode:
+        file_fingerprints = tuple(
+            tuple(file_fingerprint(os.path.join("Data", name)).values()) for name in selected_files
+        )
+        df, load_message = load_multiple_data(tuple(selected_files), streaming_mode, file_fingerprints)
+        dataset_key = (tuple(selected_files), file_fingerprints)
+    else:
+        file_fingerprints = tuple(file_fingerprint(os.path.join("Data", selected_file)).values())
+        df, load_message = load_data(selected_file, streaming_mode, file_fingerprints)
+        dataset_key = (selected_file, file_fingerprints)
+    stage_info['rows'] = len(df)
 
 # Tampilkan informasi file
 st.markdown(f"""
 <div class="file-info">
-    <h4>📄 File yang dipilih: {selected_file}</h4>
+    <h4>📄 File yang dipilih: {', '.join(selected_files)}</h4>
     <p><strong>Status:</strong> {load_message}</p>
 </div>
 """, unsafe_allow_html=True)
@@ -206,24 +462,11 @@ st.sidebar.markdown("### 📋 Info Data")
 
 # Hitung statistik toleransi jika ada koordinat center
 tolerance_info = ""
-if ('LATITUDE_CENTER_KALKULASI' in df.columns and 
-    'LONGITUDE_CENTER_KALKULASI' in df.columns):
+if 'DISTANCE_SID_CENTER_M' in df.columns:
     
     # Hitung data yang melebihi toleransi untuk info
-    exceed_count = 0
-    total_valid = 0
-    
-    for idx, row in df.iterrows():
-        if (pd.notna(row['SID_LAT']) and pd.notna(row['SID_LONG']) and 
-            pd.notna(row['LATITUDE_CENTER_KALKULASI']) and pd.notna(row['LONGITUDE_CENTER_KALKULASI'])):
-            
-            distance = calculate_distance(
-                row['SID_LAT'], row['SID_LONG'],
-                row['LATITUDE_CENTER_KALKULASI'], row['LONGITUDE_CENTER_KALKULASI']
-            )
-            total_valid += 1
-            if distance > 20:
-                exceed_count += 1
+    total_valid = int(df['DISTANCE_SID_CENTER_M'].notna().sum())
+    exceed_count = int((df['TOLERANCE_STATUS'] == 'MELEBIHI TOLERANSI').sum())
     
     tolerance_info = f"\n**Toleransi 20m:** {exceed_count}/{total_valid} melebihi"
 
@@ -253,29 +496,36 @@ st.sidebar.markdown("## 🔧 Kontrol Peta")
 # Filter berdasarkan kolom yang tersedia
 st.sidebar.markdown("### 📊 Filter Data")
 
-# Filter CLNT_NAME (jika ada)
-selected_clnt = "Semua"
+# Filter CLNT_NAME (jika ada) - kosong berarti semua
+selected_clnt = []
 if 'CLNT_NAME' in df.columns:
-    clnt_names = ['Semua'] + sorted(df['CLNT_NAME'].dropna().unique().tolist())
-    selected_clnt = st.sidebar.selectbox("Pilih Client Name:", clnt_names)
+    selected_clnt = st.sidebar.multiselect("Pilih Client Name:", category_options(df['CLNT_NAME']),
+                                           placeholder="Semua")
 
 # Filter STATUS_MYSPECTRA (jika ada)
-selected_status = "Semua"
+selected_status = []
 if 'STATUS_MYSPECTRA' in df.columns:
-    status_myspectra = ['Semua'] + sorted(df['STATUS_MYSPECTRA'].dropna().unique().tolist())
-    selected_status = st.sidebar.selectbox("Pilih Status MySpectra:", status_myspectra)
+    selected_status = st.sidebar.multiselect("Pilih Status MySpectra:", category_options(df['STATUS_MYSPECTRA']),
+                                             placeholder="Semua")
 
 # Filter CITY (jika ada)
-selected_city = "Semua"
+selected_city = []
 if 'CITY' in df.columns:
-    cities = ['Semua'] + sorted(df['CITY'].dropna().unique().tolist())
-    selected_city = st.sidebar.selectbox("Pilih Kota:", cities)
+    selected_city = st.sidebar.multiselect("Pilih Kota:", category_options(df['CITY']),
+                                           placeholder="Semua")
 
 # Filter Status Verifikasi UPT 2024 (jika ada)
-selected_verification = "Semua"
+selected_verification = []
 if 'Status Verifikasi UPT 2024' in df.columns:
-    verification_status = ['Semua'] + sorted(df['Status Verifikasi UPT 2024'].dropna().unique().tolist())
-    selected_verification = st.sidebar.selectbox("Pilih Status Verifikasi UPT 2024:", verification_status)
+    selected_verification = st.sidebar.multiselect("Pilih Status Verifikasi UPT 2024:",
+                                                   category_options(df['Status Verifikasi UPT 2024']),
+                                                   placeholder="Semua")
+
+# Filter file sumber (hanya mode gabungan)
+selected_sources = []
+if 'SOURCE_FILE' in df.columns:
+    selected_sources = st.sidebar.multiselect("Pilih File Sumber:", category_options(df['SOURCE_FILE']),
+                                              placeholder="Semua")
 
 # Pilihan koordinat untuk perbandingan
 st.sidebar.markdown("### 📍 Perbandingan Koordinat")
@@ -292,9 +542,50 @@ coord_option = st.sidebar.radio("Pilih set koordinat:", coord_options)
 
 # Pilihan model peta
 st.sidebar.markdown("### 🗺️ Model Peta")
-map_style = st.sidebar.selectbox(
-    "Pilih style peta:",
-    ["OpenStreetMap", "Satellite", "Terrain", "CartoDB Positron", "CartoDB Dark_Matter"]
+
+# Tile lokal: folder tile / file MBTiles dilayani server lokal, bukan dari internet
+use_local_tiles = st.sidebar.checkbox(
+    "Pakai tile peta lokal (offline)",
+    value=False,
+    help="Peta dimuat dari folder tile atau file .mbtiles lewat server lokal di 127.0.0.1. "
+         "Isi folder lebih dulu dengan: python koordinat_tiles.py --bbox ..."
+)
+tile_server = None
+map_styles = list(TILE_SOURCES)
+if use_local_tiles:
+    tile_dir = st.sidebar.text_input("Folder tile / MBTiles:",
+                                     value=os.environ.get(TILE_DIR_ENV_VAR, DEFAULT_TILE_DIR))
+    fetch_missing = st.sidebar.checkbox(
+        "Unduh tile yang belum ada",
+        value=False,
+        help="Tile yang belum ada di folder diunduh sekali dari server aslinya lalu disimpan"
+    )
+    # Server hanya dijalankan untuk folder yang ada (setiap folder berbeda = satu thread server)
+    if os.path.isdir(tile_dir):
+        tile_server = get_tile_server(os.path.abspath(tile_dir), fetch_missing)
+        map_styles = tile_server.styles()
+    else:
+        st.sidebar.warning(f"Folder tile tidak ditemukan: {tile_dir}. Peta memakai tile online.")
+
+map_style = st.sidebar.selectbox("Pilih style peta:", map_styles)
+tile_url = tile_server.url_template(map_style) if tile_server else None
+if tile_server:
+    tile_stats = tile_server.stats()
+    st.sidebar.caption(f"Tile lokal: {tile_stats['hits']} hit | {tile_stats['misses']} miss | "
+                       f"{tile_stats['fetched']} diunduh | {tile_stats['errors']} gagal")
+bulk_threshold = st.sidebar.number_input(
+    "Batas titik mode marker massal:",
+    min_value=0,
+    value=BULK_MARKER_THRESHOLD,
+    step=500,
+    help="Jika jumlah titik melebihi batas ini, marker ditampilkan sebagai satu layer cluster "
+         "agar peta tetap ringan"
+)
+viewport_mode = st.sidebar.checkbox(
+    "Mode viewport (hanya area yang terlihat)",
+    value=False,
+    help="Hanya titik di area peta yang sedang terlihat yang dikirim ke browser. "
+         "Pada zoom jauh ditampilkan kepadatan per sel grid (atau heatmap), marker muncul setelah zoom in."
 )
 
 # Analisis Toleransi Toggle
@@ -307,55 +598,169 @@ show_tolerance_analysis = st.sidebar.checkbox(
 
 # Filter berdasarkan toleransi (jika ada koordinat center)
 tolerance_filter = "Semua"
-if ('LATITUDE_CENTER_KALKULASI' in df.columns and 
-    'LONGITUDE_CENTER_KALKULASI' in df.columns):
+if 'DISTANCE_SID_CENTER_M' in df.columns:
     tolerance_filter = st.sidebar.selectbox(
         "Filter Toleransi Koordinat:",
         ["Semua", "Hanya Melebihi 20m", "Hanya Dalam Toleransi 20m"],
         help="Filter data berdasarkan perbedaan koordinat SID dan Center"
     )
 
-# Apply filters
-filtered_df = df.copy()
+# Filter hasil validasi plus code (PLUS_CODE_KALKULASI vs Center, SID dan PLUS_CODE_MYSPECTRA)
+selected_plus_code = []
+if 'PLUS_CODE_STATUS' in df.columns:
+    plus_code_counts = df['PLUS_CODE_STATUS'].value_counts()
+    selected_plus_code = st.sidebar.multiselect(
+        "Status Plus Code:",
+        category_options(df['PLUS_CODE_STATUS']),
+        format_func=lambda status: f"{status} ({plus_code_counts.get(status, 0)})",
+        placeholder="Semua",
+        help="Plus code didekode lokal lalu dicocokkan dengan koordinat Center, posisi SID "
+             "dan PLUS_CODE_MYSPECTRA. Kode yang kosong dihitung dari koordinat SID."
+    )
 
-if 'CLNT_NAME' in df.columns and selected_clnt != 'Semua':
-    filtered_df = filtered_df[filtered_df['CLNT_NAME'] == selected_clnt]
+# Filter masa berlaku izin (jika ada kolom VALIDITY_DATE), relatif terhadap tanggal hari ini
+expiry_reference = pd.Timestamp.today().normalize()
+expiry_range = None
+show_expiry_analysis = False
+if VALIDITY_COLUMN in df.columns:
+    st.sidebar.markdown("### 📅 Masa Berlaku Izin")
+    show_expiry_analysis = st.sidebar.checkbox(
+        "Tampilkan Analisis Masa Berlaku",
+        value=False,
+        help="Ringkasan izin yang sudah/akan berakhir dan timeline jumlah izin berakhir per bulan"
+    )
+    expiry_modes = {
+        "Semua": None,
+        "Sudah berakhir": 'expired',
+        "Akan berakhir": 'expiring',
+        "Rentang tanggal": 'range'
+    }
+    expiry_filter = st.sidebar.selectbox(
+        "Filter Masa Berlaku:",
+        list(expiry_modes),
+        help=f"Dihitung dari {VALIDITY_COLUMN} terhadap tanggal hari ini "
+             f"({expiry_reference:%d-%m-%Y}); baris tanpa tanggal tidak ikut saat filter aktif"
+    )
+    expiry_months = EXPIRY_SOON_MONTHS
+    expiry_start = expiry_end = None
+    if expiry_modes[expiry_filter] == 'expiring':
+        expiry_months = st.sidebar.slider("Berakhir dalam (bulan):", 1, 60, EXPIRY_SOON_MONTHS)
+    elif expiry_modes[expiry_filter] == 'range':
+        expiry_dates = st.sidebar.date_input(
+            "Rentang tanggal berakhir:",
+            value=(expiry_reference.date(), (expiry_reference + pd.DateOffset(months=EXPIRY_SOON_MONTHS)).date())
+        )
+        # Saat baru satu tanggal dipilih, rentang dianggap satu hari
+        if len(expiry_dates) > 0:
+            expiry_start, expiry_end = expiry_dates[0], expiry_dates[-1]
+    expiry_range = expiry_window(expiry_modes[expiry_filter], expiry_reference, expiry_months,
+                                 expiry_start, expiry_end)
 
-if 'STATUS_MYSPECTRA' in df.columns and selected_status != 'Semua':
-    filtered_df = filtered_df[filtered_df['STATUS_MYSPECTRA'] == selected_status]
+# Deteksi site duplikat: record berdekatan dengan nama/alamat mirip dianggap satu site fisik
+st.sidebar.markdown("### 🏢 Site Duplikat")
+show_duplicate_analysis = st.sidebar.checkbox(
+    "Tampilkan Analisis Site Duplikat",
+    value=False,
+    help="Mengelompokkan record yang menunjuk ke site fisik yang sama: kedua ujung link, "
+         "pengajuan ulang dengan REQUEST_REFERENCE baru, atau nama sama dengan koordinat sedikit berbeda"
+)
+site_map_mode = st.sidebar.checkbox(
+    "Peta: satu marker per site",
+    value=False,
+    help="Record dalam satu site digabung menjadi satu marker berisi jumlah record (koordinat SID), "
+         "sehingga marker yang dirender lebih sedikit. Tidak berlaku di mode viewport."
+)
+duplicate_distance_m = st.sidebar.number_input(
+    "Jarak maksimum satu site (m):",
+    min_value=1.0,
+    value=float(DUPLICATE_MAX_DISTANCE_M),
+    step=10.0
+)
+duplicate_similarity = st.sidebar.slider(
+    "Kemiripan nama/alamat minimum:",
+    min_value=0.1,
+    max_value=1.0,
+    value=DUPLICATE_TOKEN_SIMILARITY,
+    step=0.05,
+    help="Jaccard token STN_NAME atau STN_ADDR. Record dengan koordinat sama (≤ 1 m) selalu satu site."
+)
 
-if 'CITY' in df.columns and selected_city != 'Semua':
-    filtered_df = filtered_df[filtered_df['CITY'] == selected_city]
+# Analisis kandidat interferensi frekuensi (jika ada kolom FREQ)
+show_interference_analysis = False
+if 'FREQ' in df.columns:
+    st.sidebar.markdown("### 📡 Analisis Interferensi")
+    show_interference_analysis = st.sidebar.checkbox(
+        "Tampilkan Kandidat Interferensi",
+        value=False,
+        help="Mencari pasangan stasiun berdekatan yang pita frekuensinya tumpang tindih"
+    )
+    interference_distance_km = st.sidebar.number_input(
+        "Jarak maksimum antar stasiun (km):",
+        min_value=0.1,
+        value=float(INTERFERENCE_MAX_DISTANCE_KM),
+        step=1.0
+    )
+    interference_guard_mhz = st.sidebar.number_input(
+        "Guard band kanal bersebelahan (MHz):",
+        min_value=0.0,
+        value=INTERFERENCE_GUARD_MHZ,
+        step=1.0,
+        help="0 = hanya pita yang tumpang tindih (co-channel). Di atas 0, pita yang jaraknya "
+             "tidak lebih dari nilai ini ikut dihitung sebagai adjacent-channel."
+    )
 
-if 'Status Verifikasi UPT 2024' in df.columns and selected_verification != 'Semua':
-    filtered_df = filtered_df[filtered_df['Status Verifikasi UPT 2024'] == selected_verification]
+# Apply filters lewat inverted index, hanya hasil akhir yang dimaterialisasi
+# Baris tanpa koordinat center (TOLERANCE_STATUS kosong) tidak masuk filter toleransi
+tolerance_values = {
+    "Semua": [],
+    "Hanya Melebihi 20m": ['MELEBIHI TOLERANSI'],
+    "Hanya Dalam Toleransi 20m": ['DALAM TOLERANSI']
+}[tolerance_filter]
 
-# Filter berdasarkan toleransi koordinat
-if (tolerance_filter != "Semua" and 
-    'LATITUDE_CENTER_KALKULASI' in df.columns and 
-    'LONGITUDE_CENTER_KALKULASI' in df.columns):
-    
-    # Hitung jarak untuk setiap baris
-    tolerance_mask = []
-    for idx, row in filtered_df.iterrows():
-        if (pd.notna(row['SID_LAT']) and pd.notna(row['SID_LONG']) and 
-            pd.notna(row['LATITUDE_CENTER_KALKULASI']) and pd.notna(row['LONGITUDE_CENTER_KALKULASI'])):
-            
-            distance = calculate_distance(
-                row['SID_LAT'], row['SID_LONG'],
-                row['LATITUDE_CENTER_KALKULASI'], row['LONGITUDE_CENTER_KALKULASI']
-            )
-            
-            if tolerance_filter == "Hanya Melebihi 20m":
-                tolerance_mask.append(distance > 20)
-            elif tolerance_filter == "Hanya Dalam Toleransi 20m":
-                tolerance_mask.append(distance <= 20)
-        else:
-            # Jika tidak ada data koordinat center, tidak masuk filter
-            tolerance_mask.append(False)
-    
-    if tolerance_mask:
-        filtered_df = filtered_df[tolerance_mask]
+filter_selections = {
+    'CLNT_NAME': selected_clnt,
+    'STATUS_MYSPECTRA': selected_status,
+    'CITY': selected_city,
+    'Status Verifikasi UPT 2024': selected_verification,
+    'TOLERANCE_STATUS': tolerance_values,
+    'PLUS_CODE_STATUS': selected_plus_code,
+    'SOURCE_FILE': selected_sources
+}
+
+# State filter lengkap sebagai key cache; rerun tanpa perubahan filter memakai hasil sebelumnya
+filter_state = (dataset_key, streaming_mode) + tuple(
+    (col, tuple(values)) for col, values in filter_selections.items()
+) + ((VALIDITY_COLUMN, expiry_range),)
+result_cache = get_result_cache()
+
+def apply_filters():
+    filtered_rows = get_filter_index(dataset_key, streaming_mode, df).query(filter_selections)
+    if expiry_range is not None:
+        # Rentang tanggal dijawab dari ExpiryIndex lalu diiriskan dengan hasil inverted index
+        expiry_rows = get_expiry_index(dataset_key, streaming_mode, df).query(*expiry_range)
+        filtered_rows = expiry_rows if filtered_rows is None else np.intersect1d(
+            filtered_rows, expiry_rows, assume_unique=True
+        )
+    return df if filtered_rows is None else df.iloc[filtered_rows]
+
+with profiler.stage("filter") as stage_info:
+    filtered_df = result_cache.get_or_create(('filtered',) + filter_state, apply_filters)
+    stage_info['rows'] = len(filtered_df)
+
+# Site fisik dari data terfilter, dihitung hanya saat peta site atau analisis duplikat dibuka
+duplicate_state = filter_state + (duplicate_distance_m, duplicate_similarity)
+
+def get_sites(profiler):
+    """(SITE_ID per baris filtered_df, ringkasan per site) dari ResultCache"""
+    with profiler.stage("duplicate_sites", rows=len(filtered_df)):
+        site_ids = result_cache.get_or_create(
+            ('site_ids',) + duplicate_state,
+            lambda: find_duplicate_sites(filtered_df, duplicate_distance_m, duplicate_similarity)
+        )
+        sites = result_cache.get_or_create(
+            ('sites',) + duplicate_state, lambda: site_summary(filtered_df, site_ids)
+        )
+    return site_ids, sites
 
 # Metrics
 col1, col2, col3, col4 = st.columns(4)
@@ -384,150 +789,129 @@ with col4:
     else:
         st.markdown(f'<div class="metric-container"><h3>-</h3><p>Status Info</p></div>', unsafe_allow_html=True)
 
-# Fungsi untuk membuat peta
-def create_map(data, coord_type, map_style):
-    if data.empty:
-        return None
+# Bagian-bagian halaman di bawah dijalankan sebagai fragment: interaksi di dalamnya
+# (geser peta, buka/tutup chart) hanya menjalankan ulang fragment tersebut.
+# Chart dan analisis dibuat hanya saat toggle-nya dibuka, hasilnya disimpan di ResultCache per state filter.
+
+# Fungsi untuk menampilkan tabel instrumentasi satu profiler (dan mencatatnya ke file log)
+def show_profiler(profiler, title, expanded, **log_context):
+    with st.expander(title, expanded=expanded):
+        st.dataframe(profiler.to_frame(), use_container_width=True, hide_index=True)
+        st.caption(f"Total {profiler.total_seconds * 1000:.0f} ms untuk {len(profiler.records)} tahap | "
+                   f"Cache hasil: {result_cache.hits} hit, {result_cache.misses} miss, "
+                   f"{result_cache.total_bytes / 2**20:.0f} MB")
         
-    # Tentukan center peta berdasarkan data
-    center_lat = data['SID_LAT'].mean()
-    center_lon = data['SID_LONG'].mean()
-    
-    # Mapping style peta
-    tile_options = {
-        "OpenStreetMap": None,
-        "Satellite": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
-        "Terrain": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Terrain_Base/MapServer/tile/{z}/{y}/{x}",
-        "CartoDB Positron": "CartoDB positron",
-        "CartoDB Dark_Matter": "CartoDB dark_matter"
-    }
+        if profile_log_path:
+            # ID sesi agar rerun dari sesi yang sama bisa dikelompokkan di log
+            session_id = st.session_state.setdefault('profile_session_id', uuid.uuid4().hex[:12])
+            try:
+                profiler.write_log(
+                    profile_log_path, session=session_id, file=selected_file,
+                    total_rows=len(df), filtered_rows=len(filtered_df), streaming=streaming_mode,
+                    viewport=viewport_mode, coord=coord_option, map_style=map_style, **log_context
+                )
+                st.caption(f"Dicatat ke {profile_log_path}")
+            except OSError as e:
+                st.warning(f"Gagal menulis log instrumentasi: {e}")
+
+# Dekorator fragment dengan StageProfiler sendiri
+def profiled_fragment(section):
+    """
+    st.fragment yang memberi section profiler baru di setiap run-nya. Rerun fragment saja tidak
+    menjalankan panel instrumentasi di bawah halaman, jadi tahap fragment ditampilkan di panel
+    fragment itu sendiri (section menerima profiler sebagai argumen pertama)
+    """
+    @st.fragment
+    @functools.wraps(section)
+    def run_section():
+        fragment_profiler = StageProfiler(enabled=profiling_mode)
+        section(fragment_profiler)
+        if fragment_profiler.records:
+            show_profiler(fragment_profiler,
+                          f"🐞 Instrumentasi fragment {section.__name__} "
+                          f"({fragment_profiler.total_seconds * 1000:.0f} ms)",
+                          expanded=False, fragment=section.__name__)
+    return run_section
+
+@profiled_fragment
+def viewport_map_section(profiler):
+    """
+    Peta mode viewport; geser/zoom hanya menjalankan ulang fragment ini.
+    Klik titik baru menjalankan ulang seluruh halaman agar pencarian stasiun di sekitar titik ikut diperbarui
+    """
+    # Tampilan zoom jauh: grid/heatmap kepadatan, bisa dipecah per client atau service
+    group_options = [col for col in ['CLNT_NAME', 'SERVICE'] if col in filtered_df.columns]
+    style_col, group_col, category_col = st.columns([1, 1, 2])
+    with style_col:
+        density_style = st.radio("Zoom jauh:", ["Grid", "Heatmap"], horizontal=True, key="density_style")
+    with group_col:
+        density_group = st.selectbox("Kepadatan per:", ["(semua stasiun)"] + group_options, key="density_group")
+    density_group = None if density_group == "(semua stasiun)" else density_group
     
-    # Buat peta dasar
-    if map_style == "OpenStreetMap":
-        m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
-    elif map_style in ["CartoDB Positron", "CartoDB Dark_Matter"]:
-        m = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles=tile_options[map_style])
-    else:
-        m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
-        folium.TileLayer(
-            tiles=tile_options[map_style],
-            attr=map_style,
-            name=map_style
-        ).add_to(m)
-    
-    # Color mapping untuk client names (jika ada kolom CLNT_NAME)
-    if 'CLNT_NAME' in data.columns:
-        unique_clients = data['CLNT_NAME'].unique()
-        colors = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 'lightred', 
-                  'beige', 'darkblue', 'darkgreen', 'cadetblue', 'darkpurple', 'white', 
-                  'pink', 'lightblue', 'lightgreen', 'gray', 'black', 'lightgray']
-        color_map = {client: colors[i % len(colors)] for i, client in enumerate(unique_clients)}
-    else:
-        color_map = {}
+    # Peta dasar dipakai ulang (id sama) agar st_folium hanya mengganti layer titik
+    lat_col, lon_col = coord_columns(coord_option)
+    with profiler.stage("spatial_index", rows=len(filtered_df)):
+        spatial_index = result_cache.get_or_create(
+            ('spatial',) + filter_state + (lat_col,),
+            lambda: SpatialGridIndex(filtered_df[lat_col], filtered_df[lon_col])
+        )
+        base_map = result_cache.get_or_create(
+            ('base_map',) + filter_state + (map_style, tile_url),
+            lambda: create_base_map(filtered_df, map_style, tile_url)
+        )
     
-    # Tambahkan markers berdasarkan pilihan koordinat
-    for idx, row in data.iterrows():
-        # Buat popup content dinamis berdasarkan kolom yang tersedia
-        popup_content = "<div style='width: 300px;'>"
-        
-        # Header dengan nama stasiun (jika ada)
-        if 'STN_NAME' in row and pd.notna(row['STN_NAME']):
-            popup_content += f"<h4><b>{row['STN_NAME']}</b></h4><hr>"
-        else:
-            popup_content += f"<h4><b>Data Point #{idx}</b></h4><hr>"
-        
-        # Informasi dinamis berdasarkan kolom yang tersedia
-        info_fields = {
-            'CLNT_NAME': 'Client',
-            'CITY': 'Kota',
-            'STATUS_MYSPECTRA': 'Status MySpectra',
-            'Status Verifikasi UPT 2024': 'Status Verifikasi UPT',
-            'FREQ': 'Frequency (MHz)',
-            'ERP_PWR_DBM': 'Power (dBm)',
-            'STN_ADDR': 'Alamat'
-        }
-        
-        for col, label in info_fields.items():
-            if col in row and pd.notna(row[col]):
-                value = row[col]
-                if col in ['FREQ', 'ERP_PWR_DBM']:
-                    popup_content += f"<b>{label}:</b> {value}<br>"
-                else:
-                    popup_content += f"<b>{label}:</b> {value}<br>"
-        
-        # Koordinat
-        popup_content += "<hr><b>Koordinat SID:</b><br>"
-        popup_content += f"Lat: {row['SID_LAT']}, Long: {row['SID_LONG']}<br>"
-        
-        if 'LATITUDE_CENTER_KALKULASI' in row and pd.notna(row['LATITUDE_CENTER_KALKULASI']):
-            popup_content += "<b>Koordinat Center:</b><br>"
-            popup_content += f"Lat: {row['LATITUDE_CENTER_KALKULASI']}, Long: {row['LONGITUDE_CENTER_KALKULASI']}"
-        
-        popup_content += "</div>"
-        
-        # Tentukan warna marker
-        if 'CLNT_NAME' in row and row['CLNT_NAME'] in color_map:
-            client_color = color_map[row['CLNT_NAME']]
-        else:
-            client_color = 'red'
-        
-        # Tentukan tooltip
-        if 'STN_NAME' in row and pd.notna(row['STN_NAME']):
-            if 'CLNT_NAME' in row and pd.notna(row['CLNT_NAME']):
-                tooltip_text = f"{row['STN_NAME']} - {row['CLNT_NAME']}"
-            else:
-                tooltip_text = str(row['STN_NAME'])
-        else:
-            tooltip_text = f"Data Point #{idx}"
-        
-        # Add markers berdasarkan koordinat
-        if coord_type == "SID (SID_LONG, SID_LAT)":
-            folium.Marker(
-                location=[row['SID_LAT'], row['SID_LONG']],
-                popup=folium.Popup(popup_content, max_width=300),
-                tooltip=tooltip_text,
-                icon=folium.Icon(color=client_color, icon='info-sign')
-            ).add_to(m)
-            
-        elif coord_type.startswith("Center") and 'LATITUDE_CENTER_KALKULASI' in row:
-            if pd.notna(row['LATITUDE_CENTER_KALKULASI']) and pd.notna(row['LONGITUDE_CENTER_KALKULASI']):
-                folium.Marker(
-                    location=[row['LATITUDE_CENTER_KALKULASI'], row['LONGITUDE_CENTER_KALKULASI']],
-                    popup=folium.Popup(popup_content, max_width=300),
-                    tooltip=f"{tooltip_text} (Center)",
-                    icon=folium.Icon(color=client_color, icon='bullseye')
-                ).add_to(m)
-                
-        elif coord_type == "Keduanya":
-            # Marker untuk SID
-            folium.Marker(
-                location=[row['SID_LAT'], row['SID_LONG']],
-                popup=folium.Popup(popup_content, max_width=300),
-                tooltip=f"{tooltip_text} - SID",
-                icon=folium.Icon(color=client_color, icon='info-sign')
-            ).add_to(m)
-            
-            # Marker untuk Center (jika ada)
-            if (pd.notna(row.get('LATITUDE_CENTER_KALKULASI')) and 
-                pd.notna(row.get('LONGITUDE_CENTER_KALKULASI'))):
-                folium.Marker(
-                    location=[row['LATITUDE_CENTER_KALKULASI'], row['LONGITUDE_CENTER_KALKULASI']],
-                    popup=folium.Popup(popup_content, max_width=300),
-                    tooltip=f"{tooltip_text} - Center",
-                    icon=folium.Icon(color=client_color, icon='bullseye')
-                ).add_to(m)
-                
-                # Garis penghubung antara SID dan Center
-                folium.PolyLine(
-                    locations=[[row['SID_LAT'], row['SID_LONG']], 
-                              [row['LATITUDE_CENTER_KALKULASI'], row['LONGITUDE_CENTER_KALKULASI']]],
-                    color=client_color,
-                    weight=2,
-                    opacity=0.7,
-                    dash_array="5, 5"
-                ).add_to(m)
-    
-    return m
+    # Grid kepadatan semua level zoom dihitung sekali per state filter, ganti zoom tidak memindai ulang data
+    with profiler.stage("density_grid", rows=len(filtered_df)):
+        density = result_cache.get_or_create(
+            ('density',) + filter_state + (lat_col, density_group),
+            lambda: DensityGrid(filtered_df[lat_col], filtered_df[lon_col],
+                                filtered_df[density_group] if density_group else None)
+        )
+    
+    category = None
+    if density_group:
+        with category_col:
+            category = st.selectbox("Kategori:", ["Semua"] + list(density.category_names),
+                                    key="density_category")
+        category = None if category == "Semua" else category
+    
+    view = st.session_state.get('viewport_map')
+    with profiler.stage("viewport_layer"):
+        viewport_layer, viewport_message = build_viewport_layer(
+            filtered_df, spatial_index, density, coord_option,
+            viewport_bounds(view, filtered_df, lat_col, lon_col),
+            (view or {}).get('zoom') or 10, density_style, category
+        )
+    with profiler.stage("st_folium"):
+        view = st_folium(
+            copy.deepcopy(base_map),
+            key="viewport_map",
+            feature_group_to_add=viewport_layer,
+            returned_objects=["bounds", "zoom", "last_clicked"],
+            width=800,
+            height=600
+        )
+    st.caption(viewport_message)
+    if density_group and density_style == "Grid" and category is None:
+        st.markdown(density_legend_html(density), unsafe_allow_html=True)
+    
+    clicked = (view or {}).get('last_clicked')
+    if clicked != st.session_state.get('viewport_last_clicked'):
+        st.session_state['viewport_last_clicked'] = clicked
+        st.rerun()
+
+@profiled_fragment
+def overview_section(profiler):
+    """Chart distribusi client dan top 10 kota"""
+    if not st.toggle("Tampilkan chart client & kota", key="show_overview_charts"):
+        return
+    
+    with profiler.stage("overview_charts", rows=len(filtered_df)):
+        overview_figures = result_cache.get_or_create(
+            ('overview',) + filter_state, lambda: build_overview_figures(filtered_df)
+        )
+        for fig in overview_figures.values():
+            st.plotly_chart(fig, use_container_width=True)
 
 # Main content area
 col_left, col_right = st.columns([3, 1])
@@ -535,11 +919,30 @@ col_left, col_right = st.columns([3, 1])
 with col_left:
     st.markdown("### 🗺️ Peta Interaktif")
     
-    if not filtered_df.empty:
-        # Buat dan tampilkan peta
-        map_obj = create_map(filtered_df, coord_option, map_style)
-        if map_obj:
-            map_data = st_folium(map_obj, width=800, height=600)
+    if not filtered_df.empty and viewport_mode:
+        viewport_map_section()
+    elif not filtered_df.empty and site_map_mode:
+        # Satu marker per site fisik berisi jumlah record
+        _, sites = get_sites(profiler)
+        with profiler.stage("create_site_map", rows=len(sites)):
+            map_html = result_cache.get_or_create(
+                ('site_map',) + duplicate_state + (map_style, bulk_threshold, tile_url),
+                lambda: create_site_map(sites, map_style, bulk_threshold, tile_url).get_root().render()
+            )
+        st.caption(f"{len(filtered_df)} record digabung menjadi {len(sites)} site (koordinat SID). "
+                   f"Angka di marker = jumlah record; abu-abu gelap = site dengan lebih dari satu client.")
+        with profiler.stage("map_component"):
+            st.iframe(map_html, width=800, height=600)
+    elif not filtered_df.empty:
+        # Buat dan tampilkan peta (HTML dipakai ulang selama filter dan style tidak berubah)
+        with profiler.stage("create_map", rows=len(filtered_df)):
+            map_html = result_cache.get_or_create(
+                ('map',) + filter_state + (coord_option, map_style, bulk_threshold, tile_url),
+                lambda: render_map_html(filtered_df, coord_option, map_style, bulk_threshold, tile_url)
+            )
+        if map_html:
+            with profiler.stage("map_component"):
+                st.iframe(map_html, width=800, height=600)
     else:
         st.warning("Tidak ada data yang sesuai dengan filter yang dipilih.")
 
@@ -547,184 +950,129 @@ with col_right:
     st.markdown("### 📈 Statistik")
     
     if not filtered_df.empty:
-        # Chart distribusi client (jika kolom tersedia)
-        if 'CLNT_NAME' in filtered_df.columns:
-            fig_client = px.pie(
-                filtered_df, 
-                names='CLNT_NAME', 
-                title='Distribusi Client',
-                height=300
-            )
-            fig_client.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_client, use_container_width=True)
-        
-        # Chart distribusi kota (jika kolom tersedia)
-        if 'CITY' in filtered_df.columns:
-            city_counts = filtered_df['CITY'].value_counts().head(10)
-            fig_city = px.bar(
-                x=city_counts.values,
-                y=city_counts.index,
-                orientation='h',
-                title='Top 10 Kota',
-                height=300
-            )
-            fig_city.update_layout(yaxis_title="Kota", xaxis_title="Jumlah")
-            st.plotly_chart(fig_city, use_container_width=True)
+        overview_section()
 
-# Analisis Perbandingan Koordinat (jika ada koordinat center dan toggle aktif)
-if (show_tolerance_analysis and 
-    'LATITUDE_CENTER_KALKULASI' in filtered_df.columns and 
-    'LONGITUDE_CENTER_KALKULASI' in filtered_df.columns):
-    st.markdown("### 📊 Analisis Perbandingan Koordinat")
+# Pencarian stasiun di sekitar titik, dari seluruh stasiun di file (koordinat SID)
+# Pada mode viewport, klik di peta mengisi koordinat pencarian
+clicked_point = (st.session_state.get('viewport_map') or {}).get('last_clicked') if viewport_mode else None
+with st.expander("🔎 Cari Stasiun di Sekitar Titik", expanded=clicked_point is not None):
+    if clicked_point is None:
+        st.caption("Isi koordinat titik, atau aktifkan mode viewport lalu klik peta.")
+    
+    search_col1, search_col2, search_col3, search_col4 = st.columns(4)
+    with search_col1:
+        search_lat = st.number_input(
+            "Latitude titik:",
+            value=float(clicked_point['lat'] if clicked_point else df['SID_LAT'].median()),
+            format="%.6f"
+        )
+    with search_col2:
+        search_lon = st.number_input(
+            "Longitude titik:",
+            value=float(clicked_point['lng'] if clicked_point else df['SID_LONG'].median()),
+            format="%.6f"
+        )
+    with search_col3:
+        search_type = st.radio("Jenis pencarian:", ["Radius", "Terdekat"], horizontal=True)
+    with search_col4:
+        if search_type == "Radius":
+            search_radius_km = st.number_input("Radius (km):", min_value=0.1, value=5.0, step=0.5)
+        else:
+            search_k = st.number_input("Jumlah stasiun:", min_value=1, value=10, step=1)
     
-    # Hitung jarak antara SID dan Center coordinates
-    distances = []
-    valid_comparison = 0
-    tolerance_exceeded = []
-    coord_analysis_data = []
+    with profiler.stage("nearby_search") as stage_info:
+        station_index = get_spatial_index(dataset_key, streaming_mode, 'SID_LAT', 'SID_LONG', df)
+        if search_type == "Radius":
+            nearby_df = find_nearby_stations(df, station_index, search_lat, search_lon,
+                                             radius_m=search_radius_km * 1000)
+        else:
+            nearby_df = find_nearby_stations(df, station_index, search_lat, search_lon, k=search_k)
+        stage_info['rows'] = len(nearby_df)
     
-    for idx, row in filtered_df.iterrows():
-        if (pd.notna(row['SID_LAT']) and pd.notna(row['SID_LONG']) and 
-            pd.notna(row['LATITUDE_CENTER_KALKULASI']) and pd.notna(row['LONGITUDE_CENTER_KALKULASI'])):
-            
-            distance = calculate_distance(
-                row['SID_LAT'], row['SID_LONG'],
-                row['LATITUDE_CENTER_KALKULASI'], row['LONGITUDE_CENTER_KALKULASI']
+    if search_type == "Radius":
+        st.write(f"**{len(nearby_df)}** stasiun dalam radius {search_radius_km:g} km")
+    else:
+        st.write(f"**{len(nearby_df)}** stasiun terdekat")
+    
+    if not nearby_df.empty:
+        nearby_columns = [col for col in ['STN_NAME', 'CLNT_NAME', 'CITY', 'FREQ', 'SID_LAT', 'SID_LONG']
+                          if col in nearby_df.columns] + ['DISTANCE_M']
+        nearby_display = nearby_df[nearby_columns].copy()
+        nearby_display['DISTANCE_M'] = nearby_display['DISTANCE_M'].round(1)
+        st.dataframe(nearby_display, height=300, use_container_width=True)
+
+@profiled_fragment
+def tolerance_section(profiler):
+    """
+    Analisis jarak SID-Center; ringkasan selalu tampil, histogram, tabel, chart dan
+    statistik detail dibuat hanya saat toggle masing-masing dibuka
+    """
+    summary = result_cache.get_or_create(
+        ('tolerance_summary',) + filter_state, lambda: tolerance_summary(filtered_df)
+    )
+    if summary is None:
+        st.warning("Tidak ada data koordinat yang valid untuk dibandingkan.")
+        return
+    
+    # Metrics dengan informasi toleransi
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Rata-rata Jarak", f"{summary['mean_m']:.2f} m")
+    
+    with col2:
+        st.metric("Jarak Maksimum", f"{summary['max_m']:.2f} m")
+    
+    with col3:
+        st.metric("🚨 Melebihi 20m", f"{summary['exceeded']}")
+    
+    with col4:
+        st.metric("✅ Dalam Toleransi", f"{summary['within_tolerance']}")
+    
+    if st.toggle("📈 Distribusi jarak", key="show_distance_histogram"):
+        with profiler.stage("distance_histogram", rows=len(filtered_df)):
+            fig_dist = result_cache.get_or_create(
+                ('distance_histogram',) + filter_state, lambda: build_distance_histogram(filtered_df)
+            )
+            st.plotly_chart(fig_dist, use_container_width=True)
+    
+    if st.toggle("🚨 Tabel data melebihi toleransi", key="show_exceeded_table"):
+        with profiler.stage("exceeded_table", rows=len(filtered_df)):
+            tolerance_df = result_cache.get_or_create(
+                ('exceeded_table',) + filter_state, lambda: build_exceeded_table(filtered_df)
             )
-            distances.append(distance)
-            valid_comparison += 1
-            
-            # Cek toleransi >20 meter
-            if distance > 20:
-                tolerance_exceeded.append({
-                    'Index': idx,
-                    'STN_NAME': row.get('STN_NAME', f'Data #{idx}'),
-                    'CLNT_NAME': row.get('CLNT_NAME', 'N/A'),
-                    'CITY': row.get('CITY', 'N/A'),
-                    'SID_LAT': row['SID_LAT'],
-                    'SID_LONG': row['SID_LONG'],
-                    'CENTER_LAT': row['LATITUDE_CENTER_KALKULASI'],
-                    'CENTER_LONG': row['LONGITUDE_CENTER_KALKULASI'],
-                    'Distance_m': distance,
-                    'Status': 'MELEBIHI TOLERANSI' if distance > 20 else 'DALAM TOLERANSI'
-                })
-            
-            # Data untuk analisis umum
-            coord_analysis_data.append({
-                'Index': idx,
-                'STN_NAME': row.get('STN_NAME', f'Data #{idx}'),
-                'CLNT_NAME': row.get('CLNT_NAME', 'N/A'),
-                'Distance_m': distance,
-                'Status': 'MELEBIHI TOLERANSI' if distance > 20 else 'DALAM TOLERANSI'
-            })
-    
-    if distances:
-        # Metrics dengan informasi toleransi
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            avg_distance = np.mean(distances)
-            st.metric("Rata-rata Jarak", f"{avg_distance:.2f} m")
-        
-        with col2:
-            max_distance = np.max(distances)
-            st.metric("Jarak Maksimum", f"{max_distance:.2f} m")
-        
-        with col3:
-            exceed_count = len(tolerance_exceeded)
-            st.metric("🚨 Melebihi 20m", f"{exceed_count}")
-        
-        with col4:
-            within_tolerance = valid_comparison - exceed_count
-            st.metric("✅ Dalam Toleransi", f"{within_tolerance}")
-        
-        # Histogram jarak dengan garis toleransi
-        fig_dist = px.histogram(
-            x=distances,
-            title="Distribusi Jarak antara Koordinat SID dan Center",
-            nbins=30,
-            labels={'x': 'Jarak (meter)', 'y': 'Frekuensi'}
-        )
-        
-        # Tambahkan garis vertikal untuk toleransi 20m
-        fig_dist.add_vline(x=20, line_dash="dash", line_color="red", 
-                          annotation_text="Batas Toleransi 20m", 
-                          annotation_position="top right")
-        
-        st.plotly_chart(fig_dist, use_container_width=True)
         
         # Tabel data yang melebihi toleransi
-        if tolerance_exceeded:
+        if not tolerance_df.empty:
             st.markdown("#### 🚨 Data yang Melebihi Toleransi 20 Meter")
-            tolerance_df = pd.DataFrame(tolerance_exceeded)
-            
-            # Format kolom untuk tampilan yang lebih baik
-            for col in ['SID_LAT', 'SID_LONG', 'CENTER_LAT', 'CENTER_LONG']:
-                tolerance_df[col] = tolerance_df[col].round(6)
-            tolerance_df['Distance_m'] = tolerance_df['Distance_m'].round(2)
             
-            # Styling untuk tabel
-            styled_tolerance_df = tolerance_df.style.apply(
-                lambda x: ['background-color: #ffebee' if x.name % 2 == 0 else 'background-color: #fce4ec' 
-                          for i in x], axis=1
-            )
-            
-            st.dataframe(styled_tolerance_df, height=300, use_container_width=True)
+            # Hanya halaman yang dilihat yang dikirim, zebra striping lewat CSS
+            with profiler.stage("tolerance_table", rows=len(tolerance_df)):
+                paginated_table(tolerance_df, "exceeded_table", filter_state, height=300, striped=True)
             
             # Download button untuk data melebihi toleransi
-            tolerance_csv = tolerance_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Data Melebihi Toleransi (CSV)",
-                data=tolerance_csv,
-                file_name=f"toleransi_exceeded_{selected_file.replace('.csv', '')}.csv",
-                mime="text/csv"
-            )
+            export_download(tolerance_df, "exceeded_export", filter_state,
+                            f"toleransi_exceeded_{selected_file.replace('.csv', '')}",
+                            "📥 Download Data Melebihi Toleransi")
         else:
             st.success("✅ Semua data dalam toleransi 20 meter!")
-        
-        # Chart perbandingan dalam vs melebihi toleransi
-        col_chart1, col_chart2 = st.columns(2)
-        
-        with col_chart1:
-            # Pie chart toleransi
-            tolerance_counts = pd.Series([len(tolerance_exceeded), valid_comparison - len(tolerance_exceeded)], 
-                                       index=['Melebihi 20m', 'Dalam Toleransi'])
-            
-            fig_tolerance = px.pie(
-                values=tolerance_counts.values,
-                names=tolerance_counts.index,
-                title="Distribusi Status Toleransi",
-                color_discrete_map={
-                    'Melebihi 20m': '#ff5252',
-                    'Dalam Toleransi': '#4caf50'
-                }
+    
+    if st.toggle("🥧 Status toleransi & jarak per titik", key="show_tolerance_charts"):
+        with profiler.stage("tolerance_charts", rows=len(filtered_df)):
+            tolerance_figures = result_cache.get_or_create(
+                ('tolerance_charts',) + filter_state, lambda: build_tolerance_charts(filtered_df)
             )
-            st.plotly_chart(fig_tolerance, use_container_width=True)
-        
-        with col_chart2:
-            # Scatter plot jarak vs index
-            coord_df = pd.DataFrame(coord_analysis_data)
             
-            fig_scatter = px.scatter(
-                coord_df,
-                x=range(len(coord_df)),
-                y='Distance_m',
-                color='Status',
-                title="Jarak per Data Point",
-                labels={'x': 'Index Data', 'y': 'Jarak (meter)'},
-                color_discrete_map={
-                    'Melebihi 20m': '#ff5252',
-                    'Dalam Toleransi': '#4caf50'
-                },
-                hover_data=['STN_NAME', 'CLNT_NAME']
-            )
+            # Chart perbandingan dalam vs melebihi toleransi
+            col_chart1, col_chart2 = st.columns(2)
             
-            # Tambahkan garis toleransi
-            fig_scatter.add_hline(y=20, line_dash="dash", line_color="red", 
-                                 annotation_text="Toleransi 20m")
+            with col_chart1:
+                st.plotly_chart(tolerance_figures['fig_tolerance'], use_container_width=True)
             
-            st.plotly_chart(fig_scatter, use_container_width=True)
-        
+            with col_chart2:
+                st.plotly_chart(tolerance_figures['fig_scatter'], use_container_width=True)
+    
+    if st.toggle("📈 Statistik detail koordinat", key="show_tolerance_stats"):
         # Statistik detail
         st.markdown("#### 📈 Statistik Detail Koordinat")
         
@@ -732,65 +1080,199 @@ if (show_tolerance_analysis and
         
         with stats_col1:
             st.markdown("**📊 Statistik Jarak:**")
-            st.write(f"• Minimum: {np.min(distances):.2f} m")
-            st.write(f"• Median: {np.median(distances):.2f} m")
-            st.write(f"• Standar Deviasi: {np.std(distances):.2f} m")
-            
+            st.write(f"• Minimum: {summary['min_m']:.2f} m")
+            st.write(f"• Median: {summary['median_m']:.2f} m")
+            st.write(f"• Standar Deviasi: {summary['std_m']:.2f} m")
+        
         with stats_col2:
             st.markdown("**🎯 Kategori Toleransi:**")
-            within_5m = sum(1 for d in distances if d <= 5)
-            within_10m = sum(1 for d in distances if 5 < d <= 10)
-            within_20m = sum(1 for d in distances if 10 < d <= 20)
-            above_20m = sum(1 for d in distances if d > 20)
-            
-            st.write(f"• ≤ 5m: {within_5m} data")
-            st.write(f"• 5-10m: {within_10m} data")
-            st.write(f"• 10-20m: {within_20m} data")
-            st.write(f"• > 20m: {above_20m} data")
-            
+            st.write(f"• ≤ 5m: {summary['within_5m']} data")
+            st.write(f"• 5-10m: {summary['within_10m']} data")
+            st.write(f"• 10-20m: {summary['within_20m']} data")
+            st.write(f"• > 20m: {summary['above_20m']} data")
+        
         with stats_col3:
             st.markdown("**⚠️ Persentase:**")
-            total = len(distances)
-            pct_within = ((total - len(tolerance_exceeded)) / total * 100) if total > 0 else 0
-            pct_exceeded = (len(tolerance_exceeded) / total * 100) if total > 0 else 0
-            
-            st.write(f"• Dalam Toleransi: {pct_within:.1f}%")
-            st.write(f"• Melebihi Toleransi: {pct_exceeded:.1f}%")
+            st.write(f"• Dalam Toleransi: {summary['pct_within']:.1f}%")
+            st.write(f"• Melebihi Toleransi: {summary['pct_exceeded']:.1f}%")
+
+@profiled_fragment
+def expiry_section(profiler):
+    """
+    Ringkasan masa berlaku izin dari ExpiryIndex data terfilter; timeline per bulan
+    dibuat hanya saat toggle dibuka
+    """
+    expiry_index = result_cache.get_or_create(
+        ('expiry_index',) + filter_state, lambda: ExpiryIndex(filtered_df[VALIDITY_COLUMN])
+    )
+    soon_end = expiry_reference + pd.DateOffset(months=EXPIRY_SOON_MONTHS)
+    expired = expiry_index.count(None, expiry_reference - pd.Timedelta(days=1))
+    expiring = expiry_index.count(expiry_reference, soon_end)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("⛔ Sudah Berakhir", f"{expired}")
+    
+    with col2:
+        st.metric(f"⏳ Berakhir ≤ {EXPIRY_SOON_MONTHS} Bulan", f"{expiring}")
+    
+    with col3:
+        st.metric("✅ Masih Berlaku", f"{len(expiry_index.dates) - expired - expiring}")
+    
+    with col4:
+        st.metric("❔ Tanpa Tanggal", f"{expiry_index.n_missing}")
+    
+    if st.toggle("📅 Timeline izin berakhir per bulan", key="show_expiry_timeline"):
+        with profiler.stage("expiry_timeline", rows=len(filtered_df)):
+            fig_timeline = result_cache.get_or_create(
+                ('expiry_timeline',) + filter_state,
+                lambda: build_expiry_timeline(expiry_index.monthly_counts(), expiry_reference,
+                                              EXPIRY_SOON_MONTHS)
+            )
+            st.plotly_chart(fig_timeline, use_container_width=True)
+
+# Analisis Perbandingan Koordinat (jika ada koordinat center dan toggle aktif)
+if show_tolerance_analysis and 'DISTANCE_SID_CENTER_M' in filtered_df.columns:
+    st.markdown("### 📊 Analisis Perbandingan Koordinat")
+    tolerance_section()
+
+# Analisis masa berlaku izin (jika ada VALIDITY_DATE dan toggle aktif)
+if show_expiry_analysis and not filtered_df.empty:
+    st.markdown("### 📅 Analisis Masa Berlaku Izin")
+    expiry_section()
+
+@profiled_fragment
+def duplicate_section(profiler):
+    """Ringkasan site duplikat; tabel site dan tabel record per site dibuat saat toggle dibuka"""
+    site_ids, sites = get_sites(profiler)
+    duplicate_sites = sites[sites['JUMLAH_RECORD'] > 1]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Record", f"{len(filtered_df)}")
+    
+    with col2:
+        st.metric("🏢 Site Fisik", f"{len(sites)}")
+    
+    with col3:
+        st.metric("🔁 Site dengan Duplikat", f"{len(duplicate_sites)}")
+    
+    with col4:
+        st.metric("Record Berlebih", f"{len(filtered_df) - len(sites)}")
     
+    if duplicate_sites.empty:
+        st.success("✅ Tidak ada site duplikat dengan parameter ini")
+        return
+    
+    if st.toggle("🏢 Tabel site duplikat", key="show_duplicate_sites"):
+        sites_table = result_cache.get_or_create(
+            ('duplicate_sites',) + duplicate_state,
+            lambda: duplicate_sites.sort_values('JUMLAH_RECORD', ascending=False, kind='stable')
+                                   .round({'SID_LAT': 6, 'SID_LONG': 6}).reset_index(drop=True)
+        )
+        paginated_table(sites_table, "duplicate_sites_table", duplicate_state, height=300)
+    
+    if st.toggle("📋 Record per site duplikat", key="show_duplicate_records"):
+        with profiler.stage("duplicate_table", rows=len(filtered_df)):
+            duplicate_df = result_cache.get_or_create(
+                ('duplicate_table',) + duplicate_state,
+                lambda: build_duplicate_table(filtered_df, site_ids, sites)
+            )
+        paginated_table(duplicate_df, "duplicate_table", duplicate_state, height=300)
+        export_download(duplicate_df, "duplicate_export", duplicate_state,
+                        f"site_duplikat_{selected_file.replace('.csv', '')}",
+                        "📥 Download Record Site Duplikat")
+
+# Analisis site duplikat (jika toggle aktif)
+if show_duplicate_analysis and not filtered_df.empty:
+    st.markdown("### 🏢 Site Duplikat")
+    st.caption(f"Record dalam {duplicate_distance_m:g} m (koordinat SID) dengan token STN_NAME/STN_ADDR "
+               f"mirip ≥ {duplicate_similarity:g}, atau koordinat sama, dikelompokkan menjadi satu site")
+    duplicate_section()
+
+# Analisis kandidat interferensi (jika toggle aktif)
+if show_interference_analysis and not filtered_df.empty:
+    st.markdown("### 📡 Kandidat Interferensi Frekuensi")
+    st.caption(f"Pasangan stasiun dalam jarak {interference_distance_km:g} km (koordinat SID) "
+               f"dengan pita FREQ/FREQ_PAIR ± BWIDTH/2 yang tumpang tindih"
+               + (f" atau berjarak ≤ {interference_guard_mhz:g} MHz" if interference_guard_mhz > 0 else ""))
+    
+    interference_state = filter_state + (interference_distance_km, interference_guard_mhz)
+    with profiler.stage("interference", rows=len(filtered_df)):
+        interference_df = result_cache.get_or_create(
+            ('interference',) + interference_state,
+            lambda: find_interference_candidates(filtered_df, interference_distance_km * 1000,
+                                                 interference_guard_mhz)
+        )
+    
+    if interference_df.empty:
+        st.success("✅ Tidak ada kandidat interferensi dengan parameter ini")
     else:
-        st.warning("Tidak ada data koordinat yang valid untuk dibandingkan.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Pasangan", f"{len(interference_df)}")
+        with col2:
+            st.metric("🔴 Co-channel", f"{int((interference_df['JENIS'] == 'CO-CHANNEL').sum())}")
+        with col3:
+            st.metric("🟠 Adjacent", f"{int((interference_df['JENIS'] == 'ADJACENT').sum())}")
+        
+        with profiler.stage("interference_map", rows=len(interference_df)):
+            interference_html = result_cache.get_or_create(
+                ('interference_map',) + interference_state + (map_style, bulk_threshold, tile_url),
+                lambda: create_interference_map(filtered_df, interference_df, map_style,
+                                                bulk_threshold, tile_url).get_root().render()
+            )
+            st.iframe(interference_html, width=800, height=500)
+        
+        paginated_table(interference_df, "interference_table", interference_state, height=300)
+        
+        export_download(interference_df, "interference_export", interference_state,
+                        f"kandidat_interferensi_{selected_file.replace('.csv', '')}",
+                        "📥 Download Kandidat Interferensi")
 
-# Data table dengan filter
-st.markdown("### 📋 Data Tabel")
-if not filtered_df.empty:
+# Format koordinat untuk tampilan yang lebih baik (hanya baris di halaman yang tampil)
+def format_display_page(page_df):
+    coord_cols = ['SID_LAT', 'SID_LONG', 'LATITUDE_CENTER_KALKULASI', 'LONGITUDE_CENTER_KALKULASI']
+    for col in coord_cols:
+        if col in page_df.columns:
+            page_df[col] = page_df[col].round(6)
+    if 'DISTANCE_SID_CENTER_M' in page_df.columns:
+        page_df['DISTANCE_SID_CENTER_M'] = page_df['DISTANCE_SID_CENTER_M'].round(2)
+    return page_df
+
+@profiled_fragment
+def data_table_section(profiler):
+    """Tabel data terfilter per halaman; pindah halaman/sort/cari hanya menjalankan ulang fragment ini"""
     # Pilih kolom penting untuk ditampilkan (yang tersedia)
     base_columns = ['SID_LAT', 'SID_LONG']
     optional_columns = [
         'STN_NAME', 'CLNT_NAME', 'CITY', 'STATUS_MYSPECTRA', 
         'Status Verifikasi UPT 2024', 'FREQ', 'ERP_PWR_DBM',
-        'LATITUDE_CENTER_KALKULASI', 'LONGITUDE_CENTER_KALKULASI'
+        'LATITUDE_CENTER_KALKULASI', 'LONGITUDE_CENTER_KALKULASI',
+        'DISTANCE_SID_CENTER_M', 'PLUS_CODE_KALKULASI', 'PLUS_CODE_STATUS', 'SOURCE_FILE'
     ]
-    
     display_columns = base_columns + [col for col in optional_columns if col in filtered_df.columns]
-    display_df = filtered_df[display_columns].copy()
     
-    # Format koordinat untuk tampilan yang lebih baik
-    coord_cols = ['SID_LAT', 'SID_LONG', 'LATITUDE_CENTER_KALKULASI', 'LONGITUDE_CENTER_KALKULASI']
-    for col in coord_cols:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].round(6)
-    
-    st.dataframe(display_df, height=400, use_container_width=True)
-    
-    # Tombol download
-    csv = filtered_df.to_csv(index=False)
-    filename = f"filtered_data_{selected_file.replace('.csv', '')}_{selected_city}_{selected_clnt}.csv"
-    st.download_button(
-        label="📥 Download Data Terfilter (CSV)",
-        data=csv,
-        file_name=filename,
-        mime="text/csv"
-    )
+    with profiler.stage("data_table", rows=len(filtered_df)):
+        paginated_table(filtered_df[display_columns], "data_table", filter_state,
+                        format_page=format_display_page)
+    
+    # Tombol download (seluruh kolom data terfilter)
+    file_stem = (f"filtered_data_{selected_file.replace('.csv', '')}_"
+                 f"{selection_label(selected_city)}_{selection_label(selected_clnt)}")
+    export_download(filtered_df, "data_export", filter_state, file_stem,
+                    "📥 Download Data Terfilter")
+
+# Data table dengan filter
+st.markdown("### 📋 Data Tabel")
+if not filtered_df.empty:
+    data_table_section()
+
+# Panel instrumentasi per tahap untuk rerun halaman ini (tahap di dalam fragment tampil di panel fragment)
+if profiler.enabled:
+    show_profiler(profiler, "🐞 Instrumentasi Tahap", expanded=True)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,1746 @@
+"""
+Inti pengolahan data koordinat stasiun (tanpa Streamlit)
+
+Dipakai oleh aplikasi koordinat.py dan bisa dijalankan langsung sebagai CLI
+audit toleransi 20 m untuk banyak file CSV sekaligus:
+
+    python koordinat_core.py Data/ -o laporan_toleransi
+"""
+import pandas as pd
+import numpy as np
+import math
+import re
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import codecs
+import io
+import argparse
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Fungsi vektorisasi Haversine untuk seluruh kolom sekaligus (tanpa geopy)
+def calculate_distance_vectorized(lat1, lon1, lat2, lon2):
+    """
+    Menghitung jarak Haversine untuk array koordinat dalam satu kali panggilan
+    Hasil dalam meter, NaN untuk baris dengan koordinat kosong
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.asarray(pd.to_numeric(arr, errors='coerce'), dtype='float64')
+        for arr in (lat1, lon1, lat2, lon2)
+    )
+    
+    # Mask baris yang keempat koordinatnya valid
+    valid = ~(np.isnan(lat1) | np.isnan(lon1) | np.isnan(lat2) | np.isnan(lon2))
+    distances = np.full(valid.shape, np.nan)
+    
+    if valid.any():
+        lat1, lon1, lat2, lon2 = map(np.radians, [lat1[valid], lon1[valid], lat2[valid], lon2[valid]])
+        
+        # Rumus Haversine
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+        c = 2 * np.arcsin(np.sqrt(a))
+        
+        distances[valid] = c * 6371000
+    
+    return distances
+
+# Jarak SID ke Center untuk setiap baris DataFrame
+def sid_center_distances(data):
+    """Mengembalikan Series jarak SID-Center (meter) dengan index yang sama dengan data"""
+    distances = calculate_distance_vectorized(
+        data['SID_LAT'], data['SID_LONG'],
+        data['LATITUDE_CENTER_KALKULASI'], data['LONGITUDE_CENTER_KALKULASI']
+    )
+    return pd.Series(distances, index=data.index)
+
+# Batas toleransi perbedaan koordinat SID dan Center (meter)
+TOLERANCE_METERS = 20
+
+# Fungsi untuk menambahkan kolom turunan jarak dan status toleransi
+def add_tolerance_columns(data):
+    """
+    Menambahkan kolom DISTANCE_SID_CENTER_M dan TOLERANCE_STATUS langsung ke data (tanpa salinan)
+    Baris tanpa koordinat center bernilai NaN / None
+    """
+    distances = sid_center_distances(data)
+    status = np.where(distances > TOLERANCE_METERS, 'MELEBIHI TOLERANSI', 'DALAM TOLERANSI')
+    
+    data['DISTANCE_SID_CENTER_M'] = distances
+    data['TOLERANCE_STATUS'] = pd.Series(status, index=data.index).where(distances.notna())
+    return data
+
+# Open Location Code (plus code): 5 pasang digit lat/lon berbasis 20, digit terakhir bernilai 1/8000 derajat
+PLUS_CODE_ALPHABET = "23456789CFGHJMPQRVWX"
+PLUS_CODE_UNITS_PER_DEGREE = 8000
+# Nilai setiap pasang digit dalam satuan 1/8000 derajat (20°, 1°, 0.05°, 0.0025°, 0.000125°)
+PLUS_CODE_PLACES = np.array([160000, 8000, 400, 20, 1], dtype=np.int64)
+# Posisi karakter digit lat setiap pasang pada kode 10 digit 'XXXXXXXX+XX' (lon di posisi berikutnya)
+PLUS_CODE_LAT_POSITIONS = np.array([0, 2, 4, 6, 9])
+# Nilai digit per byte karakter (-1 untuk karakter di luar alfabet), huruf kecil juga diterima
+PLUS_CODE_DIGIT_VALUES = np.full(256, -1, dtype=np.int64)
+for value, char in enumerate(PLUS_CODE_ALPHABET):
+    PLUS_CODE_DIGIT_VALUES[ord(char)] = value
+    PLUS_CODE_DIGIT_VALUES[ord(char.lower())] = value
+
+# Kode panjang: setiap digit setelah 10 digit membagi sel menjadi 5 baris x 4 kolom; presisi
+# maksimum 15 digit (5 digit grid), digit setelahnya diabaikan
+PLUS_CODE_GRID_ROWS = 5
+PLUS_CODE_GRID_COLUMNS = 4
+PLUS_CODE_GRID_DIGITS = 5
+PLUS_CODE_MAX_LENGTH = 16
+# Satuan sel per jumlah digit pasangan (2, 4, 6, 8, 10): kode ber-padding '0' lebih kasar
+PLUS_CODE_PAIR_CELL_UNITS = {2: 160000, 4: 8000, 6: 400, 8: 20, 10: 1}
+# Kode pendek ('9G8F+6X', digit depan dihilangkan) butuh lokasi referensi, tidak didukung validasi
+PLUS_CODE_SHORT_PATTERN = r'(?i)(?:[23456789CFGHJMPQRVWX]{2}){1,3}\+[23456789CFGHJMPQRVWX]{2,}'
+
+# Batas jarak pusat sel plus code ke koordinat Center (meter), longgar untuk pembulatan 6 desimal
+PLUS_CODE_CENTER_TOLERANCE_M = 1.0
+# Kelonggaran batas sel saat mengecek SID berada di dalam sel plus code (derajat, ~0.1 m)
+PLUS_CODE_CELL_MARGIN_DEG = 1e-6
+
+# Status hasil validasi plus code per baris, urut dari yang paling berat
+PLUS_CODE_STATUSES = [
+    'KODE TIDAK VALID', 'FORMAT KODE TIDAK DIDUKUNG', 'SID DI LUAR SEL KODE', 'CENTER TIDAK SESUAI KODE',
+    'MYSPECTRA TIDAK SESUAI', 'DIHITUNG DARI SID', 'SESUAI'
+]
+
+def encode_plus_codes(lats, lons):
+    """
+    Plus code 10 digit (presisi 1/8000 derajat, sel ~14 m) untuk array koordinat sekaligus
+    Return array object, None untuk koordinat kosong
+    """
+    lats = np.asarray(pd.to_numeric(lats, errors='coerce'), dtype='float64')
+    lons = np.asarray(pd.to_numeric(lons, errors='coerce'), dtype='float64')
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    
+    # Seperti implementasi referensi: satuan presisi 15 digit dari pojok (-90, -180), round(…, 6)
+    # untuk meredam galat float, dipotong, lalu dibagi ke satuan 1/8000 derajat (10 digit)
+    lat_grid = PLUS_CODE_GRID_ROWS ** PLUS_CODE_GRID_DIGITS
+    lon_grid = PLUS_CODE_GRID_COLUMNS ** PLUS_CODE_GRID_DIGITS
+    lat_scale = PLUS_CODE_UNITS_PER_DEGREE * lat_grid
+    lon_scale = PLUS_CODE_UNITS_PER_DEGREE * lon_grid
+    lat_units = np.floor(np.round((np.clip(lats, -90, 90) + 90) * lat_scale, 6)) // lat_grid
+    lon_units = np.floor(np.round(np.mod(lons + 180, 360) * lon_scale, 6)) // lon_grid
+    lat_units = np.minimum(np.where(valid, lat_units, 0), 180 * PLUS_CODE_UNITS_PER_DEGREE - 1).astype(np.int64)
+    lon_units = np.mod(np.where(valid, lon_units, 0), 360 * PLUS_CODE_UNITS_PER_DEGREE).astype(np.int64)
+    
+    alphabet = np.array(list(PLUS_CODE_ALPHABET))
+    chars = np.empty((len(lats), 11), dtype='<U1')
+    chars[:, 8] = '+'
+    for position, place in zip(PLUS_CODE_LAT_POSITIONS, PLUS_CODE_PLACES):
+        chars[:, position] = alphabet[(lat_units // place) % 20]
+        chars[:, position + 1] = alphabet[(lon_units // place) % 20]
+    
+    # Array karakter (n, 11) dibaca sebagai n string 11 karakter tanpa loop per baris
+    codes = chars.view('<U11').ravel().astype(object)
+    codes[~valid] = None
+    return codes
+
+def decode_plus_codes(codes):
+    """
+    Pusat sel (lat, lon) dan ukuran sel lat/lon (derajat) untuk kode lengkap: 'XXXXXXXX+',
+    'XXXXXXXX+XX', kode lebih panjang (presisi sampai 15 digit) dan kode ber-padding seperti 'XXXX0000+'
+    Kode yang tidak valid / kosong / kode pendek menghasilkan NaN
+    Return (lat, lon, sel_lat, sel_lon)
+    """
+    # String dibaca sebagai array code point (n, lebar); 0 berarti di luar panjang string
+    text = np.char.strip(pd.Series(codes).astype(object).fillna('').to_numpy(dtype=str))
+    width = max(text.dtype.itemsize // 4, PLUS_CODE_MAX_LENGTH)
+    chars = text.astype(f'U{width}').view(np.uint32).reshape(len(text), width)
+    values = PLUS_CODE_DIGIT_VALUES[np.minimum(chars, 255)]
+    
+    # Digit sebelum '+': 8 digit, atau 2/4/6 digit diikuti padding '0' (tanpa digit setelah '+')
+    leading = values[:, :8] >= 0
+    n_pairs = np.where(leading.all(axis=1), 8, np.argmin(leading, axis=1))
+    padding = (chars[:, :8] == ord('0')) | (np.arange(8) < n_pairs[:, None])
+    padded = np.isin(n_pairs, [2, 4, 6]) & padding.all(axis=1) & (chars[:, 9] == 0)
+    
+    # Setelah '+': 0 digit, atau minimal 2 digit valid sampai akhir string
+    n_after = (chars[:, 9:] != 0).sum(axis=1)
+    after_valid = ((values[:, 9:] >= 0) | (chars[:, 9:] == 0)).all(axis=1) & (n_after != 1)
+    full = (n_pairs == 8) & after_valid
+    
+    # Digit pertama lat < 9 (180°) dan lon < 18 (360°)
+    valid = ((chars[:, 8] == ord('+')) & (padded | full)
+             & (values[:, 0] >= 0) & (values[:, 0] < 9) & (values[:, 1] < 18))
+    
+    digits = np.maximum(values, 0)
+    lat_units = digits[:, PLUS_CODE_LAT_POSITIONS] @ PLUS_CODE_PLACES
+    lon_units = digits[:, PLUS_CODE_LAT_POSITIONS + 1] @ PLUS_CODE_PLACES
+    n_pairs = np.where(full & (n_after >= 2), 10, n_pairs)
+    cell_units = np.zeros(len(text), dtype=np.int64)
+    for pairs, units in PLUS_CODE_PAIR_CELL_UNITS.items():
+        cell_units[n_pairs == pairs] = units
+    
+    # Digit grid (posisi 11 ke atas): baris = digit // 4 (lat), kolom = digit % 4 (lon)
+    lat_divisor = np.ones(len(text), dtype=np.int64)
+    lon_divisor = np.ones(len(text), dtype=np.int64)
+    for position in range(11, 11 + PLUS_CODE_GRID_DIGITS):
+        present = full & (values[:, position] >= 0)
+        row, column = np.divmod(digits[:, position], PLUS_CODE_GRID_COLUMNS)
+        lat_units = np.where(present, lat_units * PLUS_CODE_GRID_ROWS + row, lat_units)
+        lon_units = np.where(present, lon_units * PLUS_CODE_GRID_COLUMNS + column, lon_units)
+        lat_divisor = np.where(present, lat_divisor * PLUS_CODE_GRID_ROWS, lat_divisor)
+        lon_divisor = np.where(present, lon_divisor * PLUS_CODE_GRID_COLUMNS, lon_divisor)
+    
+    lat_cell = cell_units / (PLUS_CODE_UNITS_PER_DEGREE * lat_divisor)
+    lon_cell = cell_units / (PLUS_CODE_UNITS_PER_DEGREE * lon_divisor)
+    center_lats = np.minimum(lat_units / (PLUS_CODE_UNITS_PER_DEGREE * lat_divisor) - 90 + lat_cell / 2, 90)
+    center_lons = lon_units / (PLUS_CODE_UNITS_PER_DEGREE * lon_divisor) - 180 + lon_cell / 2
+    return (np.where(valid, center_lats, np.nan), np.where(valid, center_lons, np.nan),
+            np.where(valid, lat_cell, np.nan), np.where(valid, lon_cell, np.nan))
+
+# Fungsi untuk validasi plus code terhadap koordinat Center dan SID
+def add_plus_code_columns(data):
+    """
+    PLUS_CODE_SID: plus code dari koordinat SID (dihitung lokal, tanpa jaringan)
+    PLUS_CODE_KALKULASI yang kosong diisi dari PLUS_CODE_SID
+    PLUS_CODE_STATUS: hasil cek kesesuaian kode, Center, SID dan PLUS_CODE_MYSPECTRA (PLUS_CODE_STATUSES)
+    Kolom ditambahkan langsung ke data (tanpa salinan)
+    """
+    sid_lats = data['SID_LAT'].to_numpy(dtype='float64')
+    sid_lons = data['SID_LONG'].to_numpy(dtype='float64')
+    sid_codes = encode_plus_codes(sid_lats, sid_lons)
+    
+    data['PLUS_CODE_SID'] = sid_codes
+    codes = data.get('PLUS_CODE_KALKULASI', pd.Series(np.nan, index=data.index, dtype=object))
+    missing = (codes.isna() | (codes.astype(str).str.strip() == '')).to_numpy()
+    data['PLUS_CODE_KALKULASI'] = codes.where(~missing, pd.Series(sid_codes, index=data.index))
+    
+    center_lats, center_lons, lat_cell, lon_cell = decode_plus_codes(data['PLUS_CODE_KALKULASI'])
+    invalid = np.isnan(center_lats)
+    # Kode pendek sah tetapi tidak bisa divalidasi tanpa lokasi referensi
+    unsupported = invalid & data['PLUS_CODE_KALKULASI'].astype(str).str.strip().str.fullmatch(
+        PLUS_CODE_SHORT_PATTERN).fillna(False).to_numpy(dtype=bool)
+    
+    # SID harus berada di dalam sel kode (setengah ukuran sel dari pusatnya)
+    sid_outside = ~invalid & ((np.abs(sid_lats - center_lats) > lat_cell / 2 + PLUS_CODE_CELL_MARGIN_DEG) |
+                              (np.abs(sid_lons - center_lons) > lon_cell / 2 + PLUS_CODE_CELL_MARGIN_DEG))
+    
+    # Koordinat Center seharusnya pusat sel kode; baris tanpa Center tidak dianggap salah
+    center_mismatch = np.zeros(len(data), dtype=bool)
+    if 'LATITUDE_CENTER_KALKULASI' in data.columns and 'LONGITUDE_CENTER_KALKULASI' in data.columns:
+        center_distances = calculate_distance_vectorized(
+            center_lats, center_lons,
+            data['LATITUDE_CENTER_KALKULASI'], data['LONGITUDE_CENTER_KALKULASI']
+        )
+        center_mismatch = center_distances > PLUS_CODE_CENTER_TOLERANCE_M
+    
+    # PLUS_CODE_MYSPECTRA (jika terisi) harus menunjuk sel yang sama
+    myspectra_mismatch = np.zeros(len(data), dtype=bool)
+    if 'PLUS_CODE_MYSPECTRA' in data.columns:
+        myspectra = data['PLUS_CODE_MYSPECTRA']
+        filled = (myspectra.notna() & (myspectra.astype(str).str.strip() != '')).to_numpy()
+        myspectra_lats, myspectra_lons, _, _ = decode_plus_codes(myspectra)
+        myspectra_distances = calculate_distance_vectorized(center_lats, center_lons,
+                                                            myspectra_lats, myspectra_lons)
+        myspectra_mismatch = ~invalid & filled & ~(myspectra_distances <= PLUS_CODE_CENTER_TOLERANCE_M)
+    
+    data['PLUS_CODE_STATUS'] = np.select(
+        [invalid & ~unsupported, unsupported, sid_outside, center_mismatch, myspectra_mismatch, missing],
+        PLUS_CODE_STATUSES[:-1], default=PLUS_CODE_STATUSES[-1]
+    )
+    return data
+
+# Kolom yang ditampilkan di popup marker beserta labelnya
+POPUP_FIELDS = {
+    'CLNT_NAME': 'Client',
+    'CITY': 'Kota',
+    'STATUS_MYSPECTRA': 'Status MySpectra',
+    'Status Verifikasi UPT 2024': 'Status Verifikasi UPT',
+    'FREQ': 'Frequency (MHz)',
+    'ERP_PWR_DBM': 'Power (dBm)',
+    'STN_ADDR': 'Alamat'
+}
+
+def escape_html_column(series):
+    """HTML-escape seluruh kolom sekaligus, NaN tetap NaN (kategori cukup di-escape sekali per nilai)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.astype(str)
+        escaped = escape_html_column(pd.Series(categories)).to_numpy(dtype=object)
+        codes = series.cat.codes.to_numpy()
+        values = np.where(codes >= 0, escaped[codes], np.nan)
+        return pd.Series(values, index=series.index, dtype=object)
+    
+    text = series.astype(object).where(series.notna())
+    text = text.where(text.isna(), text.astype(str))
+    return (text.str.replace('&', '&amp;', regex=False)
+                .str.replace('<', '&lt;', regex=False)
+                .str.replace('>', '&gt;', regex=False)
+                .str.replace('"', '&quot;', regex=False)
+                .str.replace("'", '&#x27;', regex=False))
+
+def format_number_column(series):
+    """Format angka tanpa '.0' untuk bilangan bulat (14473.0 -> '14473'), NaN tetap NaN"""
+    values = series.to_numpy(dtype='float64')
+    valid = ~np.isnan(values)
+    is_integer = valid & (values == np.round(values))
+    
+    text = np.full(len(values), np.nan, dtype=object)
+    text[is_integer] = values[is_integer].astype(np.int64).astype(str)
+    text[valid & ~is_integer] = values[valid & ~is_integer].astype(str)
+    return pd.Series(text, index=series.index, dtype=object)
+
+def popup_field_values(data):
+    """(kolom, label, Series teks ter-escape / angka terformat) untuk setiap kolom POPUP_FIELDS yang ada"""
+    for col, label in POPUP_FIELDS.items():
+        if col in data.columns:
+            if col in ['FREQ', 'ERP_PWR_DBM']:
+                yield col, label, format_number_column(data[col])
+            else:
+                yield col, label, escape_html_column(data[col])
+
+def station_popups(data):
+    """
+    HTML popup dan teks tooltip (array object) untuk baris yang akan dirender, satu pass per kolom
+    Tidak disimpan di DataFrame dataset; semua nilai teks di-escape karena kolom seperti STN_ADDR berisi teks bebas
+    """
+    index_labels = pd.Series(data.index.astype(str), index=data.index, dtype=object)
+    fallback_name = "Data Point #" + index_labels
+    
+    # Header dengan nama stasiun (jika ada)
+    if 'STN_NAME' in data.columns:
+        station_names = escape_html_column(data['STN_NAME'])
+    else:
+        station_names = pd.Series(np.nan, index=data.index, dtype=object)
+    popup = "<div style='width: 300px;'><h4><b>" + station_names.fillna(fallback_name) + "</b></h4><hr>"
+    
+    # Informasi dinamis berdasarkan kolom yang tersedia
+    for _, label, values in popup_field_values(data):
+        popup = popup + (f"<b>{label}:</b> " + values + "<br>").fillna('')
+    
+    # Koordinat
+    popup = (popup + "<hr><b>Koordinat SID:</b><br>Lat: " + data['SID_LAT'].astype(str)
+             + ", Long: " + data['SID_LONG'].astype(str) + "<br>")
+    
+    if 'LATITUDE_CENTER_KALKULASI' in data.columns:
+        center_lat = data['LATITUDE_CENTER_KALKULASI']
+        center_part = ("<b>Koordinat Center:</b><br>Lat: " + center_lat.astype(str)
+                       + ", Long: " + data['LONGITUDE_CENTER_KALKULASI'].astype(str))
+        popup = popup + center_part.where(center_lat.notna(), '')
+    
+    popup = popup + "</div>"
+    
+    # Tooltip: nama stasiun - client, atau nomor data point
+    if 'CLNT_NAME' in data.columns:
+        with_client = station_names + " - " + escape_html_column(data['CLNT_NAME'])
+        tooltip = with_client.fillna(station_names)
+    else:
+        tooltip = station_names
+    
+    return popup.to_numpy(dtype=object), tooltip.fillna(fallback_name).to_numpy(dtype=object)
+
+
+
+# Cache biner (Parquet) hasil parsing CSV, disimpan di folder .cache di samping file CSV
+CACHE_FOLDER_NAME = ".cache"
+# Naikkan versi ini jika proses cleaning / kolom turunan berubah
+CACHE_VERSION = 6
+
+def file_fingerprint(file_path):
+    """Ukuran dan waktu modifikasi file sumber"""
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def file_hash(file_path, block_size=1024 * 1024):
+    """Hash SHA-256 isi file sumber"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_paths(file_path, streaming=False):
+    """Path file Parquet dan metadata cache untuk sebuah file CSV"""
+    cache_folder = os.path.join(os.path.dirname(file_path), CACHE_FOLDER_NAME)
+    base_name = os.path.join(cache_folder, os.path.basename(file_path))
+    # Mode streaming menyimpan kolom yang lebih sedikit, jadi cache-nya dipisah
+    if streaming:
+        base_name += ".streaming"
+    return base_name + ".parquet", base_name + ".meta.json"
+
+# Dtype teks hasil read_csv (str di pandas 3, object di pandas lama)
+TEXT_DTYPE = pd.Series([], dtype=str).dtype
+
+def is_text_column(values):
+    """Dtype string, atau object yang semua nilai non-null-nya str (NaN tidak dihitung)"""
+    if pd.api.types.is_object_dtype(values.dtype):
+        return pd.api.types.infer_dtype(values, skipna=True) == 'string'
+    return pd.api.types.is_string_dtype(values.dtype)
+
+def normalize_text_dtypes(df):
+    """
+    Menyamakan dtype kolom teks dan kategori teks dengan hasil parsing CSV: Parquet dari versi
+    pandas/pyarrow lain bisa kembali sebagai object atau string[pyarrow], dan concat chunk
+    streaming menjadi object jika kolom teks kosong (float) di sebagian chunk
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = dtype.categories
+            if categories.dtype != TEXT_DTYPE and is_text_column(categories):
+                df[col] = df[col].cat.rename_categories(categories.astype(TEXT_DTYPE))
+        elif dtype != TEXT_DTYPE and is_text_column(df[col]):
+            df[col] = df[col].astype(TEXT_DTYPE)
+    return df
+
+def read_cached_data(file_path, streaming=False):
+    """
+    Membaca DataFrame dari cache Parquet jika masih valid
+    Return (df, original_rows) atau None jika cache tidak ada / kadaluarsa
+    """
+    parquet_path, meta_path = cache_paths(file_path, streaming)
+    if not (os.path.exists(parquet_path) and os.path.exists(meta_path)):
+        return None
+    
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        if meta.get('version') != CACHE_VERSION:
+            return None
+        
+        fingerprint = file_fingerprint(file_path)
+        if fingerprint['size'] != meta.get('size'):
+            return None
+        
+        # mtime berubah (misal setelah redeploy) - cek ulang dengan hash isi file
+        if fingerprint['mtime_ns'] != meta.get('mtime_ns'):
+            if file_hash(file_path) != meta.get('sha256'):
+                return None
+            meta.update(fingerprint)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        
+        return normalize_text_dtypes(pd.read_parquet(parquet_path)), meta['original_rows']
+    except Exception:
+        # Cache rusak / tidak terbaca - parsing ulang dari CSV
+        return None
+
+def write_cached_data(file_path, df, original_rows, streaming=False):
+    """Menyimpan DataFrame hasil cleaning ke cache Parquet (best effort)"""
+    parquet_path, meta_path = cache_paths(file_path, streaming)
+    try:
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        df.to_parquet(parquet_path)
+        meta = {
+            'version': CACHE_VERSION,
+            'original_rows': original_rows,
+            'sha256': file_hash(file_path),
+            **file_fingerprint(file_path)
+        }
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except Exception:
+        # Gagal menulis cache tidak boleh menggagalkan load data
+        for path in (parquet_path, meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+# Skema kolom yang diketahui pada ekspor data SIMF
+FLOAT_COLUMNS = [
+    'FREQ', 'FREQ_PAIR', 'ERP_PWR_DBM', 'BWIDTH', 'HGT_ANT',
+    'SID_LONG', 'SID_LAT', 'LONGITUDE_CENTER_KALKULASI', 'LATITUDE_CENTER_KALKULASI'
+]
+# ID dibaca sebagai teks agar nol di depan (misal 00105553) tidak hilang
+STRING_COLUMNS = ['CLNT_ID', 'REQUEST_REFERENCE', 'APPL_ID', 'SITE_ID_CODE']
+DATE_COLUMNS = ['APPL_DATE', 'LICENCE_DATE', 'VALIDITY_DATE']
+DATE_FORMAT = '%m/%d/%Y'
+
+def detect_encoding(file_path, sample_size=64 * 1024):
+    """Menebak encoding file dari sampel byte di awal file"""
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    
+    # BOM menentukan encoding secara pasti (dan harus dibuang dari nama kolom pertama)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    
+    try:
+        # Decoder incremental agar karakter multibyte yang terpotong di akhir sampel tidak dianggap error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def schema_dtypes(numeric=True):
+    """Dtype read_csv untuk kolom yang diketahui (tanpa float jika numeric=False)"""
+    dtype = {col: str for col in STRING_COLUMNS + DATE_COLUMNS}
+    if numeric:
+        dtype.update({col: 'float64' for col in FLOAT_COLUMNS})
+    return dtype
+
+def read_csv_with_schema(file_path, encoding, **kwargs):
+    """Membaca CSV dengan dtype eksplisit untuk kolom yang diketahui"""
+    try:
+        return pd.read_csv(file_path, encoding=encoding, dtype=schema_dtypes(), **kwargs)
+    except UnicodeDecodeError:
+        raise
+    except ValueError:
+        # Ada nilai non-numerik di kolom float - baca sebagai teks, di-coerce di apply_schema
+        return pd.read_csv(file_path, encoding=encoding, dtype=schema_dtypes(numeric=False), **kwargs)
+
+def apply_schema(df):
+    """Koersi kolom numerik dan parsing kolom tanggal dengan format eksplisit"""
+    for col in FLOAT_COLUMNS:
+        if col in df.columns and not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=DATE_FORMAT, errors='coerce')
+    
+    return df
+
+# Kolom dengan kardinalitas rendah disimpan sebagai categorical (kode integer + daftar nilai)
+CATEGORICAL_COLUMNS = [
+    'CLNT_NAME', 'STATUS_SIMF', 'SERVICE', 'SUBSERVICE', 'CITY', 'DISTRICT', 'PROVINSI',
+    'UPT', 'STATUS_MYSPECTRA', 'Status Verifikasi UPT 2024', 'TOLERANCE_STATUS', 'PLUS_CODE_STATUS',
+    'SOURCE_FILE'
+]
+
+def apply_categories(df):
+    """Konversi kolom kardinalitas rendah menjadi dtype categorical"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+def concat_categorical_chunks(chunks):
+    """Menyamakan kategori antar chunk sebelum concat agar dtype categorical tidak berubah jadi object"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in chunks[0].columns:
+            categories = chunks[0][col].cat.categories
+            for chunk in chunks[1:]:
+                categories = categories.union(chunk[col].cat.categories)
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks)
+
+def align_frames(frames):
+    """Menyamakan kolom DataFrame dari beberapa file, kolom yang tidak ada diisi NaN"""
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    aligned = []
+    for frame in frames:
+        missing = [col for col in columns if col not in frame.columns]
+        if missing:
+            frame = frame.copy()
+            for col in missing:
+                if col in CATEGORICAL_COLUMNS:
+                    frame[col] = pd.Categorical([None] * len(frame), categories=[])
+                else:
+                    frame[col] = np.nan
+        aligned.append(frame[columns])
+    return aligned
+
+def category_options(series):
+    """Daftar nilai unik terurut untuk opsi filter, langsung dari kategori"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.tolist()
+    return sorted(series.dropna().unique().tolist())
+
+# Kolom yang bisa difilter dari sidebar
+FILTER_COLUMNS = [
+    'CLNT_NAME', 'STATUS_MYSPECTRA', 'CITY', 'Status Verifikasi UPT 2024', 'TOLERANCE_STATUS',
+    'PLUS_CODE_STATUS', 'SOURCE_FILE'
+]
+
+class FilterIndex:
+    """
+    Inverted index untuk filter sidebar, dibangun sekali per file
+    Setiap nilai pada kolom filter punya daftar posisi baris (posting list),
+    kombinasi filter dijawab dengan union per kolom lalu irisan bitmap antar kolom
+    """
+    
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.postings = {}
+        
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype('category')
+            
+            # Kelompokkan posisi baris berdasarkan kode kategori (kode -1 = NaN ada di slot 0)
+            codes = series.cat.codes.to_numpy()
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes + 1, minlength=len(series.cat.categories) + 1)
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self.postings[col] = (series.cat.categories, order, offsets)
+    
+    def column_bitmap(self, col, values):
+        """Bitmap baris yang nilainya termasuk salah satu values"""
+        categories, order, offsets = self.postings[col]
+        bitmap = np.zeros(self.n_rows, dtype=bool)
+        for value in values:
+            if value in categories:
+                slot = categories.get_loc(value) + 1
+                bitmap[order[offsets[slot]:offsets[slot + 1]]] = True
+        return bitmap
+    
+    def query(self, selections):
+        """
+        selections: {kolom: [nilai, ...]}, kolom dengan daftar kosong tidak difilter
+        Return array posisi baris yang lolos, atau None jika tidak ada filter aktif
+        """
+        mask = None
+        for col, values in selections.items():
+            if not values or col not in self.postings:
+                continue
+            col_bitmap = self.column_bitmap(col, values)
+            mask = col_bitmap if mask is None else mask & col_bitmap
+        
+        if mask is None:
+            return None
+        return np.flatnonzero(mask)
+
+# Kolom tanggal akhir masa berlaku izin dan batas "segera berakhir" default
+VALIDITY_COLUMN = 'VALIDITY_DATE'
+EXPIRY_SOON_MONTHS = 12
+
+class ExpiryIndex:
+    """
+    Posisi baris diurutkan berdasarkan tanggal akhir masa berlaku izin, dibangun sekali per dataset
+    Rentang tanggal dan jumlah per bulan dijawab dengan searchsorted (binary search), tanpa memindai kolom
+    """
+    
+    def __init__(self, dates):
+        values = pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(values)
+        order = np.argsort(values[valid], kind='stable')
+        self.dates = values[valid][order]
+        self.positions = np.flatnonzero(valid)[order]
+        self.n_rows = len(values)
+    
+    @property
+    def nbytes(self):
+        return self.dates.nbytes + self.positions.nbytes
+    
+    @property
+    def n_missing(self):
+        """Jumlah baris tanpa tanggal berlaku"""
+        return self.n_rows - len(self.dates)
+    
+    def slot_range(self, start=None, end=None):
+        """Rentang [lo, hi) pada array terurut untuk start <= tanggal <= end (None = tanpa batas)"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 'ns'), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 'ns'),
+                                                                     side='right'))
+        return lo, max(lo, hi)
+    
+    def count(self, start=None, end=None):
+        lo, hi = self.slot_range(start, end)
+        return hi - lo
+    
+    def query(self, start=None, end=None):
+        """Posisi baris (terurut) dengan tanggal berlaku di dalam rentang"""
+        lo, hi = self.slot_range(start, end)
+        return np.sort(self.positions[lo:hi])
+    
+    def monthly_counts(self, start=None, end=None):
+        """DataFrame BULAN / JUMLAH: jumlah izin yang berakhir per bulan di dalam rentang"""
+        lo, hi = self.slot_range(start, end)
+        if lo == hi:
+            return pd.DataFrame({'BULAN': pd.DatetimeIndex([]), 'JUMLAH': np.array([], dtype=np.int64)})
+        
+        # Batas awal setiap bulan dicari di array terurut, jumlah = selisih posisi batas berurutan
+        first = pd.Timestamp(self.dates[lo]).to_period('M').to_timestamp()
+        months = pd.date_range(first, pd.Timestamp(self.dates[hi - 1]), freq='MS')
+        boundaries = np.append(months.to_numpy(dtype='datetime64[ns]'),
+                               np.datetime64(months[-1] + pd.offsets.MonthBegin(), 'ns'))
+        slots = np.clip(np.searchsorted(self.dates, boundaries, side='left'), lo, hi)
+        return pd.DataFrame({'BULAN': months, 'JUMLAH': np.diff(slots)})
+
+# Fungsi untuk menghitung rentang tanggal filter masa berlaku izin
+def expiry_window(mode, reference, months=EXPIRY_SOON_MONTHS, start=None, end=None):
+    """
+    (start, end) inklusif untuk ExpiryIndex relatif terhadap tanggal reference:
+    'expired' = sebelum reference, 'expiring' = reference s.d. reference + months bulan,
+    'range' = start s.d. end; mode lain (None) berarti tanpa filter
+    """
+    reference = pd.Timestamp(reference).normalize()
+    if mode == 'expired':
+        return None, reference - pd.Timedelta(days=1)
+    if mode == 'expiring':
+        return reference, reference + pd.DateOffset(months=months)
+    if mode == 'range':
+        return (None if start is None else pd.Timestamp(start),
+                None if end is None else pd.Timestamp(end))
+    return None
+
+# Fungsi untuk mencari teks di kolom-kolom tabel
+def search_mask(data, text, columns=None):
+    """
+    Bitmap baris yang salah satu kolom teksnya mengandung text (tanpa beda huruf besar/kecil)
+    Kolom categorical dicocokkan per kategori lalu dipetakan lewat kode, bukan per baris
+    """
+    if columns is None:
+        # Kolom teks pandas 3 ber-dtype str, bukan object
+        columns = [col for col in data.columns
+                   if isinstance(data[col].dtype, pd.CategoricalDtype)
+                   or pd.api.types.is_string_dtype(data[col].dtype)
+                   or pd.api.types.is_object_dtype(data[col].dtype)]
+    
+    mask = np.zeros(len(data), dtype=bool)
+    for col in columns:
+        series = data[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            matches = series.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+            # Slot tambahan False untuk kode -1 (NaN)
+            matches = np.append(np.asarray(matches, dtype=bool), False)
+            mask |= matches[series.cat.codes.to_numpy()]
+        else:
+            matches = series.astype(str).str.contains(text, case=False, regex=False)
+            mask |= matches.to_numpy(dtype=bool) & series.notna().to_numpy()
+    return mask
+
+# Fungsi untuk menentukan urutan baris tabel setelah pencarian dan sort
+def table_row_order(data, search=None, sort_by=None, ascending=True, search_columns=None):
+    """
+    Posisi baris (untuk iloc) yang lolos pencarian, terurut berdasarkan sort_by (NaN di akhir)
+    Cukup dihitung sekali per kombinasi pencarian/sort, halaman tabel tinggal slicing array ini
+    """
+    positions = np.arange(len(data))
+    if search:
+        positions = np.flatnonzero(search_mask(data, search, search_columns))
+    
+    if sort_by is not None and sort_by in data.columns:
+        values = data[sort_by].iloc[positions].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, na_position='last', kind='stable').index.to_numpy()
+        positions = positions[order]
+    return positions
+
+# Radius bumi (meter), sama dengan rumus Haversine di atas
+EARTH_RADIUS_M = 6371000
+
+# Ukuran sel grid index spasial (derajat, ~5,5 km di ekuator)
+SPATIAL_CELL_DEG = 0.05
+
+class SpatialGridIndex:
+    """
+    Index grid untuk koordinat titik: posisi baris diurutkan berdasarkan key sel
+    (baris_grid * jumlah_kolom + kolom_grid), sehingga sel-sel dalam satu baris grid
+    yang bersebelahan membentuk satu rentang kontigu yang dicari dengan searchsorted
+    """
+    
+    def __init__(self, lats, lons, cell_deg=SPATIAL_CELL_DEG):
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        positions = np.flatnonzero(valid)
+        lats = lats[valid]
+        lons = lons[valid]
+        
+        self.cell_deg = cell_deg
+        self.lat_min = lats.min() if len(lats) else 0.0
+        self.lon_min = lons.min() if len(lons) else 0.0
+        rows = ((lats - self.lat_min) // cell_deg).astype(np.int64)
+        cols = ((lons - self.lon_min) // cell_deg).astype(np.int64)
+        self.n_rows = int(rows.max()) + 1 if len(rows) else 0
+        self.n_cols = int(cols.max()) + 1 if len(cols) else 0
+        
+        keys = rows * self.n_cols + cols
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.positions = positions[order]
+        self.lats = lats[order]
+        self.lons = lons[order]
+    
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.positions.nbytes + self.lats.nbytes + self.lons.nbytes
+    
+    def cell_range(self, low, high, origin, n_cells):
+        """Rentang indeks sel (inklusif) yang menutupi [low, high], dipotong ke batas grid"""
+        first = max(int((low - origin) // self.cell_deg), 0)
+        last = min(int((high - origin) // self.cell_deg), n_cells - 1)
+        return first, last
+    
+    def bbox_slots(self, south, west, north, east):
+        """Indeks ke array terurut index (bukan posisi baris) untuk titik di dalam bbox"""
+        if self.n_rows == 0:
+            return np.array([], dtype=np.int64)
+        row_first, row_last = self.cell_range(south, north, self.lat_min, self.n_rows)
+        col_first, col_last = self.cell_range(west, east, self.lon_min, self.n_cols)
+        if row_first > row_last or col_first > col_last:
+            return np.array([], dtype=np.int64)
+        
+        # Satu rentang kandidat per baris grid
+        grid_rows = np.arange(row_first, row_last + 1)
+        starts = np.searchsorted(self.keys, grid_rows * self.n_cols + col_first, side='left')
+        ends = np.searchsorted(self.keys, grid_rows * self.n_cols + col_last, side='right')
+        candidates = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        
+        # Sel di tepi bbox hanya sebagian masuk, cek koordinat pastinya
+        inside = ((self.lats[candidates] >= south) & (self.lats[candidates] <= north) &
+                  (self.lons[candidates] >= west) & (self.lons[candidates] <= east))
+        return candidates[inside]
+    
+    def query_bbox(self, south, west, north, east):
+        """Posisi baris (terurut) dengan south <= lat <= north dan west <= lon <= east"""
+        return np.sort(self.positions[self.bbox_slots(south, west, north, east)])
+    
+    def query_radius(self, lat, lon, radius_m):
+        """
+        Posisi baris dalam radius_m meter (Haversine) dari (lat, lon)
+        Return (posisi, jarak_meter), terurut dari yang terdekat
+        """
+        # Bbox yang pasti menutupi lingkaran radius di permukaan bola
+        angle = radius_m / EARTH_RADIUS_M
+        lat_deg = math.degrees(angle)
+        if angle >= math.pi / 2 - math.radians(abs(lat)):
+            # Lingkaran mencapai kutub: semua bujur di grid
+            lon_ranges = [(self.lon_min, self.lon_min + self.n_cols * self.cell_deg)]
+        else:
+            lon_deg = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+            lon_ranges = [(lon - lon_deg, lon + lon_deg)]
+            # Bagian yang melewati bujur 180 dicari di sisi seberang
+            if lon - lon_deg < -180:
+                lon_ranges.append((lon - lon_deg + 360, 180.0))
+            if lon + lon_deg > 180:
+                lon_ranges.append((-180.0, lon + lon_deg - 360))
+        slots = np.unique(np.concatenate([
+            self.bbox_slots(lat - lat_deg, west, lat + lat_deg, east) for west, east in lon_ranges
+        ]))
+        
+        distances = calculate_distance_vectorized(
+            np.full(len(slots), lat), np.full(len(slots), lon), self.lats[slots], self.lons[slots]
+        )
+        within = distances <= radius_m
+        slots = slots[within]
+        distances = distances[within]
+        order = np.argsort(distances, kind='stable')
+        return self.positions[slots[order]], distances[order]
+    
+    def query_nearest(self, lat, lon, k=5):
+        """
+        k titik terdekat dari (lat, lon), return (posisi, jarak_meter) terurut
+        Radius pencarian dimulai dari satu sel grid lalu digandakan sampai berisi k titik
+        """
+        k = min(int(k), len(self.positions))
+        if k <= 0:
+            return np.array([], dtype=np.int64), np.array([])
+        
+        radius_m = math.radians(self.cell_deg) * EARTH_RADIUS_M
+        while True:
+            positions, distances = self.query_radius(lat, lon, radius_m)
+            if len(positions) >= k or radius_m >= math.pi * EARTH_RADIUS_M:
+                return positions[:k], distances[:k]
+            radius_m *= 2
+
+# Rentang zoom peta yang punya grid kepadatan pra-hitung
+DENSITY_MIN_ZOOM = 3
+DENSITY_MAX_ZOOM = 18
+
+def density_cell_deg(zoom):
+    """Ukuran sel grid kepadatan (derajat) pada zoom: kira-kira seperempat tile"""
+    return 360 / 2 ** zoom / 4
+
+class DensityGrid:
+    """
+    Jumlah titik per sel grid untuk setiap level zoom, dihitung sekali per dataset.
+    Titik hanya dipindai sekali pada level paling halus; level yang lebih kasar
+    (sel 2x lebih besar) dibentuk dari level di bawahnya dengan menggeser indeks sel,
+    sehingga ganti zoom cukup membaca level yang sudah ada.
+    Jika kategori diberikan (mis. CLNT_NAME atau SERVICE), jumlah disimpan per (sel, kategori).
+    """
+    
+    def __init__(self, lats, lons, categories=None,
+                 min_zoom=DENSITY_MIN_ZOOM, max_zoom=DENSITY_MAX_ZOOM):
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        
+        # Kategori sebagai kode integer (-1 untuk kosong), nama kategori disimpan terpisah
+        if categories is None:
+            codes = np.zeros(len(lats), dtype=np.int64)
+            self.category_names = np.array([], dtype=object)
+        else:
+            categories = pd.Series(categories).astype('category')
+            codes = categories.cat.codes.to_numpy().astype(np.int64)
+            self.category_names = categories.cat.categories.astype(str).to_numpy(dtype=object)
+        
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        lats = lats[valid]
+        lons = lons[valid]
+        fine_deg = density_cell_deg(max_zoom)
+        level = self.aggregate(
+            np.floor(lats / fine_deg).astype(np.int64), np.floor(lons / fine_deg).astype(np.int64),
+            codes[valid], np.ones(len(lats), dtype=np.int64), lats, lons
+        )
+        
+        # Geser kanan 1 bit = floor(indeks / 2), juga benar untuk indeks negatif
+        self.levels = {max_zoom: level}
+        for zoom in range(max_zoom - 1, min_zoom - 1, -1):
+            rows, cols, level_codes, counts, lat_sums, lon_sums = level
+            level = self.aggregate(rows >> 1, cols >> 1, level_codes, counts, lat_sums, lon_sums)
+            self.levels[zoom] = level
+    
+    @staticmethod
+    def aggregate(rows, cols, codes, counts, lat_sums, lon_sums):
+        """
+        Gabungkan entri dengan (baris, kolom, kategori) sama: jumlahkan count dan koordinat.
+        Hasil terurut per (baris, kolom, kategori), jadi entri satu sel selalu berdampingan
+        """
+        if len(rows) == 0:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty, empty, np.array([]), np.array([])
+        
+        # (baris, kolom, kategori) dipadatkan menjadi satu key int64 agar unique cukup 1 dimensi
+        row_min, col_min, code_min = rows.min(), cols.min(), codes.min()
+        n_cols = int(cols.max() - col_min) + 1
+        n_codes = int(codes.max() - code_min) + 1
+        keys = ((rows - row_min) * n_cols + (cols - col_min)) * n_codes + (codes - code_min)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        n_keys = len(unique_keys)
+        cells, unique_codes = np.divmod(unique_keys, n_codes)
+        unique_rows, unique_cols = np.divmod(cells, n_cols)
+        return (unique_rows + row_min, unique_cols + col_min, unique_codes + code_min,
+                np.bincount(inverse, weights=counts, minlength=n_keys).astype(np.int64),
+                np.bincount(inverse, weights=lat_sums, minlength=n_keys),
+                np.bincount(inverse, weights=lon_sums, minlength=n_keys))
+    
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for level in self.levels.values() for array in level)
+    
+    def cells(self, zoom, bounds=None, category=None):
+        """
+        DataFrame satu baris per sel pada level zoom (dipotong ke rentang level yang ada):
+        LAT/LON rata-rata titik, COUNT, kategori terbanyak (TOP_CATEGORY, TOP_COUNT) dan N_CATEGORIES.
+        bounds = (south, west, north, east) membatasi sel, category membatasi ke satu kategori
+        """
+        zoom = int(min(max(zoom, self.min_zoom), self.max_zoom))
+        rows, cols, codes, counts, lat_sums, lon_sums = self.levels[zoom]
+        keep = np.ones(len(rows), dtype=bool)
+        if bounds is not None:
+            cell_deg = density_cell_deg(zoom)
+            south, west, north, east = bounds
+            keep &= ((rows >= math.floor(south / cell_deg)) & (rows <= math.floor(north / cell_deg)) &
+                     (cols >= math.floor(west / cell_deg)) & (cols <= math.floor(east / cell_deg)))
+        if category is not None:
+            matches = np.flatnonzero(self.category_names == str(category))
+            keep &= np.isin(codes, matches)
+        
+        rows, cols, codes, counts = rows[keep], cols[keep], codes[keep], counts[keep]
+        lat_sums, lon_sums = lat_sums[keep], lon_sums[keep]
+        if len(rows) == 0:
+            return pd.DataFrame({'LAT': [], 'LON': [], 'COUNT': [], 'TOP_CATEGORY': [],
+                                 'TOP_COUNT': [], 'N_CATEGORIES': []})
+        
+        # Entri satu sel berdampingan (hasil aggregate terurut), sel baru dimulai saat baris/kolom berubah
+        new_cell = np.r_[True, (np.diff(rows) != 0) | (np.diff(cols) != 0)]
+        inverse = np.cumsum(new_cell) - 1
+        n_cells = int(inverse[-1]) + 1
+        totals = np.bincount(inverse, weights=counts, minlength=n_cells)
+        
+        # Entri kategori terbanyak per sel: urutkan per sel lalu count menurun, ambil yang pertama
+        order = np.lexsort((-counts, inverse))
+        first = order[np.r_[0, np.flatnonzero(np.diff(inverse[order])) + 1]]
+        top_codes = codes[first]
+        if len(self.category_names):
+            top_names = np.where(top_codes >= 0, self.category_names[np.maximum(top_codes, 0)], None)
+        else:
+            top_names = np.full(n_cells, None, dtype=object)
+        
+        return pd.DataFrame({
+            'LAT': np.bincount(inverse, weights=lat_sums, minlength=n_cells) / totals,
+            'LON': np.bincount(inverse, weights=lon_sums, minlength=n_cells) / totals,
+            'COUNT': totals.astype(np.int64),
+            'TOP_CATEGORY': top_names,
+            'TOP_COUNT': counts[first],
+            'N_CATEGORIES': np.bincount(inverse, minlength=n_cells)
+        })
+
+# Fungsi untuk mencari stasiun di sekitar titik
+def find_nearby_stations(data, spatial_index, lat, lon, radius_m=None, k=None):
+    """
+    Stasiun dalam radius_m meter, atau k stasiun terdekat jika k diisi, dari titik (lat, lon)
+    spatial_index harus dibangun dari data yang sama
+    Return baris data terurut dari yang terdekat dengan kolom tambahan DISTANCE_M
+    """
+    if k is not None:
+        positions, distances = spatial_index.query_nearest(lat, lon, k)
+    else:
+        positions, distances = spatial_index.query_radius(lat, lon, radius_m)
+    
+    nearby = data.iloc[positions].copy()
+    nearby['DISTANCE_M'] = distances
+    return nearby
+
+# Kandidat interferensi: jarak maksimum antar stasiun dan guard band kanal bersebelahan
+INTERFERENCE_MAX_DISTANCE_KM = 10
+INTERFERENCE_GUARD_MHZ = 0.0
+
+# Fungsi untuk mengambil pita frekuensi terpakai setiap stasiun
+def station_emissions(data):
+    """
+    Pita terpakai FREQ ± BWIDTH/2 dan FREQ_PAIR ± BWIDTH/2 (FREQ dalam MHz, BWIDTH dalam kHz)
+    Return (posisi_baris, frekuensi, batas_bawah, batas_atas), satu elemen per pita
+    """
+    positions = np.arange(len(data))
+    freq = data['FREQ'].to_numpy(dtype=float)
+    if 'FREQ_PAIR' in data.columns:
+        pair = data['FREQ_PAIR'].to_numpy(dtype=float)
+    else:
+        pair = np.full(len(data), np.nan)
+    if 'BWIDTH' in data.columns:
+        half_bw = np.nan_to_num(data['BWIDTH'].to_numpy(dtype=float) / 2000)
+    else:
+        half_bw = np.zeros(len(data))
+    
+    # Frekuensi pasangan hanya dihitung jika berbeda dari FREQ
+    use_pair = ~np.isnan(pair) & (pair != freq)
+    rows = np.concatenate([positions, positions[use_pair]])
+    centers = np.concatenate([freq, pair[use_pair]])
+    half_widths = np.concatenate([half_bw, half_bw[use_pair]])
+    
+    valid = ~np.isnan(centers)
+    rows, centers, half_widths = rows[valid], centers[valid], half_widths[valid]
+    return rows, centers, centers - half_widths, centers + half_widths
+
+def expand_ranges(starts, counts):
+    """Perluas rentang [start, start + count) menjadi pasangan (pemilik, slot)"""
+    owners = np.repeat(np.arange(len(starts)), counts)
+    slots = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return owners, slots
+
+# Fungsi untuk membagi titik ke sel grid blok spasial
+def proximity_cells(lats, lons, max_distance_m):
+    """
+    Nomor sel grid per titik (sel minimal selebar max_distance_m) dan offset nomor sel 3x3 tetangga
+    Dua titik dalam jarak max_distance_m selalu berada di sel yang sama atau sel tetangga
+    Return (cells, neighbor_offsets)
+    """
+    max_abs_lat = min(np.abs(lats).max(), 89.0)
+    cell_deg = math.degrees(max_distance_m / EARTH_RADIUS_M) / math.cos(math.radians(max_abs_lat))
+    cell_deg = max(cell_deg, 1e-9)
+    cell_rows = np.floor(lats / cell_deg).astype(np.int64)
+    cell_cols = np.floor(lons / cell_deg).astype(np.int64)
+    cell_rows -= cell_rows.min() - 1
+    cell_cols -= cell_cols.min() - 1
+    n_cols = int(cell_cols.max()) + 2
+    neighbor_offsets = [d_row * n_cols + d_col for d_row in (-1, 0, 1) for d_col in (-1, 0, 1)]
+    return cell_rows * n_cols + cell_cols, neighbor_offsets
+
+# Fungsi untuk mencari pasangan stasiun yang pitanya tumpang tindih dan berdekatan
+def find_interference_candidates(data, max_distance_m, guard_mhz=INTERFERENCE_GUARD_MHZ):
+    """
+    Pasangan stasiun dengan pita frekuensi tumpang tindih (CO-CHANNEL) atau berjarak
+    <= guard_mhz (ADJACENT, hanya jika guard_mhz > 0) dalam jarak max_distance_m (koordinat SID)
+    
+    Stasiun dikelompokkan per sel grid selebar max_distance_m, lalu di setiap sel tetangga
+    pita diurutkan berdasarkan batas bawah (sort-and-sweep) sehingga kandidat dicari dengan
+    searchsorted, bukan perbandingan semua pasangan. Dua ujung link yang sama (client sama,
+    FREQ dan FREQ_PAIR tertukar) tidak dihitung.
+    Return DataFrame satu baris per pasangan, terurut dari overlap terbesar
+    """
+    result_columns = [
+        'JENIS', 'OVERLAP_MHZ', 'DISTANCE_M',
+        'INDEX_A', 'STN_NAME_A', 'CLNT_NAME_A', 'FREQ_A', 'BWIDTH_A', 'ERP_PWR_DBM_A', 'HGT_ANT_A',
+        'LAT_A', 'LON_A',
+        'INDEX_B', 'STN_NAME_B', 'CLNT_NAME_B', 'FREQ_B', 'BWIDTH_B', 'ERP_PWR_DBM_B', 'HGT_ANT_B',
+        'LAT_B', 'LON_B'
+    ]
+    lats = data['SID_LAT'].to_numpy(dtype=float)
+    lons = data['SID_LONG'].to_numpy(dtype=float)
+    
+    rows, centers, lows, highs = station_emissions(data)
+    has_coord = ~(np.isnan(lats[rows]) | np.isnan(lons[rows]))
+    rows, centers, lows, highs = rows[has_coord], centers[has_coord], lows[has_coord], highs[has_coord]
+    if len(rows) < 2:
+        return pd.DataFrame(columns=result_columns)
+    
+    # Blok spasial: sel grid minimal selebar jarak maksimum, cukup cek 3x3 sel tetangga
+    cells, neighbor_offsets = proximity_cells(lats[rows], lons[rows], max_distance_m)
+    
+    # Urutkan pita per sel lalu per batas bawah; batas bawah diganti rank agar key tetap integer
+    unique_lows = np.unique(lows)
+    n_ranks = len(unique_lows)
+    keys = cells * n_ranks + np.searchsorted(unique_lows, lows)
+    order = np.argsort(keys, kind='stable')
+    keys, rows, centers, lows, highs, cells = (
+        keys[order], rows[order], centers[order], lows[order], highs[order], cells[order]
+    )
+    max_width = (highs - lows).max()
+    
+    # Rank rentang batas bawah pasangan yang mungkin: [low - guard - lebar_maks, high + guard]
+    rank_first = np.searchsorted(unique_lows, lows - guard_mhz - max_width, side='left')
+    rank_last = np.searchsorted(unique_lows, highs + guard_mhz, side='right')
+    
+    found = []
+    for offset in neighbor_offsets:
+        target = cells + offset
+        starts = np.searchsorted(keys, target * n_ranks + rank_first, side='left')
+        ends = np.searchsorted(keys, target * n_ranks + rank_last, side='left')
+        counts = ends - starts
+        if counts.sum() == 0:
+            continue
+        
+        # Perluas rentang kandidat menjadi pasangan (a, b)
+        a, b = expand_ranges(starts, counts)
+        
+        # Setiap pasangan stasiun cukup dicatat sekali (a < b), pita stasiun yang sama diabaikan
+        keep = rows[a] < rows[b]
+        a, b = a[keep], b[keep]
+        overlap = np.minimum(highs[a], highs[b]) - np.maximum(lows[a], lows[b])
+        keep = overlap > 0 if guard_mhz <= 0 else overlap >= -guard_mhz
+        found.append((a[keep], b[keep], overlap[keep]))
+    
+    if not found:
+        return pd.DataFrame(columns=result_columns)
+    a = np.concatenate([item[0] for item in found])
+    b = np.concatenate([item[1] for item in found])
+    overlap = np.concatenate([item[2] for item in found])
+    
+    # Filter jarak sebenarnya (Haversine)
+    row_a, row_b = rows[a], rows[b]
+    distances = calculate_distance_vectorized(lats[row_a], lons[row_a], lats[row_b], lons[row_b])
+    keep = distances <= max_distance_m
+    a, b, row_a, row_b, overlap, distances = a[keep], b[keep], row_a[keep], row_b[keep], overlap[keep], distances[keep]
+    
+    # Buang dua ujung link yang sama
+    if 'FREQ_PAIR' in data.columns and 'CLNT_NAME' in data.columns:
+        freq = data['FREQ'].to_numpy(dtype=float)
+        pair = data['FREQ_PAIR'].to_numpy(dtype=float)
+        clients = data['CLNT_NAME'].astype(object).to_numpy()
+        same_link = ((freq[row_a] == pair[row_b]) & (pair[row_a] == freq[row_b]) &
+                     (clients[row_a] == clients[row_b]))
+        keep = ~same_link
+        a, b, row_a, row_b, overlap, distances = a[keep], b[keep], row_a[keep], row_b[keep], overlap[keep], distances[keep]
+    
+    # Satu baris per pasangan stasiun, ambil pita dengan overlap terbesar
+    candidates = pd.DataFrame({
+        'row_a': row_a, 'row_b': row_b, 'freq_a': centers[a], 'freq_b': centers[b],
+        'overlap': overlap, 'distance': distances
+    }).sort_values('overlap', ascending=False, kind='stable').drop_duplicates(['row_a', 'row_b'])
+    
+    def column_values(col, positions):
+        if col in data.columns:
+            return data[col].to_numpy()[positions]
+        return np.full(len(positions), None)
+    
+    pos_a = candidates['row_a'].to_numpy()
+    pos_b = candidates['row_b'].to_numpy()
+    result = pd.DataFrame({
+        'JENIS': np.where(candidates['overlap'] > 0, 'CO-CHANNEL', 'ADJACENT'),
+        'OVERLAP_MHZ': candidates['overlap'].round(4).to_numpy(),
+        'DISTANCE_M': candidates['distance'].round(1).to_numpy(),
+        'INDEX_A': data.index[pos_a],
+        'STN_NAME_A': column_values('STN_NAME', pos_a),
+        'CLNT_NAME_A': column_values('CLNT_NAME', pos_a),
+        'FREQ_A': candidates['freq_a'].to_numpy(),
+        'BWIDTH_A': column_values('BWIDTH', pos_a),
+        'ERP_PWR_DBM_A': column_values('ERP_PWR_DBM', pos_a),
+        'HGT_ANT_A': column_values('HGT_ANT', pos_a),
+        'LAT_A': lats[pos_a],
+        'LON_A': lons[pos_a],
+        'INDEX_B': data.index[pos_b],
+        'STN_NAME_B': column_values('STN_NAME', pos_b),
+        'CLNT_NAME_B': column_values('CLNT_NAME', pos_b),
+        'FREQ_B': candidates['freq_b'].to_numpy(),
+        'BWIDTH_B': column_values('BWIDTH', pos_b),
+        'ERP_PWR_DBM_B': column_values('ERP_PWR_DBM', pos_b),
+        'HGT_ANT_B': column_values('HGT_ANT', pos_b),
+        'LAT_B': lats[pos_b],
+        'LON_B': lons[pos_b]
+    })
+    return result.reset_index(drop=True)
+
+# Deteksi site duplikat: record dalam jarak ini dengan nama/alamat mirip dianggap satu site fisik
+DUPLICATE_MAX_DISTANCE_M = 50
+# Record dalam jarak ini selalu satu site (koordinat sama, hanya beda pembulatan)
+DUPLICATE_SAME_POINT_M = 1.0
+# Ambang kemiripan Jaccard token STN_NAME / STN_ADDR
+DUPLICATE_TOKEN_SIMILARITY = 0.5
+# Token yang muncul di lebih dari fraksi ini dari nilai unik (mis. nama provinsi) diabaikan
+DUPLICATE_COMMON_TOKEN_FRACTION = 0.05
+DUPLICATE_COMMON_TOKEN_MIN = 10
+
+# Fungsi untuk mencari pasangan titik yang berjarak <= max_distance_m
+def proximity_pairs(lats, lons, max_distance_m):
+    """
+    Pasangan posisi (a < b) dengan jarak Haversine <= max_distance_m
+    Titik dikelompokkan per sel grid selebar max_distance_m, hanya 3x3 sel tetangga yang dibandingkan
+    Return (a, b, jarak_meter)
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    positions = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+    empty = np.array([], dtype=np.int64)
+    if len(positions) < 2:
+        return empty, empty, np.array([])
+    
+    cells, neighbor_offsets = proximity_cells(lats[positions], lons[positions], max_distance_m)
+    
+    order = np.argsort(cells, kind='stable')
+    cells, positions = cells[order], positions[order]
+    
+    found_a, found_b = [], []
+    for offset in neighbor_offsets:
+        target = cells + offset
+        starts = np.searchsorted(cells, target, side='left')
+        counts = np.searchsorted(cells, target, side='right') - starts
+        a, b = expand_ranges(starts, counts)
+        keep = positions[a] < positions[b]
+        found_a.append(positions[a[keep]])
+        found_b.append(positions[b[keep]])
+    
+    a = np.concatenate(found_a)
+    b = np.concatenate(found_b)
+    distances = calculate_distance_vectorized(lats[a], lons[a], lats[b], lons[b])
+    keep = distances <= max_distance_m
+    return a[keep], b[keep], distances[keep]
+
+# Fungsi untuk memecah teks nama/alamat menjadi himpunan token ternormalisasi
+def site_token_sets(series):
+    """
+    Kode per baris (-1 untuk kosong) dan frozenset token per nilai unik
+    Teks di-uppercase lalu dipecah pada karakter non-alfanumerik; token 1 huruf dan
+    token yang terlalu umum (DUPLICATE_COMMON_TOKEN_FRACTION) dibuang
+    """
+    codes, uniques = pd.factorize(series.astype(object))
+    token_lists = [set(re.findall(r'[A-Z0-9]{2,}', str(value).upper())) for value in uniques]
+    
+    frequency = {}
+    for tokens in token_lists:
+        for token in tokens:
+            frequency[token] = frequency.get(token, 0) + 1
+    limit = max(DUPLICATE_COMMON_TOKEN_FRACTION * len(token_lists), DUPLICATE_COMMON_TOKEN_MIN)
+    common = {token for token, count in frequency.items() if count > limit}
+    return codes, [frozenset(tokens - common) for tokens in token_lists]
+
+# Fungsi untuk menandai pasangan titik yang nama/alamatnya mirip
+def similar_point_pairs(point_ids, codes, token_sets, pair_a, pair_b, threshold):
+    """
+    pair_a/pair_b: pasangan id titik; satu titik bisa memuat beberapa nilai teks berbeda
+    Return mask pasangan yang punya minimal satu pasangan nilai dengan Jaccard >= threshold
+    """
+    matched = np.zeros(len(pair_a), dtype=bool)
+    valid = codes >= 0
+    if not valid.any() or len(pair_a) == 0:
+        return matched
+    
+    # Nilai teks unik per titik, terurut berdasarkan id titik
+    n_values = len(token_sets)
+    point_values = np.unique(point_ids[valid] * n_values + codes[valid])
+    value_points = point_values // n_values
+    value_codes = point_values % n_values
+    starts = np.searchsorted(value_points, pair_a, side='left')
+    counts = np.searchsorted(value_points, pair_a, side='right') - starts
+    pair_index, slots_a = expand_ranges(starts, counts)
+    
+    # Setiap nilai titik a dipasangkan dengan setiap nilai titik b
+    starts = np.searchsorted(value_points, pair_b[pair_index], side='left')
+    counts = np.searchsorted(value_points, pair_b[pair_index], side='right') - starts
+    owner, slots_b = expand_ranges(starts, counts)
+    pair_index = pair_index[owner]
+    code_a = value_codes[slots_a[owner]]
+    code_b = value_codes[slots_b]
+    
+    # Jaccard cukup dihitung sekali per pasangan nilai unik
+    code_pairs, inverse = np.unique(np.minimum(code_a, code_b) * n_values + np.maximum(code_a, code_b),
+                                    return_inverse=True)
+    similarity = np.empty(len(code_pairs))
+    for i, key in enumerate(code_pairs):
+        tokens_a, tokens_b = token_sets[key // n_values], token_sets[key % n_values]
+        union = len(tokens_a | tokens_b)
+        similarity[i] = len(tokens_a & tokens_b) / union if union else 0.0
+    
+    matched[pair_index[similarity[inverse] >= threshold]] = True
+    return matched
+
+# Fungsi untuk mengelompokkan record menjadi site fisik
+def find_duplicate_sites(data, max_distance_m=DUPLICATE_MAX_DISTANCE_M,
+                         similarity=DUPLICATE_TOKEN_SIMILARITY, same_point_m=DUPLICATE_SAME_POINT_M):
+    """
+    SITE_ID per baris (0..n_site-1, urut kemunculan pertama) dari koordinat SID
+    Record dengan koordinat identik digabung dulu menjadi satu titik; titik berjarak <= same_point_m,
+    atau <= max_distance_m dengan STN_NAME / STN_ADDR mirip (Jaccard token >= similarity),
+    digabung menjadi satu site (transitif). Baris tanpa koordinat menjadi site sendiri.
+    """
+    lats = data['SID_LAT'].to_numpy(dtype=float)
+    lons = data['SID_LONG'].to_numpy(dtype=float)
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    
+    # Titik unik: baris tanpa koordinat diberi id titik sendiri
+    point_ids = np.empty(len(data), dtype=np.int64)
+    uniques, inverse = np.unique(lats[valid] + 1j * lons[valid], return_inverse=True)
+    point_ids[valid] = inverse
+    point_ids[~valid] = len(uniques) + np.arange((~valid).sum())
+    n_points = len(uniques) + int((~valid).sum())
+    
+    pair_a, pair_b, distances = proximity_pairs(uniques.real, uniques.imag, max_distance_m)
+    linked = distances <= same_point_m
+    for col in ['STN_NAME', 'STN_ADDR']:
+        # Hanya pasangan yang belum tergabung yang perlu dicek teksnya
+        pending = np.flatnonzero(~linked)
+        if col in data.columns and len(pending):
+            codes, token_sets = site_token_sets(data[col])
+            linked[pending] = similar_point_pairs(point_ids, codes, token_sets,
+                                                  pair_a[pending], pair_b[pending], similarity)
+    pair_a, pair_b = pair_a[linked], pair_b[linked]
+    
+    # Komponen terhubung: propagasi label minimum + pointer jumping sampai stabil
+    labels = np.arange(n_points)
+    while len(pair_a):
+        smallest = np.minimum(labels[pair_a], labels[pair_b])
+        updated = labels.copy()
+        np.minimum.at(updated, pair_a, smallest)
+        np.minimum.at(updated, pair_b, smallest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    
+    # Nomor site berurutan sesuai baris pertama yang muncul
+    row_labels = labels[point_ids]
+    _, first_rows, site_ids = np.unique(row_labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first_rows), dtype=np.int64)
+    rank[np.argsort(first_rows, kind='stable')] = np.arange(len(first_rows))
+    return rank[site_ids]
+
+# Fungsi untuk meringkas record per site
+def site_summary(data, site_ids):
+    """
+    Satu baris per site: jumlah record, titik tengah SID, sebaran maksimum ke titik tengah,
+    nama/client pertama dan jumlah nama, client dan REQUEST_REFERENCE berbeda
+    """
+    grouped = data.assign(SITE_ID=site_ids).groupby('SITE_ID', sort=True, observed=True)
+    sites = pd.DataFrame({
+        'JUMLAH_RECORD': grouped.size(),
+        'SID_LAT': grouped['SID_LAT'].mean(),
+        'SID_LONG': grouped['SID_LONG'].mean()
+    })
+    for col in ['STN_NAME', 'STN_ADDR', 'CLNT_NAME', 'CITY']:
+        if col in data.columns:
+            sites[col] = grouped[col].first().astype(object)
+    for col, label in [('STN_NAME', 'JUMLAH_NAMA'), ('CLNT_NAME', 'JUMLAH_CLIENT'),
+                       ('REQUEST_REFERENCE', 'JUMLAH_REFERENSI')]:
+        if col in data.columns:
+            sites[label] = grouped[col].nunique()
+    
+    spread = calculate_distance_vectorized(
+        data['SID_LAT'].to_numpy(dtype=float), data['SID_LONG'].to_numpy(dtype=float),
+        sites['SID_LAT'].to_numpy()[site_ids], sites['SID_LONG'].to_numpy()[site_ids]
+    )
+    sites['SEBARAN_M'] = pd.Series(spread).groupby(site_ids).max().round(1).to_numpy()
+    return sites.reset_index()
+
+# Fungsi untuk membuat tabel record yang termasuk site duplikat
+def build_duplicate_table(data, site_ids, sites):
+    """Record dari site dengan lebih dari satu record, dikelompokkan per SITE_ID (site terbesar dulu)"""
+    sizes = sites['JUMLAH_RECORD'].to_numpy()[site_ids]
+    duplicate = sizes > 1
+    columns = [col for col in ['STN_NAME', 'STN_ADDR', 'CLNT_NAME', 'REQUEST_REFERENCE', 'CITY',
+                               'FREQ', 'SID_LAT', 'SID_LONG'] if col in data.columns]
+    table = data.loc[duplicate, columns].copy()
+    table.insert(0, 'Index', data.index[duplicate])
+    table.insert(0, 'JUMLAH_RECORD', sizes[duplicate])
+    table.insert(0, 'SITE_ID', site_ids[duplicate])
+    return table.sort_values(['JUMLAH_RECORD', 'SITE_ID'], ascending=[False, True],
+                             kind='stable').reset_index(drop=True)
+
+# Mode streaming untuk ekspor berukuran besar: baca per chunk, buang kolom yang tidak dipakai
+STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
+CHUNK_ROWS = 100_000
+STREAMING_COLUMNS = [
+    'CLNT_ID', 'REQUEST_REFERENCE', 'APPL_ID', 'CLNT_NAME', 'STATUS_SIMF', 'SERVICE', 'SUBSERVICE',
+    'FREQ', 'FREQ_PAIR', 'ERP_PWR_DBM', 'BWIDTH', 'HGT_ANT', 'STATUS_MYSPECTRA', 'STN_NAME', 'STN_ADDR',
+    'SID_LONG', 'SID_LAT', 'PLUS_CODE_MYSPECTRA', 'PLUS_CODE_KALKULASI',
+    'LONGITUDE_CENTER_KALKULASI', 'LATITUDE_CENTER_KALKULASI', 'DISTRICT', 'CITY', 'PROVINSI',
+    'APPL_DATE', 'LICENCE_DATE', 'VALIDITY_DATE', 'UPT', 'Status Verifikasi UPT 2024'
+]
+
+# Fungsi untuk menambahkan kolom turunan ke DataFrame hasil cleaning
+def add_derived_columns(df):
+    """Jarak/status toleransi, validasi plus code dan categorical, ditambahkan langsung ke df"""
+    # Hitung jarak SID-Center sekali per file (ikut tersimpan di cache)
+    if 'LONGITUDE_CENTER_KALKULASI' in df.columns and 'LATITUDE_CENTER_KALKULASI' in df.columns:
+        add_tolerance_columns(df)
+    
+    # Validasi plus code terhadap Center dan SID, kode yang kosong dihitung dari SID
+    add_plus_code_columns(df)
+    
+    # Kolom teks berulang disimpan sebagai categorical agar hemat memori
+    return apply_categories(df)
+
+def read_csv_streaming(file_path, encoding, chunk_rows=CHUNK_ROWS, progress=None, numeric=True):
+    """
+    Membaca CSV per chunk: setiap chunk langsung di-coerce, dibersihkan dan diberi kolom turunan
+    sehingga memori puncak dibatasi ukuran chunk, bukan ukuran file
+    Return (df, original_rows)
+    """
+    total_bytes = max(os.path.getsize(file_path), 1)
+    chunks = []
+    original_rows = 0
+    
+    try:
+        # Handle biner agar posisi byte bisa dipakai untuk progress
+        with open(file_path, 'rb') as f:
+            reader = pd.read_csv(
+                f, encoding=encoding, dtype=schema_dtypes(numeric),
+                usecols=lambda col: col in STREAMING_COLUMNS, chunksize=chunk_rows
+            )
+            for chunk in reader:
+                original_rows += len(chunk)
+                chunk = apply_schema(chunk)
+                chunk = chunk.dropna(subset=['SID_LONG', 'SID_LAT'])
+                chunks.append(add_derived_columns(chunk))
+                
+                if progress is not None:
+                    progress(min(f.tell() / total_bytes, 1.0), f"Memuat {original_rows:,} baris...")
+    except UnicodeDecodeError:
+        raise
+    except ValueError:
+        if not numeric:
+            raise
+        # Ada nilai non-numerik di kolom float - ulangi dengan kolom float sebagai teks
+        return read_csv_streaming(file_path, encoding, chunk_rows, progress, numeric=False)
+    
+    if not chunks:
+        # Tanpa chunk sama sekali: frame kosong dengan dtype skema dan kolom turunan
+        dtype = {col: value for col, value in schema_dtypes(numeric).items() if col in STREAMING_COLUMNS}
+        empty = apply_schema(pd.DataFrame(columns=STREAMING_COLUMNS).astype(dtype))
+        return normalize_text_dtypes(add_derived_columns(empty)), original_rows
+    
+    # Kolom teks yang kosong di sebagian chunk terbaca float, sehingga concat menghasilkan object
+    return normalize_text_dtypes(concat_categorical_chunks(chunks)), original_rows
+
+# Fungsi untuk load dan preprocess satu file CSV (tanpa elemen UI, aman dipanggil dari thread)
+def load_csv_file(file_path, streaming=False, progress=None):
+    """Return (DataFrame, pesan status); DataFrame kosong jika file gagal dimuat"""
+    try:
+        # Gunakan cache Parquet jika file sumber tidak berubah
+        cached = read_cached_data(file_path, streaming)
+        if cached is not None:
+            df, original_rows = cached
+            return df, f"Berhasil load {len(df)} dari {original_rows} baris data (cache)"
+        
+        # Deteksi encoding sekali, lalu cek kolom yang diperlukan dari header saja
+        encoding = detect_encoding(file_path)
+        header = pd.read_csv(file_path, encoding=encoding, nrows=0, encoding_errors='replace').columns
+        required_coords = ['SID_LONG', 'SID_LAT']
+        missing_coords = [col for col in required_coords if col not in header]
+        
+        if missing_coords:
+            return pd.DataFrame(), f"Error: Kolom koordinat tidak ditemukan: {missing_coords}"
+        
+        if streaming:
+            # Chunk sudah di-coerce, dibersihkan dan diberi kolom turunan satu per satu
+            try:
+                df, original_rows = read_csv_streaming(file_path, encoding, progress=progress)
+            except UnicodeDecodeError:
+                # Sampel awal lolos UTF-8 tetapi ada byte non-UTF-8 di bagian lain file
+                df, original_rows = read_csv_streaming(file_path, 'latin-1', progress=progress)
+        else:
+            # Baca file CSV sekali dengan encoding hasil deteksi
+            try:
+                df = read_csv_with_schema(file_path, encoding)
+            except UnicodeDecodeError:
+                # Sampel awal lolos UTF-8 tetapi ada byte non-UTF-8 di bagian lain file
+                df = read_csv_with_schema(file_path, 'latin-1')
+            
+            original_rows = len(df)
+            
+            # Pastikan koordinat dan kolom numerik lain bertipe float, tanggal bertipe datetime
+            df = apply_schema(df)
+            
+            # Hapus baris dengan koordinat invalid, lalu tambahkan kolom turunan
+            df = add_derived_columns(df.dropna(subset=['SID_LONG', 'SID_LAT']))
+        
+        cleaned_rows = len(df)
+        
+        write_cached_data(file_path, df, original_rows, streaming)
+        
+        success_message = f"Berhasil load {cleaned_rows} dari {original_rows} baris data"
+        return df, success_message
+    
+    except Exception as e:
+        return pd.DataFrame(), f"Error loading data: {str(e)}"
+
+# Instrumentasi per tahap: aktif lewat env var atau toggle di sidebar aplikasi
+PROFILE_ENV_VAR = "KOORDINAT_PROFILE"
+PROFILE_LOG_ENV_VAR = "KOORDINAT_PROFILE_LOG"
+PROFILE_LOG_PATH = "profil_koordinat.jsonl"
+
+def profiling_enabled_from_env():
+    """True jika KOORDINAT_PROFILE bernilai 1/true/yes/on"""
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+def memory_rss_bytes():
+    """Resident set size proses saat ini (byte), None jika tidak bisa dibaca (non-Linux)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class StageProfiler:
+    """
+    Pencatat waktu, jumlah baris dan perubahan memori (RSS) untuk setiap tahap satu rerun
+    Jika tidak aktif, stage() tidak mengukur apa pun sehingga aman dibiarkan di kode
+    """
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+    
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Ukur blok with sebagai satu tahap; dict yang di-yield bisa diisi
+        (misal info['rows'] = len(df)) sebelum blok selesai
+        """
+        info = {'stage': name, 'rows': rows}
+        if not self.enabled:
+            yield info
+            return
+        
+        rss_before = memory_rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield info
+        finally:
+            info['seconds'] = time.perf_counter() - started
+            rss_after = memory_rss_bytes()
+            info['rss_bytes'] = rss_after
+            info['rss_delta_bytes'] = (rss_after - rss_before
+                                       if rss_after is not None and rss_before is not None else None)
+            self.records.append(info)
+    
+    @property
+    def total_seconds(self):
+        return sum(record['seconds'] for record in self.records)
+    
+    def to_frame(self):
+        """DataFrame satu baris per tahap, memori dalam MB"""
+        frame = pd.DataFrame(self.records, columns=['stage', 'rows', 'seconds', 'rss_bytes', 'rss_delta_bytes'])
+        return pd.DataFrame({
+            'Tahap': frame['stage'],
+            'Baris': frame['rows'].astype('Int64'),
+            'Waktu (ms)': (frame['seconds'] * 1000).round(1),
+            'RSS (MB)': (frame['rss_bytes'].astype(float) / 2**20).round(1),
+            'Δ RSS (MB)': (frame['rss_delta_bytes'].astype(float) / 2**20).round(2)
+        })
+    
+    def write_log(self, path, **context):
+        """Tambahkan satu baris JSON per tahap ke file log (JSON Lines), context ikut di setiap baris"""
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps({'timestamp': timestamp, **context, **record},
+                                   ensure_ascii=False, default=str) + "\n")
+
+# Fungsi untuk menghitung statistik audit toleransi
+def tolerance_summary(data):
+    """
+    Statistik jarak SID-Center dan kategori toleransi (nilai Python biasa, siap JSON)
+    Return None jika tidak ada baris dengan koordinat center
+    """
+    if 'DISTANCE_SID_CENTER_M' not in data.columns:
+        return None
+    distances = data['DISTANCE_SID_CENTER_M'].dropna().to_numpy()
+    if len(distances) == 0:
+        return None
+    
+    total = len(distances)
+    exceeded = int((distances > TOLERANCE_METERS).sum())
+    return {
+        'valid_comparisons': total,
+        'mean_m': float(np.mean(distances)),
+        'min_m': float(np.min(distances)),
+        'median_m': float(np.median(distances)),
+        'max_m': float(np.max(distances)),
+        'std_m': float(np.std(distances)),
+        'within_5m': int((distances <= 5).sum()),
+        'within_10m': int(((distances > 5) & (distances <= 10)).sum()),
+        'within_20m': int(((distances > 10) & (distances <= 20)).sum()),
+        'above_20m': int((distances > 20).sum()),
+        'exceeded': exceeded,
+        'within_tolerance': total - exceeded,
+        'pct_within': (total - exceeded) / total * 100,
+        'pct_exceeded': exceeded / total * 100
+    }
+
+# Fungsi untuk membuat tabel data yang melebihi toleransi
+def build_exceeded_table(data):
+    """Baris dengan jarak SID-Center > TOLERANCE_METERS, format sama dengan toleransi_exceeded_*.csv"""
+    distances = data['DISTANCE_SID_CENTER_M']
+    exceeded_df = data[distances.notna() & (distances > TOLERANCE_METERS)]
+    
+    tolerance_df = pd.DataFrame({
+        'Index': exceeded_df.index,
+        'STN_NAME': (exceeded_df['STN_NAME'].to_numpy() if 'STN_NAME' in exceeded_df.columns
+                     else [f'Data #{idx}' for idx in exceeded_df.index]),
+        'CLNT_NAME': exceeded_df['CLNT_NAME'].to_numpy() if 'CLNT_NAME' in exceeded_df.columns else 'N/A',
+        'CITY': exceeded_df['CITY'].to_numpy() if 'CITY' in exceeded_df.columns else 'N/A',
+        'SID_LAT': exceeded_df['SID_LAT'].to_numpy(),
+        'SID_LONG': exceeded_df['SID_LONG'].to_numpy(),
+        'CENTER_LAT': exceeded_df['LATITUDE_CENTER_KALKULASI'].to_numpy(),
+        'CENTER_LONG': exceeded_df['LONGITUDE_CENTER_KALKULASI'].to_numpy(),
+        'Distance_m': exceeded_df['DISTANCE_SID_CENTER_M'].to_numpy(),
+        'Status': 'MELEBIHI TOLERANSI'
+    })
+    
+    # Format kolom untuk tampilan yang lebih baik
+    for col in ['SID_LAT', 'SID_LONG', 'CENTER_LAT', 'CENTER_LONG']:
+        tolerance_df[col] = tolerance_df[col].round(6)
+    tolerance_df['Distance_m'] = tolerance_df['Distance_m'].round(2)
+    return tolerance_df
+
+# Format ekspor: label, MIME type dan ekstensi file
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv', '.csv'),
+    'csv.gz': ('CSV terkompresi (gzip)', 'application/gzip', '.csv.gz'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', '.parquet'),
+    'geojson': ('GeoJSON (titik SID)', 'application/geo+json', '.geojson')
+}
+
+def export_formats(data):
+    """Format ekspor yang tersedia untuk data (GeoJSON hanya jika ada koordinat SID)"""
+    return [fmt for fmt in EXPORT_FORMATS
+            if fmt != 'geojson' or {'SID_LAT', 'SID_LONG'} <= set(data.columns)]
+
+def to_geojson(data):
+    """FeatureCollection titik SID, kolom lain menjadi properties (NaN -> null, tanggal ISO)"""
+    has_coords = data['SID_LAT'].notna() & data['SID_LONG'].notna()
+    data = data[has_coords]
+    properties = json.loads(data.drop(columns=['SID_LAT', 'SID_LONG']).to_json(
+        orient='records', date_format='iso', force_ascii=False
+    ))
+    coordinates = np.column_stack([data['SID_LONG'].to_numpy(), data['SID_LAT'].to_numpy()]).tolist()
+    features = [
+        {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': point}, 'properties': props}
+        for point, props in zip(coordinates, properties)
+    ]
+    return json.dumps({'type': 'FeatureCollection', 'features': features}, ensure_ascii=False)
+
+# Fungsi untuk membuat isi file ekspor (dipanggil hanya saat tombol download diklik)
+def export_bytes(data, fmt):
+    """Isi file ekspor dalam bentuk bytes"""
+    if fmt == 'csv':
+        return data.to_csv(index=False).encode('utf-8')
+    if fmt == 'csv.gz':
+        buffer = io.BytesIO()
+        data.to_csv(buffer, index=False, compression={'method': 'gzip', 'compresslevel': 6})
+        return buffer.getvalue()
+    if fmt == 'parquet':
+        buffer = io.BytesIO()
+        data.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    if fmt == 'geojson':
+        return to_geojson(data).encode('utf-8')
+    raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+
+# Fungsi untuk audit toleransi satu file (dijalankan di proses worker)
+def audit_file(file_path, output_dir, streaming=False):
+    """
+    Load satu file lalu tulis toleransi_exceeded_<nama>.csv dan ringkasan_<nama>.json ke output_dir
+    Return dict ringkasan, termasuk untuk file yang gagal dimuat
+    """
+    started = time.perf_counter()
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    df, message = load_csv_file(file_path, streaming)
+    
+    summary = {'file': os.path.basename(file_path), 'status': 'ok', 'message': message, 'rows': len(df)}
+    if df.empty:
+        summary['status'] = 'error'
+    else:
+        stats = tolerance_summary(df)
+        if stats is None:
+            summary['status'] = 'tanpa_center'
+        else:
+            summary.update(stats)
+            exceeded_path = os.path.join(output_dir, f"toleransi_exceeded_{name}.csv")
+            build_exceeded_table(df).to_csv(exceeded_path, index=False)
+            summary['exceeded_report'] = exceeded_path
+        
+        # Jumlah baris plus code bermasalah dan yang dihitung dari SID
+        plus_code_status = df['PLUS_CODE_STATUS']
+        summary['plus_code_issues'] = int((~plus_code_status.isin(['SESUAI', 'DIHITUNG DARI SID'])).sum())
+        summary['plus_code_computed'] = int((plus_code_status == 'DIHITUNG DARI SID').sum())
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    
+    with open(os.path.join(output_dir, f"ringkasan_{name}.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+# Fungsi untuk audit toleransi banyak file secara paralel
+def audit_files(file_paths, output_dir, workers=None, streaming=False):
+    """
+    Audit setiap file di proses terpisah (satu file per worker), lalu tulis
+    ringkasan_toleransi.csv dan ringkasan_toleransi.json untuk semua file
+    Return DataFrame ringkasan, satu baris per file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1 or len(file_paths) <= 1:
+        summaries = [audit_file(path, output_dir, streaming) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            summaries = list(executor.map(audit_file, file_paths, repeat(output_dir), repeat(streaming)))
+    
+    # convert_dtypes agar kolom jumlah tetap integer walau ada file yang gagal (NaN)
+    summary_df = pd.DataFrame(summaries).convert_dtypes()
+    summary_df.to_csv(os.path.join(output_dir, "ringkasan_toleransi.csv"), index=False)
+    with open(os.path.join(output_dir, "ringkasan_toleransi.json"), 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, indent=2, ensure_ascii=False)
+    return summary_df
+
+# Fungsi untuk mengumpulkan file CSV dari argumen CLI (file atau folder)
+def collect_csv_files(paths):
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+        else:
+            file_paths.append(path)
+    return file_paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Audit toleransi 20 m koordinat SID vs Center untuk banyak file CSV"
+    )
+    parser.add_argument("paths", nargs="*", default=["Data"],
+                        help="File CSV atau folder berisi file CSV (default: Data)")
+    parser.add_argument("-o", "--output-dir", default="laporan_toleransi",
+                        help="Folder laporan (default: laporan_toleransi)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Jumlah proses paralel (default: jumlah core CPU)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Baca file per chunk dengan kolom terbatas (hemat memori)")
+    args = parser.parse_args(argv)
+    
+    file_paths = collect_csv_files(args.paths)
+    if not file_paths:
+        print("Tidak ada file CSV yang ditemukan", file=sys.stderr)
+        return 1
+    
+    summary_df = audit_files(file_paths, args.output_dir, args.workers, args.streaming)
+    for summary in summary_df.to_dict('records'):
+        if summary['status'] == 'ok':
+            print(f"{summary['file']}: {summary['exceeded']}/{summary['valid_comparisons']} "
+                  f"melebihi {TOLERANCE_METERS} m ({summary['seconds']} s)")
+        else:
+            print(f"{summary['file']}: {summary['status']} - {summary['message']}")
+    print(f"Laporan ditulis ke {args.output_dir}")
+    
+    # Exit code 1 jika ada file yang gagal dimuat (untuk job terjadwal)
+    return 1 if (summary_df['status'] == 'error').any() else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,643 @@
+"""
+Pembuatan peta folium dan chart plotly dari DataFrame hasil koordinat_core (tanpa Streamlit)
+"""
+import pandas as pd
+import folium
+from folium.plugins import FastMarkerCluster, HeatMap
+import plotly.express as px
+import numpy as np
+import json
+from koordinat_core import (
+    TOLERANCE_METERS, escape_html_column, popup_field_values, station_popups
+)
+from koordinat_tiles import TILE_SOURCES
+
+# Mode marker massal: di atas batas ini semua titik dikirim sebagai satu layer data
+BULK_MARKER_THRESHOLD = 1000
+
+# Mode viewport: marker individual hanya dikirim pada zoom detail dan jumlah titik terbatas
+VIEWPORT_DETAIL_ZOOM = 12
+VIEWPORT_MAX_MARKERS = 500
+# Bbox viewport diperlebar agar geser peta sedikit tidak langsung kosong di tepi
+VIEWPORT_MARGIN = 0.25
+
+# Warna folium.Icon dalam hex untuk circle marker di mode massal
+MARKER_HEX_COLORS = {
+    'red': '#d63e2a', 'blue': '#38aadd', 'green': '#72b026', 'purple': '#d252b9',
+    'orange': '#f69730', 'darkred': '#a23336', 'lightred': '#ff8e7f', 'beige': '#ffcb92',
+    'darkblue': '#0067a3', 'darkgreen': '#728224', 'cadetblue': '#436978', 'darkpurple': '#5b396b',
+    'white': '#fbfbfb', 'pink': '#ff91ea', 'lightblue': '#8adaff', 'lightgreen': '#bbf970',
+    'gray': '#575757', 'black': '#303030', 'lightgray': '#a3a3a3'
+}
+
+# Callback JS FastMarkerCluster: row = [lat, lon, indeks stasiun, indeks warna, jenis (0 = SID, 1 = Center)]
+# __TABLE__ diganti tabel stasiun (station_popup_table) yang dikirim sekali per layer;
+# HTML popup/tooltip baru dirakit di browser saat marker dibuka/disorot
+BULK_MARKER_CALLBACK = """
+(function () {
+    var table = __TABLE__;
+    function value(field, i) {
+        var code = field.codes[i];
+        return code < 0 ? null : field.uniques[code];
+    }
+    function stationName(i) {
+        var name = value(table.name, i);
+        return name === null ? "Data Point #" + table.fallback[i] : name;
+    }
+    function popup(i) {
+        var html = "<div style='width: 300px;'><h4><b>" + stationName(i) + "</b></h4><hr>";
+        table.fields.forEach(function (field) {
+            var text = value(field, i);
+            if (text !== null) {
+                html += "<b>" + field.label + ":</b> " + text + "<br>";
+            }
+        });
+        html += "<hr><b>Koordinat SID:</b><br>Lat: " + table.sidLat[i] + ", Long: " + table.sidLon[i] + "<br>";
+        if (table.centerLat !== null && table.centerLat[i] !== null) {
+            html += "<b>Koordinat Center:</b><br>Lat: " + table.centerLat[i] + ", Long: " + table.centerLon[i];
+        }
+        return html + "</div>";
+    }
+    function tooltip(i) {
+        var name = value(table.name, i);
+        if (name === null) {
+            return stationName(i);
+        }
+        var client = table.client < 0 ? null : value(table.fields[table.client], i);
+        return client === null ? name : name + " - " + client;
+    }
+    return function (row) {
+        var isCenter = row[4] === 1;
+        var color = table.colors[row[3]];
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+            radius: isCenter ? 7 : 6,
+            color: color,
+            weight: isCenter ? 3 : 1,
+            fillColor: color,
+            fillOpacity: isCenter ? 0.2 : 0.8
+        });
+        marker.bindPopup(function () { return popup(row[2]); }, {maxWidth: 300});
+        marker.bindTooltip(function () { return tooltip(row[2]) + table.suffixes[row[4]]; });
+        return marker;
+    };
+})()
+"""
+
+# Palet warna marker per client (nama warna folium.Icon), dipakai bergiliran
+CLIENT_MARKER_COLORS = ['red', 'blue', 'green', 'purple', 'orange', 'darkred', 'lightred',
+                        'beige', 'darkblue', 'darkgreen', 'cadetblue', 'darkpurple', 'white',
+                        'pink', 'lightblue', 'lightgreen', 'gray', 'black', 'lightgray']
+# Warna marker site yang dipakai lebih dari satu client
+MULTI_CLIENT_SITE_COLOR = '#303030'
+
+# Callback JS FastMarkerCluster mode site: row = [lat, lon, popup, tooltip, html ikon, ukuran ikon]
+SITE_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {
+        icon: L.divIcon({className: '', html: row[4], iconSize: [row[5], row[5]]})
+    });
+    marker.bindPopup(row[2], {maxWidth: 300});
+    marker.bindTooltip(row[3]);
+    return marker;
+}
+"""
+
+# Fungsi untuk membuat peta dasar (tanpa marker)
+def create_base_map(data, map_style, tile_url=None):
+    # Tentukan center peta berdasarkan data
+    center_lat = data['SID_LAT'].mean()
+    center_lon = data['SID_LONG'].mean()
+    
+    # Tile dari server tile lokal (koordinat_tiles) menggantikan tile remote
+    if tile_url:
+        m = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles=None)
+        folium.TileLayer(
+            tiles=tile_url,
+            attr=TILE_SOURCES.get(map_style, (None, map_style))[1],
+            name=map_style
+        ).add_to(m)
+        return m
+    
+    # Mapping style peta
+    tile_options = {
+        "OpenStreetMap": None,
+        "Satellite": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
+        "Terrain": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Terrain_Base/MapServer/tile/{z}/{y}/{x}",
+        "CartoDB Positron": "CartoDB positron",
+        "CartoDB Dark_Matter": "CartoDB dark_matter"
+    }
+    
+    # Buat peta dasar
+    if map_style == "OpenStreetMap":
+        m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
+    elif map_style in ["CartoDB Positron", "CartoDB Dark_Matter"]:
+        m = folium.Map(location=[center_lat, center_lon], zoom_start=10, tiles=tile_options[map_style])
+    else:
+        m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
+        folium.TileLayer(
+            tiles=tile_options[map_style],
+            attr=map_style,
+            name=map_style
+        ).add_to(m)
+    
+    return m
+
+# Fungsi untuk membuat tabel popup/tooltip per stasiun bagi BULK_MARKER_CALLBACK
+def station_popup_table(data):
+    """
+    Nilai teks (sudah di-escape) disimpan sekali per nilai unik ditambah kode per stasiun,
+    sehingga HTML popup tidak diulang untuk setiap marker
+    """
+    def encode(values):
+        codes, uniques = pd.factorize(values)
+        return {'codes': codes.tolist(), 'uniques': uniques.tolist()}
+    
+    def numbers(column):
+        values = data[column].astype(object)
+        return values.where(values.notna(), None).tolist()
+    
+    if 'STN_NAME' in data.columns:
+        names = escape_html_column(data['STN_NAME'])
+    else:
+        names = pd.Series(np.nan, index=data.index, dtype=object)
+    missing = np.flatnonzero(names.isna().to_numpy())
+    
+    fields = []
+    client = -1
+    for col, label, values in popup_field_values(data):
+        if col == 'CLNT_NAME':
+            client = len(fields)
+        fields.append({'label': label, **encode(values)})
+    
+    has_center = 'LATITUDE_CENTER_KALKULASI' in data.columns
+    return {
+        'name': encode(names),
+        'fallback': {int(i): str(data.index[i]) for i in missing},
+        'fields': fields,
+        'client': client,
+        'sidLat': numbers('SID_LAT'),
+        'sidLon': numbers('SID_LONG'),
+        'centerLat': numbers('LATITUDE_CENTER_KALKULASI') if has_center else None,
+        'centerLon': numbers('LONGITUDE_CENTER_KALKULASI') if has_center else None
+    }
+
+# Fungsi untuk menambahkan marker stasiun ke peta atau FeatureGroup
+def add_station_markers(m, data, coord_type, bulk_threshold=BULK_MARKER_THRESHOLD):
+    # Di atas batas jumlah titik, marker dan garis dikumpulkan lalu ditambahkan sekaligus
+    bulk_mode = len(data) > bulk_threshold
+    bulk_points = []
+    bulk_lines = {}
+    bulk_colors = {}
+    bulk_suffixes = ['', '']
+    
+    # Color mapping untuk client names (jika ada kolom CLNT_NAME)
+    if 'CLNT_NAME' in data.columns:
+        unique_clients = data['CLNT_NAME'].unique()
+        colors = CLIENT_MARKER_COLORS
+        color_map = {client: colors[i % len(colors)] for i, client in enumerate(unique_clients)}
+    else:
+        color_map = {}
+    
+    def add_marker(location, i, suffix, client_color, icon):
+        if bulk_mode:
+            # Titik hanya membawa indeks stasiun dan indeks warna; teks diambil dari tabel stasiun
+            kind = 1 if icon == 'bullseye' else 0
+            bulk_suffixes[kind] = suffix
+            hex_color = MARKER_HEX_COLORS.get(client_color, client_color)
+            color_code = bulk_colors.setdefault(hex_color, len(bulk_colors))
+            bulk_points.append(location + [i, color_code, kind])
+        else:
+            folium.Marker(
+                location=location,
+                popup=folium.Popup(popups[i], max_width=300),
+                tooltip=tooltips[i] + suffix,
+                icon=folium.Icon(color=client_color, icon=icon)
+            ).add_to(m)
+    
+    def add_line(locations, client_color):
+        if bulk_mode:
+            # Garis dengan warna sama digabung menjadi satu multi-polyline
+            bulk_lines.setdefault(client_color, []).append(locations)
+        else:
+            folium.PolyLine(
+                locations=locations,
+                color=client_color,
+                weight=2,
+                opacity=0.7,
+                dash_array="5, 5"
+            ).add_to(m)
+    
+    # Popup dan tooltip dibuat hanya untuk baris yang dirender (hasil peta disimpan per state filter)
+    if not bulk_mode:
+        popups, tooltips = station_popups(data)
+    
+    # Tentukan warna marker
+    if color_map:
+        client_colors = data['CLNT_NAME'].map(color_map).astype(object).fillna('red').to_numpy()
+    else:
+        client_colors = np.full(len(data), 'red', dtype=object)
+    
+    sid_lats = data['SID_LAT'].to_numpy()
+    sid_lons = data['SID_LONG'].to_numpy()
+    if 'LATITUDE_CENTER_KALKULASI' in data.columns:
+        center_lats = data['LATITUDE_CENTER_KALKULASI'].to_numpy()
+        center_lons = data['LONGITUDE_CENTER_KALKULASI'].to_numpy()
+        has_center = ~(np.isnan(center_lats) | np.isnan(center_lons))
+    else:
+        has_center = None
+    
+    # Tambahkan markers berdasarkan pilihan koordinat
+    for i in range(len(data)):
+        client_color = client_colors[i]
+        
+        # Add markers berdasarkan koordinat
+        if coord_type == "SID (SID_LONG, SID_LAT)":
+            add_marker([sid_lats[i], sid_lons[i]], i, "", client_color, 'info-sign')
+        
+        elif coord_type.startswith("Center") and has_center is not None:
+            if has_center[i]:
+                add_marker([center_lats[i], center_lons[i]], i, " (Center)", client_color, 'bullseye')
+        
+        elif coord_type == "Keduanya":
+            # Marker untuk SID
+            add_marker([sid_lats[i], sid_lons[i]], i, " - SID", client_color, 'info-sign')
+            
+            # Marker untuk Center (jika ada)
+            if has_center is not None and has_center[i]:
+                add_marker([center_lats[i], center_lons[i]], i, " - Center", client_color, 'bullseye')
+                
+                # Garis penghubung antara SID dan Center
+                add_line([[sid_lats[i], sid_lons[i]], [center_lats[i], center_lons[i]]],
+                         client_color)
+    
+    if bulk_mode:
+        # Satu layer cluster untuk semua titik; tabel stasiun dipakai bersama oleh marker SID dan Center
+        table = station_popup_table(data)
+        table['colors'] = list(bulk_colors)
+        table['suffixes'] = bulk_suffixes
+        callback = BULK_MARKER_CALLBACK.replace(
+            '__TABLE__', json.dumps(table, ensure_ascii=False, separators=(',', ':')))
+        FastMarkerCluster(bulk_points, callback=callback, name="Stasiun").add_to(m)
+        
+        for client_color, segments in bulk_lines.items():
+            folium.PolyLine(
+                locations=segments,
+                color=client_color,
+                weight=2,
+                opacity=0.7,
+                dash_array="5, 5"
+            ).add_to(m)
+    
+    return m
+
+# Fungsi untuk membuat peta
+def create_map(data, coord_type, map_style, bulk_threshold=BULK_MARKER_THRESHOLD, tile_url=None):
+    if data.empty:
+        return None
+    
+    m = create_base_map(data, map_style, tile_url)
+    return add_station_markers(m, data, coord_type, bulk_threshold)
+
+# Fungsi untuk membuat HTML peta (disimpan di ResultCache)
+def render_map_html(data, coord_type, map_style, bulk_threshold=BULK_MARKER_THRESHOLD, tile_url=None):
+    map_obj = create_map(data, coord_type, map_style, bulk_threshold, tile_url)
+    if map_obj is None:
+        return None
+    return map_obj.get_root().render()
+
+# Kolom koordinat yang dipakai untuk posisi titik di mode viewport
+def coord_columns(coord_type):
+    if coord_type.startswith("Center"):
+        return 'LATITUDE_CENTER_KALKULASI', 'LONGITUDE_CENTER_KALKULASI'
+    return 'SID_LAT', 'SID_LONG'
+
+# Fungsi untuk membaca bbox viewport terakhir dari state st_folium
+def viewport_bounds(view, data, lat_col, lon_col):
+    """
+    (south, west, north, east) viewport terakhir, diperlebar VIEWPORT_MARGIN di setiap sisi
+    Sebelum ada interaksi dengan peta dipakai sebaran seluruh data
+    """
+    bounds = (view or {}).get('bounds') or {}
+    south_west = bounds.get('_southWest') or {}
+    north_east = bounds.get('_northEast') or {}
+    if south_west.get('lat') is None or north_east.get('lat') is None:
+        return data[lat_col].min(), data[lon_col].min(), data[lat_col].max(), data[lon_col].max()
+    
+    lat_margin = (north_east['lat'] - south_west['lat']) * VIEWPORT_MARGIN
+    lon_margin = (north_east['lng'] - south_west['lng']) * VIEWPORT_MARGIN
+    return (south_west['lat'] - lat_margin, south_west['lng'] - lon_margin,
+            north_east['lat'] + lat_margin, north_east['lng'] + lon_margin)
+
+# Warna sel grid kepadatan per kategori terbanyak (CLNT_NAME / SERVICE), dipakai bergiliran
+DENSITY_CATEGORY_COLORS = px.colors.qualitative.Bold
+DENSITY_DEFAULT_COLOR = '#2a5298'
+
+def density_category_colors(density):
+    """Warna untuk setiap nama kategori di DensityGrid (urutan kategori tetap per dataset)"""
+    return {name: DENSITY_CATEGORY_COLORS[i % len(DENSITY_CATEGORY_COLORS)]
+            for i, name in enumerate(density.category_names)}
+
+def density_legend_html(density, max_items=12):
+    """Legenda warna kategori terbanyak per sel (HTML kecil untuk st.markdown)"""
+    names = list(density.category_names)
+    items = escape_html_column(pd.Series(names[:max_items], dtype=object))
+    colors = density_category_colors(density)
+    legend = " ".join(
+        f"<span style='white-space: nowrap;'><span style='color: {colors[name]};'>●</span> {label}</span>"
+        for name, label in zip(names, items)
+    )
+    if len(names) > max_items:
+        legend += f" … (+{len(names) - max_items} lainnya)"
+    return f"<div style='font-size: 0.8rem;'>{legend}</div>"
+
+# Fungsi untuk menambahkan sel grid kepadatan ke FeatureGroup (lingkaran per sel atau heatmap)
+def add_density_cells(layer, cells, density_style, colors=None):
+    if density_style == "Heatmap":
+        HeatMap(cells[['LAT', 'LON', 'COUNT']].to_numpy().tolist(),
+                radius=25, blur=20, min_opacity=0.3).add_to(layer)
+        return
+    
+    top_names = escape_html_column(cells['TOP_CATEGORY'])
+    for row, top_name in zip(cells.itertuples(index=False), top_names):
+        color = (colors or {}).get(row.TOP_CATEGORY, DENSITY_DEFAULT_COLOR)
+        tooltip = f"{row.COUNT} stasiun"
+        if isinstance(top_name, str):
+            tooltip += f"<br>Terbanyak: {top_name} ({row.TOP_COUNT})<br>{row.N_CATEGORIES} kategori"
+        folium.CircleMarker(
+            location=[row.LAT, row.LON],
+            radius=float(6 + 4 * np.log10(row.COUNT)),
+            color='#1e3c72',
+            weight=1,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.6,
+            tooltip=tooltip
+        ).add_to(layer)
+
+# Fungsi untuk membuat layer titik yang terlihat di viewport
+def build_viewport_layer(data, spatial_index, density, coord_type, bounds, zoom,
+                         density_style="Grid", category=None):
+    """
+    FeatureGroup berisi marker individual (zoom detail, titik sedikit) atau sel grid
+    kepadatan pra-hitung dari DensityGrid untuk zoom saat ini, beserta keterangan untuk ditampilkan.
+    category membatasi sel kepadatan ke satu kategori (marker individual tetap semua titik)
+    """
+    layer = folium.FeatureGroup(name="Stasiun")
+    
+    # Data titik hanya dipindai (lewat index spasial) pada zoom detail
+    if zoom >= VIEWPORT_DETAIL_ZOOM:
+        visible = spatial_index.query_bbox(*bounds)
+        if 0 < len(visible) <= VIEWPORT_MAX_MARKERS:
+            add_station_markers(layer, data.iloc[visible], coord_type, VIEWPORT_MAX_MARKERS)
+            return layer, f"{len(visible)} titik di area ini ditampilkan sebagai marker"
+    
+    # Zoom jauh: cukup baca level grid kepadatan yang sudah dihitung
+    cells = density.cells(zoom, bounds, category)
+    if cells.empty:
+        return layer, "Tidak ada titik di area peta yang terlihat"
+    
+    add_density_cells(layer, cells, density_style, density_category_colors(density))
+    view_name = " (heatmap)" if density_style == "Heatmap" else ""
+    return layer, (f"{cells['COUNT'].sum()} titik di area ini diringkas menjadi {len(cells)} "
+                   f"sel grid{view_name}, zoom in untuk melihat marker")
+
+# Fungsi untuk membuat chart statistik ringkas
+def build_overview_figures(data):
+    """Figure distribusi client dan top 10 kota untuk DataFrame terfilter"""
+    figures = {}
+    
+    # Chart distribusi client (jika kolom tersedia)
+    if 'CLNT_NAME' in data.columns:
+        # Hitung dari kode categorical, kategori tanpa data dibuang
+        client_counts = data['CLNT_NAME'].value_counts()
+        client_counts = client_counts[client_counts > 0]
+        fig_client = px.pie(
+            values=client_counts.values,
+            names=client_counts.index.tolist(),
+            title='Distribusi Client',
+            height=300
+        )
+        fig_client.update_traces(textposition='inside', textinfo='percent+label')
+        figures['client'] = fig_client
+    
+    # Chart distribusi kota (jika kolom tersedia)
+    if 'CITY' in data.columns:
+        city_counts = data['CITY'].value_counts()
+        city_counts = city_counts[city_counts > 0].head(10)
+        fig_city = px.bar(
+            x=city_counts.values,
+            y=city_counts.index.tolist(),
+            orientation='h',
+            title='Top 10 Kota',
+            height=300
+        )
+        fig_city.update_layout(yaxis_title="Kota", xaxis_title="Jumlah")
+        figures['city'] = fig_city
+    
+    return figures
+
+# Fungsi untuk membuat histogram jarak SID-Center
+def build_distance_histogram(data):
+    """Histogram jarak SID-Center dengan garis batas toleransi"""
+    distances = data['DISTANCE_SID_CENTER_M'].dropna().to_numpy()
+    fig_dist = px.histogram(
+        x=distances,
+        title="Distribusi Jarak antara Koordinat SID dan Center",
+        nbins=30,
+        labels={'x': 'Jarak (meter)', 'y': 'Frekuensi'}
+    )
+    
+    # Tambahkan garis vertikal untuk toleransi 20m
+    fig_dist.add_vline(x=20, line_dash="dash", line_color="red", 
+                      annotation_text="Batas Toleransi 20m", 
+                      annotation_position="top right")
+    return fig_dist
+
+# Warna status masa berlaku izin pada timeline
+EXPIRY_STATUS_COLORS = {
+    'Sudah berakhir': '#d63e2a', 'Segera berakhir': '#f69730', 'Masih berlaku': '#72b026'
+}
+
+# Fungsi untuk membuat timeline jumlah izin yang berakhir per bulan
+def build_expiry_timeline(monthly, reference, soon_months):
+    """Bar chart dari ExpiryIndex.monthly_counts, diwarnai relatif terhadap tanggal reference"""
+    reference = pd.Timestamp(reference).normalize()
+    month_ends = monthly['BULAN'] + pd.offsets.MonthBegin()
+    status = np.select(
+        [month_ends <= reference, monthly['BULAN'] <= reference + pd.DateOffset(months=soon_months)],
+        ['Sudah berakhir', 'Segera berakhir'], default='Masih berlaku'
+    )
+    fig_timeline = px.bar(
+        monthly.assign(STATUS=status),
+        x='BULAN',
+        y='JUMLAH',
+        color='STATUS',
+        color_discrete_map=EXPIRY_STATUS_COLORS,
+        title="Jumlah Izin yang Berakhir per Bulan (VALIDITY_DATE)",
+        labels={'BULAN': 'Bulan', 'JUMLAH': 'Jumlah izin', 'STATUS': 'Status'}
+    )
+    fig_timeline.add_vline(x=reference, line_dash="dash", line_color="gray")
+    return fig_timeline
+
+# Fungsi untuk membuat chart status toleransi dan jarak per titik
+def build_tolerance_charts(data):
+    """Pie status toleransi dan scatter jarak per data point"""
+    # Ambil jarak SID-Center yang sudah dihitung saat load
+    comparison_df = data[data['DISTANCE_SID_CENTER_M'].notna()]
+    distances = comparison_df['DISTANCE_SID_CENTER_M'].to_numpy()
+    
+    # Data untuk analisis umum
+    coord_df = pd.DataFrame({
+        'Index': comparison_df.index,
+        'STN_NAME': (comparison_df['STN_NAME'].to_numpy() if 'STN_NAME' in comparison_df.columns
+                     else [f'Data #{idx}' for idx in comparison_df.index]),
+        'CLNT_NAME': comparison_df['CLNT_NAME'].to_numpy() if 'CLNT_NAME' in comparison_df.columns else 'N/A',
+        'Distance_m': distances,
+        'Status': comparison_df['TOLERANCE_STATUS'].to_numpy()
+    })
+    
+    # Pie chart toleransi
+    exceed_count = int((distances > TOLERANCE_METERS).sum())
+    tolerance_counts = pd.Series([exceed_count, len(distances) - exceed_count], 
+                               index=['Melebihi 20m', 'Dalam Toleransi'])
+    
+    fig_tolerance = px.pie(
+        values=tolerance_counts.values,
+        names=tolerance_counts.index,
+        title="Distribusi Status Toleransi",
+        color_discrete_map={
+            'Melebihi 20m': '#ff5252',
+            'Dalam Toleransi': '#4caf50'
+        }
+    )
+    
+    # Scatter plot jarak vs index
+    fig_scatter = px.scatter(
+        coord_df,
+        x=range(len(coord_df)),
+        y='Distance_m',
+        color='Status',
+        title="Jarak per Data Point",
+        labels={'x': 'Index Data', 'y': 'Jarak (meter)'},
+        color_discrete_map={
+            'Melebihi 20m': '#ff5252',
+            'Dalam Toleransi': '#4caf50'
+        },
+        hover_data=['STN_NAME', 'CLNT_NAME']
+    )
+    
+    # Tambahkan garis toleransi
+    fig_scatter.add_hline(y=20, line_dash="dash", line_color="red", 
+                         annotation_text="Toleransi 20m")
+    
+    return {'fig_tolerance': fig_tolerance, 'fig_scatter': fig_scatter}
+
+# Warna garis pasangan kandidat interferensi
+INTERFERENCE_COLORS = {'CO-CHANNEL': '#d63e2a', 'ADJACENT': '#f69730'}
+
+# Fungsi untuk membuat peta pasangan kandidat interferensi
+def create_interference_map(data, pairs, map_style, bulk_threshold=BULK_MARKER_THRESHOLD, tile_url=None):
+    """Garis antar pasangan stasiun (merah co-channel, oranye adjacent) dan marker stasiun yang terlibat"""
+    m = create_base_map(data, map_style, tile_url)
+    
+    if len(pairs) > bulk_threshold:
+        # Banyak pasangan: satu multi-polyline per jenis
+        for kind, group in pairs.groupby('JENIS'):
+            segments = np.stack([group[['LAT_A', 'LON_A']].to_numpy(),
+                                 group[['LAT_B', 'LON_B']].to_numpy()], axis=1).tolist()
+            folium.PolyLine(locations=segments, color=INTERFERENCE_COLORS[kind], weight=2, opacity=0.7).add_to(m)
+    else:
+        names_a = escape_html_column(pairs['STN_NAME_A']).fillna('-').to_numpy()
+        names_b = escape_html_column(pairs['STN_NAME_B']).fillna('-').to_numpy()
+        for i, row in enumerate(pairs.itertuples(index=False)):
+            folium.PolyLine(
+                locations=[[row.LAT_A, row.LON_A], [row.LAT_B, row.LON_B]],
+                color=INTERFERENCE_COLORS[row.JENIS],
+                weight=3,
+                opacity=0.8,
+                tooltip=(f"{row.JENIS}: {names_a[i]} ↔ {names_b[i]} "
+                         f"({row.DISTANCE_M:.0f} m, overlap {row.OVERLAP_MHZ:g} MHz)")
+            ).add_to(m)
+    
+    # Marker stasiun yang terlibat (popup sama dengan peta utama)
+    involved = pd.unique(np.concatenate([pairs['INDEX_A'].to_numpy(), pairs['INDEX_B'].to_numpy()]))
+    add_station_markers(m, data.loc[involved], "SID (SID_LONG, SID_LAT)", bulk_threshold)
+    return m
+
+# Fungsi untuk membuat HTML ikon site (lingkaran berisi jumlah record)
+def site_icon_html(counts, colors):
+    """HTML divIcon per site dan ukurannya; site dengan satu record tanpa angka"""
+    sizes = np.where(counts > 1, 24, 14)
+    labels = np.where(counts > 1, counts.astype(str), '')
+    html = ("<div style='width: " + sizes.astype(str) + "px; height: " + sizes.astype(str)
+            + "px; line-height: " + sizes.astype(str) + "px; border-radius: 50%; background: "
+            + colors.astype(str) + "; color: white; font-size: 11px; font-weight: bold; "
+            "text-align: center; border: 1px solid #1e3c72;'>" + labels + "</div>")
+    return html, sizes
+
+# Fungsi untuk membuat popup dan tooltip site
+def site_popup_columns(sites):
+    """POPUP_HTML dan TOOLTIP_TEXT per baris site_summary (semua teks di-escape)"""
+    fallback_name = "Site #" + sites['SITE_ID'].astype(str)
+    if 'STN_NAME' in sites.columns:
+        names = escape_html_column(sites['STN_NAME']).fillna(fallback_name)
+    else:
+        names = fallback_name
+    counts = sites['JUMLAH_RECORD'].astype(str)
+    
+    popup = ("<div style='width: 300px;'><h4><b>" + names + "</b></h4><hr><b>Jumlah record:</b> "
+             + counts + "<br>")
+    for col, label in [('JUMLAH_NAMA', 'Nama stasiun berbeda'), ('JUMLAH_CLIENT', 'Client berbeda'),
+                       ('JUMLAH_REFERENSI', 'REQUEST_REFERENCE berbeda')]:
+        if col in sites.columns:
+            popup = popup + f"<b>{label}:</b> " + sites[col].astype(str) + "<br>"
+    for col, label in [('CLNT_NAME', 'Client'), ('CITY', 'Kota'), ('STN_ADDR', 'Alamat')]:
+        if col in sites.columns:
+            popup = popup + (f"<b>{label}:</b> " + escape_html_column(sites[col]) + "<br>").fillna('')
+    popup = (popup + "<b>Sebaran koordinat:</b> " + sites['SEBARAN_M'].astype(str) + " m"
+             + "<hr><b>Koordinat SID (rata-rata):</b><br>Lat: " + sites['SID_LAT'].round(6).astype(str)
+             + ", Long: " + sites['SID_LONG'].round(6).astype(str) + "</div>")
+    
+    tooltip = names + " (" + counts + " record)"
+    return popup.to_numpy(dtype=object), tooltip.to_numpy(dtype=object)
+
+# Fungsi untuk membuat peta satu marker per site fisik
+def create_site_map(sites, map_style, bulk_threshold=BULK_MARKER_THRESHOLD, tile_url=None):
+    """
+    sites: hasil site_summary; marker berisi jumlah record per site, warna per client
+    (abu-abu gelap jika site dipakai lebih dari satu client)
+    """
+    sites = sites.dropna(subset=['SID_LAT', 'SID_LONG'])
+    if sites.empty:
+        return None
+    m = create_base_map(sites, map_style, tile_url)
+    
+    counts = sites['JUMLAH_RECORD'].to_numpy()
+    colors = np.full(len(sites), MARKER_HEX_COLORS['red'], dtype=object)
+    if 'CLNT_NAME' in sites.columns:
+        clients = sites['CLNT_NAME']
+        color_map = {client: MARKER_HEX_COLORS[CLIENT_MARKER_COLORS[i % len(CLIENT_MARKER_COLORS)]]
+                     for i, client in enumerate(clients.dropna().unique())}
+        colors = clients.map(color_map).fillna(MARKER_HEX_COLORS['red']).to_numpy(dtype=object)
+    if 'JUMLAH_CLIENT' in sites.columns:
+        colors[sites['JUMLAH_CLIENT'].to_numpy() > 1] = MULTI_CLIENT_SITE_COLOR
+    
+    icons, sizes = site_icon_html(counts, colors)
+    popups, tooltips = site_popup_columns(sites)
+    lats = sites['SID_LAT'].to_numpy()
+    lons = sites['SID_LONG'].to_numpy()
+    
+    if len(sites) > bulk_threshold:
+        # Satu layer cluster, ikon site dibawa sebagai data
+        points = [[lats[i], lons[i], popups[i], tooltips[i], icons[i], int(sizes[i])] for i in range(len(sites))]
+        FastMarkerCluster(points, callback=SITE_MARKER_CALLBACK, name="Site").add_to(m)
+    else:
+        for i in range(len(sites)):
+            folium.Marker(
+                location=[lats[i], lons[i]],
+                popup=folium.Popup(popups[i], max_width=300),
+                tooltip=tooltips[i],
+                icon=folium.DivIcon(html=icons[i], icon_size=(int(sizes[i]), int(sizes[i])),
+                                    icon_anchor=(int(sizes[i]) // 2, int(sizes[i]) // 2))
+            ).add_to(m)
+    return m
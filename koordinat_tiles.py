@@ -0,0 +1,342 @@
+"""
+Cache tile peta lokal untuk pemakaian offline (tanpa Streamlit)
+
+Tile disimpan di folder (satu subfolder per style peta, {z}/{x}/{y}.png) atau dibaca dari
+file *.mbtiles di folder yang sama, lalu dilayani server HTTP kecil di 127.0.0.1 sehingga
+peta folium memuat tile dari disk lokal, bukan dari server remote.
+
+Unduh tile lebih dulu (selagi online) untuk area dan rentang zoom tertentu:
+
+    python koordinat_tiles.py Data/tiles --style OpenStreetMap --bbox -5.5 120.8 -2.8 124.6 --zoom 6 12
+
+Atau jalankan server tile saja:
+
+    python koordinat_tiles.py Data/tiles --serve --port 8765
+"""
+import os
+import re
+import sys
+import glob
+import math
+import time
+import sqlite3
+import threading
+import argparse
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# URL tile remote dan atribusi per style peta (nama style sama dengan pilihan di aplikasi)
+TILE_SOURCES = {
+    "OpenStreetMap": (
+        "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+        "&copy; OpenStreetMap contributors"
+    ),
+    "Satellite": (
+        "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
+        "Tiles &copy; Esri"
+    ),
+    "Terrain": (
+        "https://server.arcgisonline.com/ArcGIS/rest/services/World_Terrain_Base/MapServer/tile/{z}/{y}/{x}",
+        "Tiles &copy; Esri"
+    ),
+    "CartoDB Positron": (
+        "https://a.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png",
+        "&copy; OpenStreetMap contributors &copy; CARTO"
+    ),
+    "CartoDB Dark_Matter": (
+        "https://a.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}.png",
+        "&copy; OpenStreetMap contributors &copy; CARTO"
+    )
+}
+
+# Folder tile lokal default (bisa diganti dengan env var)
+TILE_DIR_ENV_VAR = "KOORDINAT_TILE_DIR"
+DEFAULT_TILE_DIR = os.path.join("Data", "tiles")
+# Style dari file MBTiles diberi awalan ini
+MBTILES_STYLE_PREFIX = "MBTiles: "
+
+FETCH_TIMEOUT_SECONDS = 10
+FETCH_USER_AGENT = "koordinat-tile-cache/1.0"
+# Batas jumlah tile sekali prefetch agar tidak membebani server tile publik
+PREFETCH_MAX_TILES = 20000
+
+def style_slug(style):
+    """Nama style sebagai segmen URL / nama folder ('CartoDB Positron' -> 'cartodb_positron')"""
+    return re.sub(r'[^a-z0-9]+', '_', style.lower()).strip('_')
+
+def tile_content_type(content):
+    """Content-Type tile dari magic bytes (PNG, JPEG atau WebP)"""
+    if content[:4] == b'\x89PNG':
+        return 'image/png'
+    if content[:2] == b'\xff\xd8':
+        return 'image/jpeg'
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'application/octet-stream'
+
+class DirectoryTileStore:
+    """Tile sebagai file {root}/{z}/{x}/{y}.png (satu folder per style)"""
+    
+    readonly = False
+    
+    def __init__(self, root):
+        self.root = root
+    
+    def tile_path(self, z, x, y):
+        return os.path.join(self.root, str(z), str(x), f"{y}.png")
+    
+    def get(self, z, x, y):
+        try:
+            with open(self.tile_path(z, x, y), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def put(self, z, x, y, content):
+        """Tulis ke file sementara lalu rename, agar request paralel tidak membaca tile setengah jadi"""
+        path = self.tile_path(z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+class MBTilesTileStore:
+    """Tile dari file MBTiles (SQLite, tile_row dalam skema TMS sehingga y dibalik), hanya baca"""
+    
+    readonly = True
+    
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+    
+    def connection(self):
+        # Koneksi SQLite tidak boleh dipakai lintas thread, satu koneksi per thread server
+        if getattr(self.local, 'connection', None) is None:
+            uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+            self.local.connection = sqlite3.connect(uri, uri=True)
+        return self.local.connection
+    
+    def get(self, z, x, y):
+        row = self.connection().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, (1 << z) - 1 - y)
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+# Fungsi untuk mencari semua sumber tile lokal di folder
+def discover_tile_stores(tile_dir):
+    """
+    {slug: (nama style, store)}: folder untuk setiap style di TILE_SOURCES
+    (dibuat saat tile pertama disimpan) dan setiap file *.mbtiles di tile_dir
+    """
+    stores = {style_slug(style): (style, DirectoryTileStore(os.path.join(tile_dir, style_slug(style))))
+              for style in TILE_SOURCES}
+    for path in sorted(glob.glob(os.path.join(tile_dir, "*.mbtiles"))):
+        style = MBTILES_STYLE_PREFIX + os.path.splitext(os.path.basename(path))[0]
+        stores[style_slug(style)] = (style, MBTilesTileStore(path))
+    return stores
+
+# Fungsi untuk mengunduh satu tile dari server remote
+def fetch_remote_tile(style, z, x, y):
+    url = TILE_SOURCES[style][0].format(z=z, x=x, y=y)
+    request = urllib.request.Request(url, headers={'User-Agent': FETCH_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+        return response.read()
+
+class TileServer:
+    """
+    Server HTTP lokal untuk tile: GET /{slug}/{z}/{x}/{y}.png
+    Tile dicari di store lokal (hit). Jika tidak ada (miss) dan fetch_missing aktif, tile
+    diunduh dari TILE_SOURCES lalu disimpan ke folder sehingga permintaan berikutnya hit
+    """
+    
+    def __init__(self, tile_dir, host="127.0.0.1", port=0, fetch_missing=False):
+        self.tile_dir = tile_dir
+        self.stores = discover_tile_stores(tile_dir)
+        self.fetch_missing = fetch_missing
+        self.hits = 0
+        self.misses = 0
+        self.fetched = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+        
+        self.httpd = ThreadingHTTPServer((host, port), make_tile_handler(self))
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+    
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def styles(self):
+        """Nama style yang bisa dilayani (style remote dan file MBTiles)"""
+        return [style for style, _ in self.stores.values()]
+    
+    def url_template(self, style):
+        """URL tile {z}/{x}/{y} untuk TileLayer folium"""
+        return f"{self.base_url}/{style_slug(style)}/{{z}}/{{x}}/{{y}}.png"
+    
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def get_tile(self, slug, z, x, y):
+        """Isi tile (bytes) atau None jika tidak ada di lokal dan tidak bisa diunduh"""
+        if slug not in self.stores:
+            return None
+        style, store = self.stores[slug]
+        
+        content = store.get(z, x, y)
+        if content is not None:
+            self.count('hits')
+            return content
+        
+        self.count('misses')
+        if not self.fetch_missing or store.readonly or style not in TILE_SOURCES:
+            return None
+        try:
+            content = fetch_remote_tile(style, z, x, y)
+        except OSError:
+            self.count('errors')
+            return None
+        store.put(z, x, y, content)
+        self.count('fetched')
+        return content
+    
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'fetched': self.fetched, 'errors': self.errors}
+    
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def make_tile_handler(tile_server):
+    """Kelas request handler yang meneruskan GET ke tile_server.get_tile"""
+    
+    class TileRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = re.fullmatch(r'/([a-z0-9_]+)/(\d+)/(\d+)/(\d+)\.png', self.path.split('?')[0])
+            content = None
+            if match:
+                slug, z, x, y = match.group(1), *map(int, match.group(2, 3, 4))
+                content = tile_server.get_tile(slug, z, x, y)
+            
+            if content is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            
+            self.send_response(200)
+            self.send_header('Content-Type', tile_content_type(content))
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('Cache-Control', 'public, max-age=86400')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(content)
+        
+        def log_message(self, format, *args):
+            # Tidak menulis log per tile ke stderr
+            pass
+    
+    return TileRequestHandler
+
+# Fungsi untuk menghitung rentang tile (x, y) yang menutupi bbox pada zoom tertentu
+def tile_range(south, west, north, east, zoom):
+    """((x_min, x_max), (y_min, y_max)) inklusif, skema XYZ (Web Mercator)"""
+    n = 2 ** zoom
+    
+    def tile_x(lon):
+        return min(max(int((lon + 180) / 360 * n), 0), n - 1)
+    
+    def tile_y(lat):
+        lat = max(min(lat, 85.0511), -85.0511)
+        lat_rad = math.radians(lat)
+        return min(max(int((1 - math.asinh(math.tan(lat_rad)) / math.pi) / 2 * n), 0), n - 1)
+    
+    return (tile_x(west), tile_x(east)), (tile_y(north), tile_y(south))
+
+# Fungsi untuk mengunduh tile satu area ke folder lokal sebelum dipakai offline
+def prefetch_tiles(tile_dir, style, bounds, zooms, max_tiles=PREFETCH_MAX_TILES, progress=None):
+    """
+    Unduh tile style untuk bbox (south, west, north, east) pada setiap zoom di zooms.
+    Tile yang sudah ada dilewati. Return dict jumlah tile: existing, fetched, failed
+    """
+    ranges = [(zoom, tile_range(*bounds, zoom)) for zoom in zooms]
+    total = sum((x_max - x_min + 1) * (y_max - y_min + 1) for _, ((x_min, x_max), (y_min, y_max)) in ranges)
+    if total > max_tiles:
+        raise ValueError(f"{total} tile melebihi batas {max_tiles}, perkecil area atau rentang zoom")
+    
+    store = DirectoryTileStore(os.path.join(tile_dir, style_slug(style)))
+    counts = {'existing': 0, 'fetched': 0, 'failed': 0}
+    done = 0
+    for zoom, ((x_min, x_max), (y_min, y_max)) in ranges:
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                if os.path.exists(store.tile_path(zoom, x, y)):
+                    counts['existing'] += 1
+                else:
+                    try:
+                        store.put(zoom, x, y, fetch_remote_tile(style, zoom, x, y))
+                        counts['fetched'] += 1
+                    except OSError:
+                        counts['failed'] += 1
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Unduh tile peta ke folder lokal atau jalankan server tile lokal (offline)"
+    )
+    parser.add_argument("tile_dir", nargs="?", default=os.environ.get(TILE_DIR_ENV_VAR, DEFAULT_TILE_DIR),
+                        help=f"Folder tile / MBTiles (default: {DEFAULT_TILE_DIR})")
+    parser.add_argument("--style", choices=list(TILE_SOURCES), default="OpenStreetMap",
+                        help="Style peta yang diunduh")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=("SOUTH", "WEST", "NORTH", "EAST"),
+                        help="Area yang diunduh (derajat)")
+    parser.add_argument("--zoom", nargs=2, type=int, metavar=("MIN", "MAX"), default=[6, 12],
+                        help="Rentang zoom yang diunduh (default: 6 12)")
+    parser.add_argument("--max-tiles", type=int, default=PREFETCH_MAX_TILES,
+                        help=f"Batas jumlah tile sekali unduh (default: {PREFETCH_MAX_TILES})")
+    parser.add_argument("--serve", action="store_true", help="Jalankan server tile lokal")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat server (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port server (default: 8765)")
+    parser.add_argument("--fetch-missing", action="store_true",
+                        help="Server mengunduh dan menyimpan tile yang belum ada")
+    args = parser.parse_args(argv)
+    
+    if args.bbox:
+        def show_progress(done, total):
+            if done % 100 == 0 or done == total:
+                print(f"\r{done}/{total} tile", end="", file=sys.stderr)
+        
+        try:
+            counts = prefetch_tiles(args.tile_dir, args.style, args.bbox,
+                                    range(args.zoom[0], args.zoom[1] + 1), args.max_tiles, show_progress)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"\n{args.style}: {counts['fetched']} diunduh, {counts['existing']} sudah ada, "
+              f"{counts['failed']} gagal -> {args.tile_dir}")
+    
+    if args.serve:
+        server = TileServer(args.tile_dir, args.host, args.port, args.fetch_missing)
+        print(f"Server tile lokal di {server.base_url} ({', '.join(server.styles())})")
+        try:
+            while True:
+                time.sleep(60)
+                print(f"Statistik cache: {server.stats()}")
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif not args.bbox:
+        parser.print_help()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+Test fungsi inti koordinat_core dengan data kecil buatan (jalankan: python -m pytest -q)
+"""
+import shutil
+import numpy as np
+import pandas as pd
+from koordinat_core import (
+    table_row_order, SpatialGridIndex, calculate_distance_vectorized, load_csv_file,
+    read_cached_data, write_cached_data, detect_encoding, read_csv_streaming,
+    find_interference_candidates, proximity_pairs, find_duplicate_sites,
+    encode_plus_codes, decode_plus_codes, add_plus_code_columns, ExpiryIndex, expiry_window
+)
+
+SAMPLE_CSV = "Data/Bahan Prima Aksi 2025 - Kendari.csv"
+
+# Pencarian tabel harus mencakup kolom teks biasa (dtype str di pandas 3) dan categorical
+def test_table_search_plain_text_column():
+    data = pd.DataFrame({
+        'STN_NAME': pd.Series(['KDI007_POASI', 'RHA001_MUNA', 'kdi007 lama', None], dtype='str'),
+        'CITY': pd.Categorical(['KOTA KENDARI', 'MUNA', 'KOTA KENDARI', 'MUNA']),
+        'FREQ': [14473.0, 23058.0, 7135.0, 8000.0]
+    })
+    
+    assert list(table_row_order(data, 'KDI007')) == [0, 2]
+    assert list(table_row_order(data, 'muna')) == [1, 3]
+    assert list(table_row_order(data, 'kendari', sort_by='FREQ')) == [2, 0]
+
+def test_table_search_object_column():
+    data = pd.DataFrame({'STN_ADDR': np.array(['JL. KANCIL', np.nan, 'JL. POROS'], dtype=object)})
+    
+    assert list(table_row_order(data, 'poros')) == [2]
+    assert list(table_row_order(data, 'nan')) == []
+
+# Titik sintetis di Indonesia ditambah beberapa titik di dekat bujur 180
+def sample_points():
+    rng = np.random.default_rng(0)
+    lats = np.concatenate([rng.uniform(-6, -3, 500), [-16.0, -17.5, 10.0]])
+    lons = np.concatenate([rng.uniform(121, 124, 500), [179.9, -179.8, -179.95]])
+    return lats, lons
+
+def brute_force_nearest(lats, lons, lat, lon, k):
+    distances = calculate_distance_vectorized(np.full(len(lats), lat), np.full(len(lons), lon), lats, lons)
+    order = np.argsort(distances, kind='stable')[:k]
+    return order, distances[order]
+
+# Query jauh dari data (melewati setengah bola / bujur 180) harus sama dengan brute force
+def test_query_nearest_far_queries_match_brute_force():
+    lats, lons = sample_points()
+    index = SpatialGridIndex(lats, lons)
+    
+    for lat, lon, k in [(40, 0, 3), (-4.5, 122.5, 5), (-16.5, -179.9, 2), (-17.0, 179.99, 3),
+                        (85, -60, 4), (-89, 10, 1)]:
+        positions, distances = index.query_nearest(lat, lon, k)
+        expected_positions, expected_distances = brute_force_nearest(lats, lons, lat, lon, k)
+        assert len(positions) == k
+        np.testing.assert_allclose(distances, expected_distances)
+        assert set(positions) == set(expected_positions)
+
+def test_query_radius_crosses_antimeridian():
+    lats, lons = sample_points()
+    index = SpatialGridIndex(lats, lons)
+    
+    positions, _ = index.query_radius(-16.5, 180.0, 250_000)
+    assert set(positions) == {500, 501}
+
+# Cache Parquet (termasuk kolom teks ber-dtype lain, misal string[NA]) harus kembali dengan dtype hasil parsing CSV
+def test_cached_data_keeps_csv_dtypes(tmp_path):
+    file_path = tmp_path / "sample.csv"
+    shutil.copy(SAMPLE_CSV, file_path)
+    cold, _ = load_csv_file(str(file_path))
+    cached, _ = load_csv_file(str(file_path))
+    pd.testing.assert_frame_equal(cached, cold)
+    
+    legacy = cold.astype({'STN_NAME': 'string', 'STN_ADDR': object})
+    legacy['CITY'] = legacy['CITY'].cat.rename_categories(legacy['CITY'].cat.categories.astype('string'))
+    write_cached_data(str(file_path), legacy, len(cold))
+    cached, _ = read_cached_data(str(file_path))
+    pd.testing.assert_frame_equal(cached, cold)
+    assert cached['CITY'].cat.categories.dtype == cold['CITY'].cat.categories.dtype
+
+# Mode streaming (chunk kecil, ada kolom teks yang kosong di sebagian chunk) harus sama dengan load penuh
+def test_streaming_matches_full_load():
+    full, _ = load_csv_file(SAMPLE_CSV, streaming=False)
+    streamed, original_rows = read_csv_streaming(SAMPLE_CSV, detect_encoding(SAMPLE_CSV), chunk_rows=50)
+    
+    assert original_rows == len(pd.read_csv(SAMPLE_CSV, usecols=['SID_LAT']))
+    pd.testing.assert_frame_equal(streamed.reset_index(drop=True),
+                                  full[streamed.columns].reset_index(drop=True),
+                                  check_categorical=False)
+
+def test_streaming_header_only_file_has_derived_columns(tmp_path):
+    file_path = tmp_path / "kosong.csv"
+    with open(SAMPLE_CSV, 'r', encoding=detect_encoding(SAMPLE_CSV)) as f:
+        file_path.write_text(f.readline(), encoding='utf-8')
+    
+    streamed, original_rows = read_csv_streaming(str(file_path), 'utf-8')
+    assert original_rows == 0 and streamed.empty
+    for col in ['DISTANCE_SID_CENTER_M', 'TOLERANCE_STATUS', 'PLUS_CODE_STATUS']:
+        assert col in streamed.columns
+
+# Stasiun sintetis untuk deteksi interferensi, ditambah pasangan tepat di batas jarak/frekuensi
+def interference_stations():
+    rng = np.random.default_rng(1)
+    n = 200
+    lats = rng.uniform(-4.2, -3.9, n)
+    lons = rng.uniform(122.4, 122.7, n)
+    lats[:5] = np.nan
+    freq = rng.choice([7000.0, 7003.5, 7010.0, 7028.0, 8000.0], n)
+    pair = np.where(rng.random(n) < 0.5, np.nan, rng.choice([7028.0, 7100.0, 8000.0], n))
+    data = pd.DataFrame({
+        'STN_NAME': [f'STN{i:03d}' for i in range(n)],
+        'CLNT_NAME': rng.choice(['A', 'B', 'C'], n),
+        'FREQ': freq,
+        'FREQ_PAIR': pair,
+        'BWIDTH': rng.choice([1000.0, 2000.0, 7000.0, 14000.0, np.nan], n),
+        'SID_LAT': lats,
+        'SID_LONG': lons
+    })
+    extra = pd.DataFrame({
+        # Pasangan batas jarak (co-channel) dan batas frekuensi (celah tepat 2 MHz)
+        'STN_NAME': ['EDGE_D1', 'EDGE_D2', 'EDGE_F1', 'EDGE_F2', 'LINK_1', 'LINK_2'],
+        'CLNT_NAME': ['D', 'E', 'D', 'E', 'F', 'F'],
+        'FREQ': [9000.0, 9000.0, 9500.0, 9503.5, 9700.0, 9800.0],
+        'FREQ_PAIR': [np.nan, np.nan, np.nan, np.nan, 9800.0, 9700.0],
+        'BWIDTH': [1000.0, 1000.0, 2000.0, 1000.0, 1000.0, 1000.0],
+        'SID_LAT': [-5.0, -5.0, -5.5, -5.5, -6.0, -6.0],
+        'SID_LONG': [122.0, 122.05, 122.0, 122.0, 122.0, 122.0]
+    })
+    return pd.concat([data, extra], ignore_index=True)
+
+def brute_force_interference(data, max_distance_m, guard_mhz):
+    lats = data['SID_LAT'].to_numpy()
+    lons = data['SID_LONG'].to_numpy()
+    freq = data['FREQ'].to_numpy()
+    pair = data['FREQ_PAIR'].to_numpy()
+    clients = data['CLNT_NAME'].to_numpy()
+    half = np.nan_to_num(data['BWIDTH'].to_numpy() / 2000)
+    bands = []
+    for i in range(len(data)):
+        centers = [freq[i]] + ([pair[i]] if not np.isnan(pair[i]) and pair[i] != freq[i] else [])
+        bands.append([(center - half[i], center + half[i]) for center in centers])
+    
+    first, second = np.triu_indices(len(data), 1)
+    distances = calculate_distance_vectorized(lats[first], lons[first], lats[second], lons[second])
+    expected = {}
+    for i, j, distance in zip(first, second, distances):
+        if not distance <= max_distance_m:
+            continue
+        if freq[i] == pair[j] and pair[i] == freq[j] and clients[i] == clients[j]:
+            continue
+        overlaps = [min(high_a, high_b) - max(low_a, low_b)
+                    for low_a, high_a in bands[i] for low_b, high_b in bands[j]]
+        overlaps = [value for value in overlaps if (value > 0 if guard_mhz <= 0 else value >= -guard_mhz)]
+        if overlaps:
+            expected[(i, j)] = (max(overlaps), distance)
+    return expected
+
+# Sort-and-sweep + blok grid harus sama dengan perbandingan semua pasangan
+def test_interference_candidates_match_brute_force():
+    data = interference_stations()
+    edge_distance = calculate_distance_vectorized([-5.0], [122.0], [-5.0], [122.05])[0]
+    
+    for max_distance_m, guard_mhz in [(10_000, 0.0), (2_000, 5.0), (50_000, 0.0),
+                                      (edge_distance, 0.0), (1_000, 2.0), (1_000, 1.999)]:
+        result = find_interference_candidates(data, max_distance_m, guard_mhz)
+        expected = brute_force_interference(data, max_distance_m, guard_mhz)
+        
+        found = dict(zip(zip(result['INDEX_A'], result['INDEX_B']),
+                         zip(result['OVERLAP_MHZ'], result['DISTANCE_M'])))
+        assert set(found) == set(expected)
+        for key, (overlap, distance) in expected.items():
+            assert found[key] == (round(overlap, 4), round(distance, 1))
+    
+    names = data['STN_NAME'].to_numpy()
+    at_distance = find_interference_candidates(data, edge_distance)
+    assert ('EDGE_D1', 'EDGE_D2') in set(zip(names[at_distance['INDEX_A']], names[at_distance['INDEX_B']]))
+    at_guard = find_interference_candidates(data, 1_000, 2.0)
+    edge_rows = at_guard[names[at_guard['INDEX_A']] == 'EDGE_F1']
+    assert list(edge_rows['JENIS']) == ['ADJACENT'] and list(edge_rows['OVERLAP_MHZ']) == [-2.0]
+    assert not (names[find_interference_candidates(data, 1_000, 1.999)['INDEX_A']] == 'EDGE_F1').any()
+
+def test_proximity_pairs_match_brute_force():
+    data = interference_stations()
+    lats = data['SID_LAT'].to_numpy()
+    lons = data['SID_LONG'].to_numpy()
+    first, second = np.triu_indices(len(data), 1)
+    distances = calculate_distance_vectorized(lats[first], lons[first], lats[second], lons[second])
+    
+    for max_distance_m in [500, 5_000, calculate_distance_vectorized([-5.0], [122.0], [-5.0], [122.05])[0]]:
+        a, b, found_distances = proximity_pairs(lats, lons, max_distance_m)
+        keep = distances <= max_distance_m
+        assert set(zip(a, b)) == set(zip(first[keep], second[keep]))
+        np.testing.assert_array_equal(np.sort(found_distances), np.sort(distances[keep]))
+
+# Site duplikat: ejaan nama berbeda, dua site berdekatan yang berbeda, dan rantai A~B~C
+def duplicate_site_records():
+    return pd.DataFrame({
+        'STN_NAME': [
+            'TOWER POASI KENDARI', 'Tower Poasi - Kendari Baru', 'tower poasi kendari',
+            'MUNA RAHA', 'TOWER LAKUDO',
+            'SITE WUA WUA', 'SITE WUA WUA TIMUR', 'WUA TIMUR',
+            'GUDANG', 'TOWER POASI KENDARI'
+        ],
+        'STN_ADDR': [np.nan] * 10,
+        # 0.00018 derajat lintang ~20 m, 0.00027 ~30 m, 0.00036 ~40 m
+        'SID_LAT': [-4.0, -4.0, -4.00018, -4.1, -4.10027, -4.2, -4.20036, -4.20072, -4.1, np.nan],
+        'SID_LONG': [122.5, 122.5, 122.5, 122.5, 122.5, 122.5, 122.5, 122.5, 122.500005, np.nan]
+    })
+
+def test_find_duplicate_sites():
+    data = duplicate_site_records()
+    
+    # Baris 8 beda nama tetapi < 1 m dari baris 3; baris tanpa koordinat menjadi site sendiri
+    assert list(find_duplicate_sites(data)) == [0, 0, 0, 1, 2, 3, 3, 3, 1, 4]
+    
+    # Tanpa B, A dan C (80 m) tidak terhubung
+    without_b = data.drop(index=6).reset_index(drop=True)
+    assert list(find_duplicate_sites(without_b)) == [0, 0, 0, 1, 2, 3, 4, 1, 5]
+
+# Vektor dari implementasi referensi Open Location Code: (kode, pusat lat, pusat lon, sel lat, sel lon)
+PLUS_CODE_VECTORS = [
+    ('8FVC9G8F+6X', 47.3655625, 8.5249375, 0.000125, 0.000125),
+    ('6FG22222+22', 0.0000625, 0.0000625, 0.000125, 0.000125),
+    ('6fg22222+22', 0.0000625, 0.0000625, 0.000125, 0.000125),
+    ('6FG20000+', 0.5, 0.5, 1.0, 1.0),
+    ('8FVC9G8F+', 47.36625, 8.52375, 0.0025, 0.0025),
+    ('6PH57VP3+PR6', 1.2867875, 103.854515625, 0.000025, 0.00003125),
+    ('8FVC9G8F+6XRQ', 47.3656175, 8.52490234375, 0.000005, 0.0000078125),
+    ('8FVC9G8F+6XRQV4', 47.3656191, 8.524901611328125, 0.0000002, 0.00000048828125),
+    # Digit setelah 15 diabaikan
+    ('8FVC9G8F+6XRQV4X2', 47.36561918, 8.524901794433594, 0.00000004, 0.0000001220703125),
+]
+
+def test_decode_plus_codes_known_vectors():
+    codes = [vector[0] for vector in PLUS_CODE_VECTORS]
+    expected = np.array([vector[1:] for vector in PLUS_CODE_VECTORS]).T
+    
+    for actual, wanted in zip(decode_plus_codes(codes), expected):
+        np.testing.assert_allclose(actual, wanted, rtol=0, atol=1e-9)
+
+def test_decode_plus_codes_rejects_unsupported_codes():
+    # Kode pendek, digit tunggal setelah '+', padding tidak sah, karakter asing, digit pertama di luar rentang
+    codes = ['9G8F+6X', '8FVC9G8F+6', '6FG20000+22', '6FG0G000+', '8FVC9G8F6X', 'hello', 'XFVC9G8F+6X', '', None]
+    
+    for values in decode_plus_codes(codes):
+        assert np.isnan(values).all()
+
+def test_encode_plus_codes_known_vectors():
+    lats = [47.365590, -3.9778, -11.62076844229017, 90, 0, -90, np.nan]
+    lons = [8.524997, 122.515, 1.352874999969572, 0, 180, -180, 1]
+    
+    assert list(encode_plus_codes(lats, lons)) == [
+        '8FVC9G8F+6X', '6Q842GC8+V2', '5FW399H3+M4', 'CFX2X2X2+X2', '62G22222+22', '22222222+22', None
+    ]
+
+def test_plus_code_round_trip():
+    rng = np.random.default_rng(3)
+    lats = rng.uniform(-89.9, 89.9, 20000)
+    lons = rng.uniform(-180, 180, 20000)
+    
+    codes = encode_plus_codes(lats, lons)
+    center_lats, center_lons, lat_cell, lon_cell = decode_plus_codes(codes)
+    
+    # Titik asal berada di dalam sel, dan pusat sel menghasilkan kode yang sama
+    assert (np.abs(lats - center_lats) <= lat_cell / 2 + 1e-9).all()
+    assert (np.abs(lons - center_lons) <= lon_cell / 2 + 1e-9).all()
+    assert (encode_plus_codes(center_lats, center_lons) == codes).all()
+
+def test_plus_code_status():
+    data = pd.DataFrame({
+        'SID_LAT': [-3.9778] * 7,
+        'SID_LONG': [122.515] * 7,
+        'PLUS_CODE_KALKULASI': [None, '6Q842GC8+V2', '6Q840000+', '2GC8+V2', 'hello', '6Q842GC9+V2', '6Q842GC8+V2'],
+        'LATITUDE_CENTER_KALKULASI': [np.nan, -3.9778125, np.nan, np.nan, np.nan, np.nan, -3.9],
+        'LONGITUDE_CENTER_KALKULASI': [np.nan, 122.5150625, np.nan, np.nan, np.nan, np.nan, 122.5],
+    })
+    
+    add_plus_code_columns(data)
+    
+    assert list(data['PLUS_CODE_KALKULASI']) == [
+        '6Q842GC8+V2', '6Q842GC8+V2', '6Q840000+', '2GC8+V2', 'hello', '6Q842GC9+V2', '6Q842GC8+V2'
+    ]
+    assert list(data['PLUS_CODE_STATUS']) == [
+        'DIHITUNG DARI SID', 'SESUAI', 'SESUAI', 'FORMAT KODE TIDAK DIDUKUNG', 'KODE TIDAK VALID',
+        'SID DI LUAR SEL KODE', 'CENTER TIDAK SESUAI KODE'
+    ]
+
+# Tanggal berlaku acak ditambah tanggal tepat di setiap batas jendela (dan sehari di luarnya) serta NaT
+EXPIRY_REFERENCE = pd.Timestamp('2025-06-15')
+EXPIRY_RANGE = (pd.Timestamp('2025-09-01'), pd.Timestamp('2025-11-30'))
+
+def expiry_dates():
+    rng = np.random.default_rng(4)
+    day = pd.Timedelta(days=1)
+    soon_end = EXPIRY_REFERENCE + pd.DateOffset(months=12)
+    edges = [EXPIRY_REFERENCE - day, EXPIRY_REFERENCE, soon_end, soon_end + day,
+             EXPIRY_RANGE[0] - day, EXPIRY_RANGE[0], EXPIRY_RANGE[1], EXPIRY_RANGE[1] + day]
+    random_dates = EXPIRY_REFERENCE + pd.to_timedelta(rng.integers(-800, 800, 300), unit='D')
+    dates = pd.Series(list(random_dates) + edges * 2 + [pd.NaT] * 6, dtype='datetime64[us]')
+    return dates.sample(frac=1, random_state=4).reset_index(drop=True)
+
+def test_expiry_index_matches_naive_masks():
+    dates = expiry_dates()
+    index = ExpiryIndex(dates)
+    soon_end = EXPIRY_REFERENCE + pd.DateOffset(months=12)
+    
+    # Jam pada tanggal reference diabaikan; NaT tidak pernah masuk jendela mana pun
+    reference = EXPIRY_REFERENCE + pd.Timedelta(hours=14)
+    cases = [
+        (expiry_window('expired', reference), dates < EXPIRY_REFERENCE),
+        (expiry_window('expiring', reference), (dates >= EXPIRY_REFERENCE) & (dates <= soon_end)),
+        (expiry_window('range', reference, start=EXPIRY_RANGE[0], end=EXPIRY_RANGE[1]),
+         (dates >= EXPIRY_RANGE[0]) & (dates <= EXPIRY_RANGE[1])),
+        (expiry_window('range', reference, start=EXPIRY_RANGE[0]), dates >= EXPIRY_RANGE[0]),
+        ((None, None), dates.notna()),
+    ]
+    for window, mask in cases:
+        assert list(index.query(*window)) == list(np.flatnonzero(mask))
+        assert index.count(*window) == mask.sum()
+    
+    assert index.n_missing == 6
+    assert expiry_window(None, reference) is None
+    # Akhir bulan: 31 Januari + 1 bulan = 29 Februari (kabisat)
+    assert expiry_window('expiring', '2024-01-31', months=1) == (
+        pd.Timestamp('2024-01-31'), pd.Timestamp('2024-02-29')
+    )
+
+def test_expiry_monthly_counts_match_naive_groupby():
+    dates = expiry_dates()
+    index = ExpiryIndex(dates)
+    
+    for start, end in [(None, None), EXPIRY_RANGE, (EXPIRY_REFERENCE, None)]:
+        counts = index.monthly_counts(start, end)
+        inside = dates[dates.notna() & (start is None or dates >= start) & (end is None or dates <= end)]
+        naive = inside.dt.to_period('M').dt.to_timestamp().value_counts()
+        
+        # Bulan tanpa izin berakhir tetap muncul dengan jumlah 0
+        assert list(counts['JUMLAH']) == list(naive.reindex(counts['BULAN'], fill_value=0))
+        assert counts['JUMLAH'].sum() == len(inside)
+        assert (counts['BULAN'].diff().dropna() > pd.Timedelta(0)).all()